@@ -0,0 +1,97 @@
+"""
+Benchmark title-similarity dedup on synthetic corpora.
+
+Compares the indexed grouping in pipeline.normalize against the pairwise
+reference on 1k / 10k / 100k synthetic titles and checks both produce the
+same groups. The pairwise reference is skipped above --pairwise-max titles
+(100k pairwise takes hours).
+
+Usage:
+    python benchmarks/bench_dedup.py [--sizes 1000 10000 100000] [--pairwise-max 10000]
+"""
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pipeline.normalize import _deduplicate_pairwise, deduplicate_by_title_similarity
+from schemas.story import Story
+
+COMMON_WORDS = [
+    "openai", "anthropic", "google", "model", "models", "agent", "agents", "launches",
+    "release", "new", "ai", "copilot", "github", "api", "enterprise", "developer",
+]
+
+
+def synthetic_titles(n: int, seed: int = 42, dup_rate: float = 0.3) -> list[str]:
+    """Zipf-ish vocabulary plus near-duplicate rewrites of earlier titles."""
+    rng = random.Random(seed)
+    vocab = COMMON_WORDS + [f"term{i}" for i in range(max(2000, n // 5))]
+    weights = [1 / (rank + 1) for rank in range(len(vocab))]
+    titles: list[str] = []
+    for _ in range(n):
+        if titles and rng.random() < dup_rate:
+            words = rng.choice(titles).split()
+            op = rng.random()
+            if op < 0.4 and len(words) > 4:
+                words.pop(rng.randrange(len(words)))
+            elif op < 0.8:
+                words.insert(rng.randrange(len(words) + 1), rng.choice(vocab))
+            else:
+                words[rng.randrange(len(words))] = rng.choice(vocab)
+            titles.append(" ".join(words))
+        else:
+            titles.append(" ".join(rng.choices(vocab, weights, k=rng.randint(4, 12))))
+    return titles
+
+
+def make_stories(titles: list[str]) -> list[Story]:
+    published = datetime(2026, 2, 24, tzinfo=timezone.utc)
+    return [
+        Story.from_url(
+            url=f"https://example.com/{i}",
+            title=title,
+            source_name=f"source-{i % 40}",
+            published_at=published,
+            raw_content="",
+        )
+        for i, title in enumerate(titles)
+    ]
+
+
+def _time(fn, stories: list[Story], threshold: float) -> tuple[float, list[Story]]:
+    copies = [s.model_copy(deep=True) for s in stories]
+    start = time.perf_counter()
+    groups = fn(copies, threshold)
+    return time.perf_counter() - start, groups
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--pairwise-max", type=int, default=10_000)
+    parser.add_argument("--threshold", type=float, default=0.6)
+    args = parser.parse_args()
+
+    print(f"{'titles':>8} {'groups':>8} {'indexed':>10} {'pairwise':>10} {'speedup':>8}")
+    for n in args.sizes:
+        stories = make_stories(synthetic_titles(n))
+        indexed_s, groups = _time(deduplicate_by_title_similarity, stories, args.threshold)
+
+        if n <= args.pairwise_max:
+            pairwise_s, expected = _time(_deduplicate_pairwise, stories, args.threshold)
+            if [s.id for s in groups] != [s.id for s in expected]:
+                raise SystemExit(f"grouping mismatch at n={n}")
+            pairwise, speedup = f"{pairwise_s:.3f}s", f"{pairwise_s / indexed_s:.0f}x"
+        else:
+            pairwise, speedup = "skipped", "-"
+
+        print(f"{n:>8} {len(groups):>8} {indexed_s:>9.3f}s {pairwise:>10} {speedup:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark streaming feed parsing against the feedparser path.
+
+Builds synthetic newest-first RSS and Atom feeds (one entry per day, with
+large content blobs) and times scrapers.rss.parse_feed (streaming, stops at
+the 7-day cutoff) against parse_rss(feedparser.parse(...)), checking both
+return the same stories.
+
+Usage:
+    python benchmarks/bench_feedparse.py [--entries 50 200 1000] [--content-kb 20]
+"""
+import argparse
+import sys
+import time
+from datetime import datetime, timezone, timedelta
+from email.utils import format_datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import feedparser
+from scrapers.rss import parse_feed, parse_rss
+
+
+def synthetic_rss(entries: int, content_kb: int) -> bytes:
+    now = datetime.now(tz=timezone.utc)
+    body = ("Lorem ipsum dolor sit amet agents enterprise. " * (content_kb * 1024 // 47))
+    items = "".join(
+        f"<item><title>Story {i}</title><link>https://example.com/{i}</link>"
+        f"<description>Summary {i}</description>"
+        f"<content:encoded><![CDATA[<p>{body}</p>]]></content:encoded>"
+        f"<pubDate>{format_datetime(now - timedelta(days=i, hours=1))}</pubDate></item>"
+        for i in range(entries)
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/">'
+        f"<channel><title>Synthetic</title>{items}</channel></rss>"
+    ).encode()
+
+
+def synthetic_atom(entries: int, content_kb: int) -> bytes:
+    now = datetime.now(tz=timezone.utc)
+    body = ("Lorem ipsum dolor sit amet agents enterprise. " * (content_kb * 1024 // 47))
+    items = "".join(
+        f'<entry><title>Entry {i}</title><link rel="alternate" href="https://example.com/a/{i}"/>'
+        f"<published>{(now - timedelta(days=i, hours=1)).isoformat()}</published>"
+        f"<summary>Summary {i}</summary><content type=\"html\">{body}</content></entry>"
+        for i in range(entries)
+    )
+    return f'<?xml version="1.0"?><feed xmlns="http://www.w3.org/2005/Atom"><title>T</title>{items}</feed>'.encode()
+
+
+def _best_of(fn, repeat: int = 3) -> tuple[float, list]:
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--entries", type=int, nargs="+", default=[50, 200, 1000])
+    parser.add_argument("--content-kb", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'format':>6} {'entries':>8} {'size':>9} {'stream':>9} {'feedparser':>11} {'speedup':>8}")
+    for fmt, build in (("rss", synthetic_rss), ("atom", synthetic_atom)):
+        for n in args.entries:
+            data = build(n, args.content_kb)
+            stream_s, streamed = _best_of(lambda data=data: parse_feed(data, "Synthetic"))
+            fp_s, reference = _best_of(lambda data=data: parse_rss(feedparser.parse(data), "Synthetic"))
+            if [s.canonical_url for s in streamed] != [s.canonical_url for s in reference]:
+                raise SystemExit(f"story mismatch for {fmt} n={n}")
+            size = f"{len(data) / 1_048_576:.1f}MB"
+            print(f"{fmt:>6} {n:>8} {size:>9} {stream_s:>8.3f}s {fp_s:>10.3f}s {fp_s / stream_s:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
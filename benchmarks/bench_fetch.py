@@ -0,0 +1,164 @@
+"""
+Fetch-stage throughput and tail latency against the offline feed server
+(benchmarks/fake_feeds.py), with no network.
+
+Generates a sources.yaml of N sources cycling through every source type the
+stage handles — RSS, Atom, scraped listings with and without selectors, the
+HN search API and Reddit feeds — all pointing at an in-process FakeFeedServer,
+then runs `pipeline/fetch.py --all` on it once per --max-concurrency value.
+A --slow-fraction of the sources get --slow-latency instead of the server's
+median, to give the run a tail. Per-source times (download + parse) come
+from the stage's run_metrics.json.
+
+--sequential also fetches the sources one after another through
+fetch_source() — the synchronous fetch_rss / fetch_html / fetch_hackernews /
+fetch_reddit path behind `fetch.py --source`.
+
+All sources share one host, so --max-per-host defaults to the concurrency
+being measured rather than fetch.py's per-host cap of 4.
+
+Usage:
+    python benchmarks/bench_fetch.py [--sources 60] [--max-concurrency 4 16 32]
+        [--items 20] [--kb 1] [--latency 0.2] [--drip 0] [--error 0.02] [--timeout-rate 0.01]
+        [--slow-fraction 0.1] [--slow-latency 2.0] [--timeout 5] [--sequential]
+"""
+import argparse
+import io
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fake_feeds import BLOG_SELECTORS, FakeFeedServer
+from pipeline import fetch
+
+SOURCE_TYPES = ["rss", "atom", "scrape", "scrape-fallback", "api", "reddit"]
+
+
+def generate_sources(base: str, n: int, slow_fraction: float = 0.0, slow_latency: float = 2.0) -> list[dict]:
+    """n sources.yaml entries, cycling through SOURCE_TYPES; the last slow_fraction get slow_latency."""
+    slow_from = n - round(n * slow_fraction)
+    sources = []
+    for i in range(n):
+        kind = SOURCE_TYPES[i % len(SOURCE_TYPES)]
+        name = f"{kind.replace('-', '_')}_{i}"
+        query = f"?latency={slow_latency}" if i >= slow_from else ""
+        source = {"name": name, "display_name": f"Source {i}", "weight": "medium"}
+        if kind in ("rss", "atom"):
+            source.update(type="rss", url=f"{base}/{kind}/{name}{query}", filter_keywords=["agent", "model", "llm"])
+        elif kind == "scrape":
+            source.update(type="scrape", url=f"{base}/blog/{name}{query}", selectors=dict(BLOG_SELECTORS))
+        elif kind == "scrape-fallback":
+            source.update(type="scrape", url=f"{base}/blog/{name}{query}")
+        elif kind == "api":
+            source.update(type="api", url=f"{base}/hn{query}", params={"tags": "story", "query": "AI enterprise"})
+        else:
+            source.update(type="reddit", url=f"{base}/r/{name}/top/.rss{query}")
+        sources.append(source)
+    return sources
+
+
+def percentile(values: list[float], pct: int) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100, method="inclusive")[pct - 1]
+
+
+def run_stage(workdir: Path, max_concurrency: int, max_per_host: int, timeout: float) -> tuple[float, list[dict], int]:
+    """Run `fetch.py --all` in workdir. Returns wall seconds, per-source run metrics and stories saved."""
+    argv = [
+        "fetch.py", "--all", "--no-http-cache", "--no-resolve",
+        "--max-concurrency", str(max_concurrency), "--max-per-host", str(max_per_host),
+        "--timeout", str(timeout), "--output-dir", "raw",
+    ]
+    cwd, saved_argv = os.getcwd(), sys.argv
+    os.chdir(workdir)
+    sys.argv = argv
+    try:
+        start = time.perf_counter()
+        with redirect_stdout(io.StringIO()):
+            fetch.main()
+        wall = time.perf_counter() - start
+    finally:
+        os.chdir(cwd)
+        sys.argv = saved_argv
+    http = json.loads((workdir / "run_metrics.json").read_text())["stages"]["fetch"].get("http", [])
+    stories = sum(len(json.loads(p.read_text())) for p in (workdir / "raw").glob("*.json"))
+    for record in http:
+        record["ok"] = record["status"] == 200
+        record["seconds"] = (record["latency_ms"] + (record["parse_ms"] or 0)) / 1000
+    return wall, http, stories
+
+
+def run_sequential(sources: list[dict]) -> tuple[float, list[dict], int]:
+    """fetch_source() per source, one at a time. Sizes aren't known on this path."""
+    records = []
+    stories = 0
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        for source in sources:
+            began = time.perf_counter()
+            fetched = fetch.fetch_source(source)
+            stories += len(fetched)
+            records.append({"source": source["name"], "ok": bool(fetched), "bytes": None,
+                            "seconds": time.perf_counter() - began})
+    return time.perf_counter() - start, records, stories
+
+
+def report(label: str, wall: float, records: list[dict], stories: int) -> None:
+    times = sorted(r["seconds"] for r in records)
+    ok = sum(1 for r in records if r["ok"])
+    sizes = [r["bytes"] for r in records if r["bytes"] is not None]
+    rate = f"{sum(sizes) / 1_048_576 / wall:>6.2f}" if sizes else f"{'-':>6}"
+    print(
+        f"{label:<12} {wall:>7.2f}s {len(records) / wall:>7.1f} {ok:>4}/{len(records):<4} {stories:>7}"
+        f" {rate} {percentile(times, 50):>7.2f}s"
+        f" {percentile(times, 95):>7.2f}s {percentile(times, 99):>7.2f}s"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sources", type=int, default=60)
+    parser.add_argument("--max-concurrency", type=int, nargs="+", default=[4, 16, 32])
+    parser.add_argument("--max-per-host", type=int, help="Default: the concurrency being measured")
+    parser.add_argument("--items", type=int, default=20, help="Entries per feed / page")
+    parser.add_argument("--kb", type=int, default=1, help="Body text per entry (KB)")
+    parser.add_argument("--latency", type=float, default=0.2, help="Median server latency (seconds)")
+    parser.add_argument("--drip", type=float, default=0.0, help="Seconds to spread each body over")
+    parser.add_argument("--error", type=float, default=0.02, help="Fraction of 503 responses")
+    parser.add_argument("--timeout-rate", type=float, default=0.01, help="Fraction of requests never answered")
+    parser.add_argument("--slow-fraction", type=float, default=0.1)
+    parser.add_argument("--slow-latency", type=float, default=2.0)
+    parser.add_argument("--timeout", type=float, default=5.0, help="Client timeout (seconds)")
+    parser.add_argument("--sequential", action="store_true", help="Also time fetch_source() one by one")
+    args = parser.parse_args()
+
+    server = FakeFeedServer(
+        items=args.items, kb=args.kb, latency=args.latency,
+        drip=args.drip, error=args.error, timeout=args.timeout_rate,
+    )
+    with server, tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        sources = generate_sources(server.url, args.sources, args.slow_fraction, args.slow_latency)
+        (workdir / "sources").mkdir()
+        (workdir / "sources" / "sources.yaml").write_text(yaml.safe_dump({"sources": sources}))
+
+        print(f"{'run':<12} {'wall':>8} {'src/s':>7} {'ok':>9} {'stories':>7} {'MB/s':>6} {'p50':>8} {'p95':>8} {'p99':>8}")
+        for concurrency in args.max_concurrency:
+            report(f"--all c={concurrency}", *run_stage(workdir, concurrency, args.max_per_host or concurrency, args.timeout))
+        if args.sequential:
+            report("sequential", *run_sequential(sources))
+    print(f"Server: {dict(server.stats)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Benchmark scoped HTML extraction against a full html.parser tree.
+
+Builds a synthetic listing page (navigation, inline scripts and long article
+cards, as on the CSS-module blogs in sources.yaml) and times
+scrapers.html.parse_html on each installed backend, with and without the
+parse scope, checking every variant returns the same stories as the
+baseline: a full html.parser tree built from the decoded text.
+
+Usage:
+    python benchmarks/bench_html.py [--cards 20 100 400] [--card-kb 4]
+"""
+import argparse
+import importlib.util
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import scrapers.html as html_scraper
+from scrapers.html import parse_html
+
+SELECTORS = {"list": "a[class*='cardLink']", "title": "h2, h3"}
+
+
+def synthetic_page(cards: int, card_kb: int) -> bytes:
+    paragraph = "<p>Lorem ipsum dolor sit amet, <em>agents</em> enterprise rollout.</p>"
+    body = paragraph * (card_kb * 1024 // len(paragraph))
+    nav = "".join(f'<li><a href="/section/{i}">Section {i}</a></li>' for i in range(200))
+    script = "<script>window.__DATA__ = " + '{"k": "v"}, ' * 2000 + ";</script>"
+    items = "".join(
+        f'<div class="BlogCard_root__{i}"><div class="BlogCard_body">{body}</div>'
+        f'<a class="BlogCard_cardLink__x{i}" href="/blog/post-{i}"><h3>Post number {i}</h3></a>'
+        f'<div class="BlogCard_date">Oct {i % 28 + 1}, 2026</div></div>'
+        for i in range(cards)
+    )
+    return (
+        f"<!DOCTYPE html><html><head><title>Blog</title>{script}</head><body>"
+        f"<header><nav><ul>{nav}</ul></nav></header><main>{items}</main>"
+        f"<footer><ul>{nav}</ul></footer></body></html>"
+    ).encode()
+
+
+@contextmanager
+def unscoped():
+    list_scope, fallback_scope = html_scraper._list_scope, html_scraper._FALLBACK_SCOPE
+    html_scraper._list_scope = lambda selector: None
+    html_scraper._FALLBACK_SCOPE = None
+    try:
+        yield
+    finally:
+        html_scraper._list_scope, html_scraper._FALLBACK_SCOPE = list_scope, fallback_scope
+
+
+def _best_of(fn, repeat: int = 3) -> tuple[float, list]:
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def _summary(stories) -> list[tuple]:
+    return [(s.canonical_url, s.title, s.raw_content) for s in stories]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cards", type=int, nargs="+", default=[20, 100, 400])
+    parser.add_argument("--card-kb", type=int, default=4)
+    args = parser.parse_args()
+
+    backends = ["html.parser"] + (["lxml"] if importlib.util.find_spec("lxml") else [])
+    print(f"{'mode':>9} {'cards':>6} {'size':>7} {'baseline':>9}", end="")
+    for backend in backends:
+        print(f" {backend + ' full':>16} {backend + ' scoped':>18}", end="")
+    print()
+
+    for mode, selectors in (("selectors", SELECTORS), ("generic", None)):
+        for n in args.cards:
+            data = synthetic_page(n, args.card_kb)
+            text = data.decode()
+            with unscoped():
+                base_s, reference = _best_of(lambda text=text, selectors=selectors: parse_html(
+                    "Bench", text, "https://blog.example", selectors=selectors, backend="html.parser"))
+            row = f"{mode:>9} {n:>6} {len(data) / 1_048_576:>6.1f}M {base_s:>8.3f}s"
+            for backend in backends:
+                with unscoped():
+                    full_s, full = _best_of(lambda data=data, selectors=selectors, backend=backend: parse_html(
+                        "Bench", data, "https://blog.example", selectors=selectors, backend=backend))
+                scoped_s, scoped = _best_of(lambda data=data, selectors=selectors, backend=backend: parse_html(
+                    "Bench", data, "https://blog.example", selectors=selectors, backend=backend))
+                if _summary(full) != _summary(reference) or _summary(scoped) != _summary(reference):
+                    raise SystemExit(f"story mismatch for {backend} {mode} n={n}")
+                row += f" {full_s:>15.3f}s {scoped_s:>8.3f}s {base_s / scoped_s:>7.1f}x"
+            print(row)
+
+
+if __name__ == "__main__":
+    main()
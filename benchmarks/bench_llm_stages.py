@@ -0,0 +1,151 @@
+"""
+Time the rank, SDLC-classify and summarize LLM calls against the offline
+stand-in endpoint (benchmarks/fake_models.py), with no network.
+
+Starts the fake server in-process, points get_client() / get_async_client()
+at it through MODELS_BASE_URL, and runs N synthetic stories through the same
+calls rank.main() and summarize.main() make: token-budgeted rank batches,
+the classification pass over the ranked stories, then concurrent summaries
+of the top ones. For each phase it reports wall time, calls, 429s, failed
+calls, tokens and call latency percentiles, taken from pipeline/metrics.py.
+
+The client-side rate limiter is opened up unless --rpm is given, so the
+numbers show batching and concurrency rather than the Low-tier quota; pass
+--rpm 15 (and the server's --server-rpm) to watch the limiter at work.
+
+Usage:
+    python benchmarks/bench_llm_stages.py [--stories 200] [--latency 0.3] [--rate-429 0.05]
+        [--rate-malformed 0.02] [--concurrency 3] [--summaries 12] [--token-budget 6000]
+        [--combined] [--rpm 0] [--server-rpm 0]
+"""
+import argparse
+import asyncio
+import io
+import os
+import statistics
+import sys
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fake_models import FakeModelsServer
+from suite import synthetic_stories
+import pipeline.ratelimit as ratelimit
+from pipeline.metrics import current_metrics, reset_metrics
+from pipeline.rank import (
+    RANK_BATCH_PROMPT,
+    RANK_COMBINED_PROMPT,
+    RANK_MODEL,
+    RANK_SYSTEM_PROMPT,
+    _prompt_overhead,
+    _rank_story_text,
+    classify_sdlc_tags,
+    get_async_client,
+    get_client,
+    plan_batches,
+    rank_batch,
+)
+from pipeline.summarize import SUMMARIZE_MODEL, summarize_stories
+
+
+def _percentile(values: list[int], pct: float) -> int:
+    if not values:
+        return 0
+    if len(values) == 1:
+        return values[0]
+    return round(statistics.quantiles(values, n=100, method="inclusive")[int(pct) - 1])
+
+
+def _report(phase: str, seconds: float, first_call: int, statuses_before: dict[str, int]) -> None:
+    metrics = current_metrics()
+    calls = metrics.llm_calls[first_call:]
+    latencies = [c["latency_ms"] for c in calls]
+    rate_limited = sum(
+        counts[429] - statuses_before.get(model, 0) for model, counts in metrics.llm_statuses.items()
+    )
+    failed = sum(1 for c in calls if c["status"] != 200)
+    tokens = sum((c["prompt_tokens"] or 0) + (c["completion_tokens"] or 0) for c in calls)
+    print(
+        f"{phase:<10} {seconds:>7.2f}s {len(calls):>6} {rate_limited:>5} {failed:>6} {tokens:>8}"
+        f" {_percentile(latencies, 50):>6}ms {_percentile(latencies, 95):>6}ms"
+    )
+
+
+def _snapshot() -> tuple[int, dict[str, int]]:
+    metrics = current_metrics()
+    return len(metrics.llm_calls), {model: counts[429] for model, counts in metrics.llm_statuses.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--stories", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.3, help="Median server latency (seconds)")
+    parser.add_argument("--rate-429", type=float, default=0.05)
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    parser.add_argument("--rate-malformed", type=float, default=0.02)
+    parser.add_argument("--server-rpm", type=int, default=0, help="Quota the server enforces (0: none)")
+    parser.add_argument("--rpm", type=int, default=0, help="Client limiter requests/minute (0: unlimited)")
+    parser.add_argument("--concurrency", type=int, default=3, help="Summaries in flight")
+    parser.add_argument("--summaries", type=int, default=12)
+    parser.add_argument("--token-budget", type=int, default=6000)
+    parser.add_argument("--combined", action="store_true", help="Scores and SDLC tags in one call")
+    parser.add_argument("--verbose", action="store_true", help="Show the pipeline's own progress lines")
+    args = parser.parse_args()
+
+    stories = synthetic_stories(args.stories)
+    for story in stories:
+        story.priority_category, story.priority_score, story.sdlc_tags = None, None, []
+
+    limits = (args.rpm, 10**6) if args.rpm else (10**6, 10**9)
+    for model in (RANK_MODEL, SUMMARIZE_MODEL):
+        ratelimit.MODEL_LIMITS[model] = limits
+    ratelimit.reset_limiters()
+    reset_metrics()
+
+    server = FakeModelsServer(
+        latency=args.latency,
+        rate_429=args.rate_429,
+        retry_after=args.retry_after,
+        rate_malformed=args.rate_malformed,
+        rpm=args.server_rpm,
+    )
+    with server:
+        os.environ["MODELS_BASE_URL"] = server.url
+        os.environ.setdefault("GITHUB_TOKEN", "offline")
+        client = get_client()
+        output = sys.stdout if args.verbose else io.StringIO()
+
+        print(f"{'phase':<10} {'wall':>8} {'calls':>6} {'429s':>5} {'failed':>6} {'tokens':>8} {'p50':>8} {'p95':>8}")
+        mark = _snapshot()
+        start = time.perf_counter()
+        prompt = RANK_COMBINED_PROMPT if args.combined else RANK_BATCH_PROMPT
+        batches = plan_batches(stories, _rank_story_text, _prompt_overhead(RANK_SYSTEM_PROMPT, prompt), args.token_budget)
+        ranked = []
+        with redirect_stdout(output):
+            for batch in batches:
+                ranked.extend(rank_batch(batch, client, combined=args.combined))
+        _report("rank", time.perf_counter() - start, *mark)
+
+        untagged = [s for s in ranked if not s.sdlc_tags]
+        mark = _snapshot()
+        start = time.perf_counter()
+        with redirect_stdout(output):
+            if untagged:
+                classify_sdlc_tags(untagged, client)
+        _report("classify", time.perf_counter() - start, *mark)
+
+        top = sorted(ranked, key=lambda s: s.priority_score or 0, reverse=True)[:args.summaries]
+        mark = _snapshot()
+        start = time.perf_counter()
+        with redirect_stdout(output):
+            summarized = asyncio.run(summarize_stories(top, get_async_client(), None, args.concurrency))
+        _report("summarize", time.perf_counter() - start, *mark)
+
+    print(f"\n{len(ranked)}/{len(stories)} stories ranked, {sum(1 for s in summarized if s.summary)}/{len(top)} summarized")
+    print(f"Server: {dict(server.stats)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Benchmark StoryRecord against pydantic Story for bulk in-pipeline work.
+
+Serializes N synthetic stories (1-3 sources each, ~1.5 KB of content) the
+way fetch.py writes them, then for each representation measures:
+  - load:    building N objects from the decoded JSON dicts
+  - memory:  bytes allocated while building them (tracemalloc)
+  - process: age filter + URL dedup + title dedup + prescore sort
+and checks both paths end with the same stories.
+
+Usage:
+    python benchmarks/bench_story_record.py [--stories 10000 100000]
+"""
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pipeline.normalize import (
+    deduplicate_by_title_similarity,
+    deduplicate_by_url,
+    filter_older_than_days,
+)
+from pipeline.rank import presort_and_limit
+from schemas.record import StoryRecord
+from schemas.story import Story, StorySource
+
+WORDS = (
+    "openai anthropic google microsoft agents copilot model release launch api sdk "
+    "enterprise coding workflow inference evaluation benchmark security platform"
+).split()
+SOURCES = ["OpenAI", "Hacker News", "TLDR AI", "The Verge", "GitHub Blog", "Simon Willison"]
+
+
+def synthetic_items(n: int, seed: int = 0) -> list[dict]:
+    rng = random.Random(seed)
+    now = datetime.now(tz=timezone.utc)
+    content = "Lorem ipsum dolor sit amet, agents enterprise rollout. " * 28
+    items = []
+    for i in range(n):
+        url = f"https://example.com/{rng.randrange(n)}"
+        story = Story.from_url(
+            url=url,
+            title=" ".join(rng.choices(WORDS, k=8)) + f" {i}",
+            source_name=rng.choice(SOURCES),
+            published_at=now - timedelta(hours=rng.randrange(24 * 10)),
+            raw_content=content,
+        )
+        for _ in range(rng.randrange(3)):
+            story.sources.append(StorySource(name=rng.choice(SOURCES), url=url))
+        items.append(story.model_dump(mode="json"))
+    return items
+
+
+def _load_stories(items: list[dict]) -> list[Story]:
+    stories = []
+    for item in items:
+        item = dict(item, published_at=datetime.fromisoformat(item["published_at"]))
+        stories.append(Story(**item))
+    return stories
+
+
+def _process(stories: list) -> list:
+    stories = filter_older_than_days(stories, days=7)
+    stories = deduplicate_by_url(stories)
+    stories = deduplicate_by_title_similarity(stories, threshold=0.6)
+    return presort_and_limit(stories, {"OpenAI": 20, "Hacker News": 10}, limit=40)
+
+
+def _measure(build, items: list[dict]) -> tuple[float, int, float, list]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    objects = build(items)
+    load_s = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    kept = _process(objects)
+    return load_s, size, time.perf_counter() - start, kept
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--stories", type=int, nargs="+", default=[10_000, 100_000])
+    args = parser.parse_args()
+
+    print(f"{'stories':>8} {'type':>7} {'load':>8} {'memory':>9} {'process':>9}")
+    for n in args.stories:
+        items = synthetic_items(n)
+        results = {}
+        for name, build in (("Story", _load_stories), ("record", lambda it: [StoryRecord.from_dict(i) for i in it])):
+            load_s, size, process_s, kept = _measure(build, items)
+            results[name] = kept
+            print(f"{n:>8} {name:>7} {load_s:>7.2f}s {size / 1_048_576:>7.1f}MB {process_s:>8.2f}s")
+        # The URL dedup mutates source lists in place — compare only what survives
+        if [s.id for s in results["Story"]] != [r.id for r in results["record"]]:
+            raise SystemExit(f"story mismatch at n={n}")
+
+
+if __name__ == "__main__":
+    main()
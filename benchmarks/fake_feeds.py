@@ -0,0 +1,306 @@
+"""
+Offline stand-in for the sites the fetch stage downloads.
+
+Serves generated content in the shapes the scrapers parse:
+    /rss/<name>               RSS 2.0 feed
+    /atom/<name>              Atom feed
+    /blog/<name>              HTML listing page; every card matches both the
+                              selectors in BLOG_SELECTORS and the generic fallback
+    /hn                       Algolia HN search JSON ({"hits": [...]})
+    /r/<name>/top/.rss        Reddit-style Atom feed of link posts
+
+Entries are dated over the last few days (inside fetch's 7-day cutoff) and
+titles mention AI / agent keywords, so a source's filter_keywords keep them.
+
+Every response can be shaped by server-wide defaults, overridden per URL by
+query parameters — a generated sources.yaml gives each source its own:
+    items=N     entries per response                         (default 20)
+    kb=K        body text per entry, in KB                   (default 1)
+    latency=S   median delay before responding, log-normal   (default 0)
+    drip=S      spread the body over S seconds, in chunks    (default 0)
+    error=P     fraction of requests answered with HTTP 503  (default 0)
+    timeout=P   fraction of requests that never answer       (default 0)
+
+Usage:
+    python benchmarks/fake_feeds.py [--port 8766] [--items 20] [--kb 1] [--latency 0.2]
+        [--drip 0] [--error 0] [--timeout 0] [--seed 0]
+
+benchmarks/bench_fetch.py runs the fetch stage against it.
+"""
+import argparse
+import json
+import math
+import random
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone, timedelta
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from xml.sax.saxutils import escape
+
+BLOG_SELECTORS = {"list": "a[class*='cardLink']", "title": "h2, h3", "date": "time"}
+
+WORDS = (
+    "agent agents copilot model launch api sdk enterprise coding workflow inference "
+    "evaluation benchmark security platform release open-source reasoning llm"
+).split()
+HANG_SECONDS = 600   # a "timeout" response; the client gives up long before this
+
+
+def _entries(name: str, items: int, kb: int) -> list[dict]:
+    """Deterministic entries for one endpoint: same name and size, same content."""
+    rng = random.Random(name)
+    now = datetime.now(tz=timezone.utc).replace(microsecond=0)
+    paragraph = "Lorem ipsum dolor sit amet, agents enterprise rollout and model release notes. "
+    body = paragraph * max(kb * 1024 // len(paragraph), 1)
+    return [
+        {
+            "title": f"{name} {' '.join(rng.choices(WORDS, k=6))} {i}",
+            "path": f"/{name}/post-{i}",
+            "published": now - timedelta(hours=i * 3 + 1),
+            "body": body,
+        }
+        for i in range(items)
+    ]
+
+
+def rss_feed(base: str, name: str, items: int, kb: int) -> str:
+    entries = "".join(
+        f"<item><title>{escape(e['title'])}</title><link>{base}{e['path']}</link>"
+        f"<guid>{base}{e['path']}</guid><pubDate>{format_datetime(e['published'])}</pubDate>"
+        f"<description>{escape(e['body'])}</description></item>"
+        for e in _entries(name, items, kb)
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+        f"<title>{escape(name)}</title><link>{base}/</link>{entries}</channel></rss>"
+    )
+
+
+def atom_feed(base: str, name: str, items: int, kb: int, reddit: bool = False) -> str:
+    entries = []
+    for e in _entries(name, items, kb):
+        link = f"{base}{e['path']}"
+        content = escape(e["body"])
+        if reddit:
+            # Link posts: the entry points at the comments, the article is in the content
+            content = escape(f'<a href="https://example.com{e["path"]}">[link]</a> {e["body"]}')
+            link = f"{base}/r/{name}/comments{e['path']}"
+        entries.append(
+            f"<entry><title>{escape(e['title'])}</title><link href=\"{link}\"/>"
+            f"<id>{link}</id><updated>{e['published'].isoformat()}</updated>"
+            f"<published>{e['published'].isoformat()}</published>"
+            f'<content type="html">{content}</content></entry>'
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?><feed xmlns="http://www.w3.org/2005/Atom">'
+        f"<title>{escape(name)}</title><id>{base}/{name}</id>"
+        f"<updated>{datetime.now(tz=timezone.utc).isoformat()}</updated>{''.join(entries)}</feed>"
+    )
+
+
+def blog_page(name: str, items: int, kb: int) -> str:
+    nav = "".join(f'<li><a href="/section/{i}">Section {i}</a></li>' for i in range(50))
+    cards = "".join(
+        f'<article class="post BlogCard_root"><p>{escape(e["body"])}</p>'
+        f'<a class="BlogCard_cardLink__x" href="/blog{e["path"]}"><h3>{escape(e["title"])}</h3></a>'
+        f'<time datetime="{e["published"].isoformat()}">{e["published"]:%b %d, %Y}</time></article>'
+        for e in _entries(name, items, kb)
+    )
+    return (
+        f"<!DOCTYPE html><html><head><title>{escape(name)}</title></head><body>"
+        f"<nav><ul>{nav}</ul></nav><main>{cards}</main></body></html>"
+    )
+
+
+def hn_search(base: str, items: int, kb: int) -> str:
+    return json.dumps({"hits": [
+        {
+            "objectID": str(i),
+            "title": e["title"],
+            "url": f"{base}{e['path']}",
+            "created_at": e["published"].isoformat().replace("+00:00", "Z"),
+            "story_text": e["body"],
+        }
+        for i, e in enumerate(_entries("hn", items, kb))
+    ]})
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        pass   # clients hanging up on slow or stalled responses is the point
+
+
+class FakeFeedServer:
+    """The stand-in sites on a background thread. Use as a context manager, or start()/stop()."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        items: int = 20,
+        kb: int = 1,
+        latency: float = 0.0,
+        latency_sigma: float = 0.5,
+        drip: float = 0.0,
+        error: float = 0.0,
+        timeout: float = 0.0,
+        seed: int = 0,
+    ):
+        self.defaults = {"items": items, "kb": kb, "latency": latency, "drip": drip, "error": error, "timeout": timeout}
+        self.latency_sigma = latency_sigma
+        self.stats: Counter = Counter()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._httpd = _Server((host, port), self._handler())
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeFeedServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._closed.set()   # releases stalled handlers
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self) -> "FakeFeedServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _options(self, query: str) -> dict:
+        options = dict(self.defaults)
+        for key, values in parse_qs(query).items():
+            if key in options:
+                options[key] = type(options[key])(float(values[-1]))
+        return options
+
+    def _plan(self, options: dict) -> tuple[float, str]:
+        """(delay, outcome) for the next request; outcome is ok, error or timeout."""
+        with self._lock:
+            self.stats["requests"] += 1
+            latency = options["latency"]
+            delay = self._rng.lognormvariate(math.log(latency), self.latency_sigma) if latency > 0 else 0.0
+            roll = self._rng.random()
+            if roll < options["timeout"]:
+                self.stats["timeout"] += 1
+                return delay, "timeout"
+            if roll < options["timeout"] + options["error"]:
+                self.stats["error"] += 1
+                return delay, "error"
+            self.stats["ok"] += 1
+            return delay, "ok"
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                pass
+
+            def _body(self, path: str, options: dict) -> tuple[str, str] | None:
+                """(content type, body) for a route, or None."""
+                base = server.url
+                parts = [p for p in path.split("/") if p]
+                items, kb = options["items"], options["kb"]
+                if len(parts) == 2 and parts[0] == "rss":
+                    return "application/rss+xml", rss_feed(base, parts[1], items, kb)
+                if len(parts) == 2 and parts[0] == "atom":
+                    return "application/atom+xml", atom_feed(base, parts[1], items, kb)
+                if len(parts) == 2 and parts[0] == "blog":
+                    return "text/html; charset=utf-8", blog_page(parts[1], items, kb)
+                if parts == ["hn"]:
+                    return "application/json", hn_search(base, items, kb)
+                if len(parts) >= 2 and parts[0] == "r":
+                    return "application/atom+xml", atom_feed(base, parts[1], items, kb, reddit=True)
+                return None
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                options = server._options(url.query)
+                delay, outcome = server._plan(options)
+                if server._closed.wait(delay):
+                    return
+                if outcome == "timeout":
+                    server._closed.wait(HANG_SECONDS)
+                    return
+
+                routed = self._body(url.path, options)
+                if outcome == "error" or routed is None:
+                    status = 404 if routed is None else 503
+                    self.send_response(status)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+
+                content_type, body = routed
+                payload = body.encode()
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                with server._lock:
+                    server.stats["bytes"] += len(payload)
+                if options["drip"] <= 0:
+                    self.wfile.write(payload)
+                    return
+                # Slow drip: the body in 16 chunks spread over `drip` seconds
+                chunk = max(len(payload) // 16, 1)
+                for start in range(0, len(payload), chunk):
+                    self.wfile.write(payload[start:start + chunk])
+                    if server._closed.wait(options["drip"] / 16):
+                        return
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--items", type=int, default=20, help="Entries per response")
+    parser.add_argument("--kb", type=int, default=1, help="Body text per entry (KB)")
+    parser.add_argument("--latency", type=float, default=0.2, help="Median response delay in seconds")
+    parser.add_argument("--latency-sigma", type=float, default=0.5, help="Log-normal spread of the delay")
+    parser.add_argument("--drip", type=float, default=0.0, help="Seconds to spread each body over")
+    parser.add_argument("--error", type=float, default=0.0, help="Fraction of requests answered with 503")
+    parser.add_argument("--timeout", type=float, default=0.0, help="Fraction of requests never answered")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    server = FakeFeedServer(
+        args.host, args.port, args.items, args.kb, args.latency, args.latency_sigma,
+        args.drip, args.error, args.timeout, args.seed,
+    )
+    print(f"Serving fake feeds on {server.url} (/rss/<name>, /atom/<name>, /blog/<name>, /hn, /r/<name>/top/.rss)")
+    server.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        print(dict(server.stats))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+"""
+Offline stand-in for the GitHub Models chat-completions endpoint.
+
+Serves POST .../chat/completions in the OpenAI response format, answering
+the pipeline's own prompts (rank batch, combined rank + SDLC tags, SDLC
+classification, single-story rank, summary) with valid JSON whose scores and
+tags are derived from each story title's hash — the same prompt always gets
+the same answer. On top of that it can:
+  - delay each response by a log-normal latency (--latency median seconds,
+    --latency-sigma spread)
+  - return 429 with Retry-After / retry-after-ms on a fraction of requests
+    (--rate-429), or whenever more than --rpm requests arrived in the last
+    minute, like the real per-minute quota
+  - return truncated, unparseable JSON content on a fraction of requests
+    (--rate-malformed)
+Every response reports usage (~4 characters per token), and successful ones
+carry x-ratelimit-remaining-requests when --rpm is set.
+
+Point the pipeline at it with MODELS_BASE_URL (any GITHUB_TOKEN will do):
+
+    python benchmarks/fake_models.py --port 8765 --latency 0.5 --rate-429 0.05
+    MODELS_BASE_URL=http://127.0.0.1:8765 GITHUB_TOKEN=x python pipeline/rank.py
+
+benchmarks/bench_llm_stages.py runs the server in-process and times the
+rank, classify and summarize calls against it.
+
+Usage:
+    python benchmarks/fake_models.py [--port 8765] [--latency 0.4] [--latency-sigma 0.5]
+        [--rate-429 0.0] [--retry-after 2.0] [--rate-malformed 0.0] [--rpm 0] [--seed 0]
+"""
+import argparse
+import hashlib
+import json
+import math
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# The ranking taxonomy itself, so the fake answers track any change to it
+from pipeline.rank import CATEGORIES, SDLC_TAGS
+
+_STORY_TITLE = re.compile(r"^Story (\d+) — Title: (.*)$", re.MULTILINE)
+_SINGLE_TITLE = re.compile(r"^Title: (.*)$", re.MULTILINE)
+
+
+def _digest(title: str) -> bytes:
+    return hashlib.sha256(title.encode()).digest()
+
+
+def story_scores(title: str) -> dict[str, int]:
+    digest = _digest(title)
+    return {cat: digest[i] % 101 for i, cat in enumerate(CATEGORIES)}
+
+
+def story_included(title: str) -> bool:
+    return _digest(title)[4] % 5 != 0          # ~80% of stories pass
+
+
+def story_tags(title: str) -> list[str]:
+    bits = _digest(title)[5]
+    specific = [tag for tag in SDLC_TAGS if tag != "general"]
+    return [tag for i, tag in enumerate(specific) if bits & (1 << i)][:2] or ["general"]
+
+
+def answer(messages: list[dict]) -> str:
+    """The JSON content a well-behaved model would return for one of the pipeline's prompts."""
+    system = next((m["content"] for m in messages if m.get("role") == "system"), "")
+    prompt = next((m["content"] for m in reversed(messages) if m.get("role") == "user"), "")
+    stories = _STORY_TITLE.findall(prompt)
+
+    if "classifier" in system:
+        return json.dumps({"stories": [
+            {"index": int(i), "title": title, "sdlc_tags": story_tags(title)} for i, title in stories
+        ]})
+    if stories:
+        tagged = "sdlc_tags" in prompt
+        items = []
+        for i, title in stories:
+            item = {"index": int(i), "scores": story_scores(title), "include": story_included(title)}
+            if tagged:
+                item["sdlc_tags"] = story_tags(title)
+            items.append(item)
+        return json.dumps({"stories": items})
+
+    match = _SINGLE_TITLE.search(prompt)
+    title = match.group(1) if match else prompt[:80]
+    if "analyst" in system:
+        return json.dumps({
+            "what_happened": f"{title} was announced.",
+            "enterprise_impact": f"Enterprises evaluating {title[:40]} should review it.",
+            "software_delivery_impact": "Build and release pipelines may change.",
+            "developer_impact": "Developers get a new capability to try.",
+            "human_impact": "Routine work shifts towards review.",
+            "how_to_use": "Pilot it with one team this week.",
+        })
+    return json.dumps({"scores": story_scores(title), "include": story_included(title)})
+
+
+class FakeModelsServer:
+    """The stand-in endpoint on a background thread. Use as a context manager, or start()/stop()."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        latency_sigma: float = 0.5,
+        rate_429: float = 0.0,
+        retry_after: float = 2.0,
+        rate_malformed: float = 0.0,
+        rpm: int = 0,
+        seed: int = 0,
+    ):
+        self.latency = latency
+        self.latency_sigma = latency_sigma
+        self.rate_429 = rate_429
+        self.retry_after = retry_after
+        self.rate_malformed = rate_malformed
+        self.rpm = rpm
+        self.stats: Counter = Counter()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._recent: deque[float] = deque()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeModelsServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self) -> "FakeModelsServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _plan(self) -> tuple[float, str, float]:
+        """(delay, outcome, retry-after seconds) for the next request; outcome is ok, 429 or malformed."""
+        with self._lock:
+            self.stats["requests"] += 1
+            now = time.monotonic()
+            delay = self._rng.lognormvariate(math.log(self.latency), self.latency_sigma) if self.latency > 0 else 0.0
+            if self.rpm:
+                while self._recent and now - self._recent[0] >= 60:
+                    self._recent.popleft()
+                if len(self._recent) >= self.rpm:
+                    self.stats["429"] += 1
+                    return 0.0, "429", 60 - (now - self._recent[0])
+                self._recent.append(now)
+            roll = self._rng.random()
+            if roll < self.rate_429:
+                self.stats["429"] += 1
+                return delay, "429", self.retry_after
+            if roll < self.rate_429 + self.rate_malformed:
+                self.stats["malformed"] += 1
+                return delay, "malformed", 0.0
+            self.stats["ok"] += 1
+            return delay, "ok", 0.0
+
+    def _remaining(self) -> int | None:
+        if not self.rpm:
+            return None
+        with self._lock:
+            return max(self.rpm - len(self._recent), 0)
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True   # headers and body go out as separate writes
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status: int, body: dict, headers: dict | None = None) -> None:
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_POST(self):
+                request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                if not self.path.rstrip("/").endswith("chat/completions"):
+                    self._send(404, {"error": {"message": f"no route {self.path}"}})
+                    return
+                delay, outcome, retry_after = server._plan()
+                time.sleep(delay)
+
+                if outcome == "429":
+                    self._send(429, {"error": {"message": "Rate limit exceeded", "code": "RateLimitReached"}}, {
+                        "Retry-After": str(math.ceil(retry_after)),
+                        "retry-after-ms": str(round(retry_after * 1000)),
+                    })
+                    return
+
+                messages = request.get("messages", [])
+                content = answer(messages)
+                if outcome == "malformed":
+                    content = content[: len(content) // 2]
+                prompt_chars = sum(len(m.get("content", "")) for m in messages)
+                headers = {}
+                remaining = server._remaining()
+                if remaining is not None:
+                    headers["x-ratelimit-remaining-requests"] = str(remaining)
+                self._send(200, {
+                    "id": f"chatcmpl-fake-{server.stats['requests']}",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": request.get("model", ""),
+                    "choices": [{
+                        "index": 0,
+                        "message": {"role": "assistant", "content": content},
+                        "finish_reason": "stop",
+                    }],
+                    "usage": {
+                        "prompt_tokens": prompt_chars // 4 + 1,
+                        "completion_tokens": len(content) // 4 + 1,
+                        "total_tokens": prompt_chars // 4 + len(content) // 4 + 2,
+                    },
+                }, headers)
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.4, help="Median response delay in seconds")
+    parser.add_argument("--latency-sigma", type=float, default=0.5, help="Log-normal spread of the delay")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument("--retry-after", type=float, default=2.0, help="Retry-After on injected 429s (seconds)")
+    parser.add_argument("--rate-malformed", type=float, default=0.0, help="Fraction of responses with broken JSON")
+    parser.add_argument("--rpm", type=int, default=0, help="Enforce a requests-per-minute quota (0: none)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    server = FakeModelsServer(
+        args.host, args.port, args.latency, args.latency_sigma,
+        args.rate_429, args.retry_after, args.rate_malformed, args.rpm, args.seed,
+    )
+    print(f"Serving fake chat completions on {server.url} — Ctrl-C to stop")
+    server.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        print(dict(server.stats))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+"""
+Microbenchmark suite for the pipeline's CPU hot paths.
+
+Times each case on synthetic input at several sizes (best of --repeat runs;
+building the input is not timed), prints how each one scales — the
+exponent k in time ∝ size^k between consecutive sizes — and compares every
+timing with benchmarks/baselines.json. A case more than --threshold times
+slower than its baseline (and at least --min-delta seconds slower) is a
+regression and the run exits with status 1.
+
+Baselines are machine-specific: record them with --save on the machine
+that runs the comparison.
+
+Usage:
+    python benchmarks/suite.py [--filter dedup] [--repeat 5] [--threshold 2.0] [--save] [--quick]
+"""
+import argparse
+import gc
+import io
+import json
+import math
+import platform
+import random
+import sys
+import time
+from collections.abc import Callable
+from contextlib import redirect_stdout
+from datetime import datetime, timezone, timedelta
+from functools import partial
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bench_dedup import synthetic_titles
+from bench_feedparse import synthetic_rss
+from bench_html import SELECTORS, synthetic_page
+from pipeline.deliver import format_digest, split_message
+from pipeline.normalize import deduplicate_by_title_similarity, deduplicate_by_url
+from pipeline.rank import CATEGORIES, SDLC_TAGS, presort_and_limit, select_top_stories
+from schemas.story import Story, StorySource, StorySummary
+from scrapers.html import parse_html
+from scrapers.rss import parse_feed
+
+BASELINES_PATH = Path(__file__).parent / "baselines.json"
+SOURCES = [f"source-{i}" for i in range(40)]
+SOURCE_WEIGHTS = {name: (20, 10, 0)[i % 3] for i, name in enumerate(SOURCES)}
+FILTER_KEYWORDS = ["agent", "copilot", "model", "api", "enterprise", "llm"]
+SUMMARY = StorySummary(
+    what_happened="A model shipped.",
+    enterprise_impact="Teams can adopt it.",
+    software_delivery_impact="Reviews get faster.",
+    developer_impact="New API surface.",
+    human_impact="Less toil.",
+    how_to_use="Pilot it on one repo.",
+)
+
+
+def synthetic_stories(n: int, seed: int = 7) -> list[Story]:
+    """Stories as normalize/rank see them: near-duplicate titles, URL variants, 1-3 sources."""
+    rng = random.Random(seed)
+    now = datetime.now(tz=timezone.utc)
+    stories = []
+    for i, title in enumerate(synthetic_titles(n, seed)):
+        # A third of the links are tracking / scheme variants of an earlier URL
+        base = f"example.com/post/{rng.randrange(n) if rng.random() < 0.33 else n + i}"
+        url = rng.choice([f"https://{base}", f"http://{base}/", f"https://{base}?utm_source=feed{i}"])
+        story = Story.from_url(
+            url=url,
+            title=title,
+            source_name=rng.choice(SOURCES),
+            published_at=now - timedelta(hours=rng.randrange(24 * 14)),
+            raw_content=title,
+        )
+        for _ in range(rng.randrange(3)):
+            story.sources.append(StorySource(name=rng.choice(SOURCES), url=url))
+        story.priority_category = rng.choice(CATEGORIES)
+        story.priority_score = rng.randint(1, 10)
+        story.sdlc_tags = rng.sample(SDLC_TAGS, k=rng.randint(1, 2))
+        stories.append(story)
+    return stories
+
+
+def _copies(stories: list[Story]) -> list[Story]:
+    return [s.model_copy(deep=True) for s in stories]
+
+
+def _digest_input(per_category: int) -> tuple:
+    stories = synthetic_stories(per_category * len(CATEGORIES))
+    for story in stories[:3]:
+        story.summary = SUMMARY
+    by_category = {cat: [s for s in stories if s.priority_category == cat] for cat in CATEGORIES}
+    return stories[:3], by_category, stories[::4]
+
+
+def _digest_text(per_category: int) -> str:
+    top3, by_category, enterprise = _digest_input(per_category)
+    return format_digest(top3, by_category, week_of="Oct 12, 2026", enterprise_items=enterprise)
+
+
+# Each prepare_*(size) builds the input untimed and returns a zero-argument
+# callable that runs the case once on it
+def prepare_dedup_title(n: int) -> Callable[[], object]:
+    return partial(deduplicate_by_title_similarity, _copies(synthetic_stories(n)), 0.6)
+
+
+def prepare_dedup_url(n: int) -> Callable[[], object]:
+    return partial(deduplicate_by_url, _copies(synthetic_stories(n)))
+
+
+def prepare_presort(n: int) -> Callable[[], object]:
+    return partial(presort_and_limit, synthetic_stories(n), SOURCE_WEIGHTS)
+
+
+def prepare_select_top(n: int) -> Callable[[], object]:
+    return partial(select_top_stories, synthetic_stories(n))
+
+
+def prepare_format_digest(n: int) -> Callable[[], object]:
+    top3, by_category, enterprise = _digest_input(n)
+    return partial(format_digest, top3, by_category, week_of="Oct 12, 2026", enterprise_items=enterprise)
+
+
+def prepare_split_message(n: int) -> Callable[[], object]:
+    return partial(split_message, _digest_text(n))
+
+
+def prepare_parse_feed(n: int) -> Callable[[], object]:
+    return partial(parse_feed, synthetic_rss(n, 2), "Bench", FILTER_KEYWORDS)
+
+
+def prepare_parse_feed_full(n: int) -> Callable[[], object]:
+    return partial(parse_feed, synthetic_rss(n, 2), "Bench", FILTER_KEYWORDS, max_age_days=n + 1)
+
+
+def prepare_parse_html(n: int) -> Callable[[], object]:
+    return partial(parse_html, "Bench", synthetic_page(n, 2), "https://blog.example", selectors=SELECTORS)
+
+
+# name → (sizes, quick size, prepare(size) → zero-argument callable that runs the case once)
+CASES: dict[str, tuple[list[int], int, Callable[[int], Callable[[], object]]]] = {
+    "dedup_title": ([100, 1000, 5000], 100, prepare_dedup_title),
+    "dedup_url": ([100, 1000, 5000], 100, prepare_dedup_url),
+    "presort": ([100, 1000, 5000, 20000], 100, prepare_presort),
+    "select_top": ([100, 1000, 5000], 100, prepare_select_top),
+    "format_digest": ([5, 50, 500], 5, prepare_format_digest),
+    "split_message": ([5, 50, 500], 5, prepare_split_message),
+    # One entry per day: the default 7-day cutoff stops early, max_age_days=n reads it all
+    "parse_feed": ([50, 500, 2000], 50, prepare_parse_feed),
+    "parse_feed_full": ([50, 500, 2000], 50, prepare_parse_feed_full),
+    "parse_html": ([20, 200, 1000], 20, prepare_parse_html),
+}
+
+
+def time_case(prepare: Callable[[int], Callable[[], object]], size: int, repeat: int) -> float:
+    """Best-of-repeat seconds for one run; each run gets freshly prepared input.
+
+    The garbage collector is off while timing (as in timeit), so a collection
+    triggered by the input build doesn't land in the measurement.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        run = prepare(size)
+        gc.collect()
+        gc.disable()
+        try:
+            with redirect_stdout(io.StringIO()):   # presort_and_limit reports what it kept
+                start = time.perf_counter()
+                run()
+                best = min(best, time.perf_counter() - start)
+        finally:
+            gc.enable()
+    return best
+
+
+def run_suite(name_filter: str = "", repeat: int = 5, quick: bool = False) -> dict[str, float]:
+    """{"case/size": seconds} for every case whose name contains name_filter."""
+    results = {}
+    for name, (sizes, quick_size, prepare) in CASES.items():
+        if name_filter not in name:
+            continue
+        for size in [quick_size] if quick else sizes:
+            results[f"{name}/{size}"] = time_case(prepare, size, repeat)
+    return results
+
+
+def scaling(results: dict[str, float]) -> dict[str, list[tuple[int, float, float | None]]]:
+    """Per case: (size, seconds, exponent k from the previous size) — k≈1 linear, 2 quadratic."""
+    table: dict[str, list[tuple[int, float, float | None]]] = {}
+    for key, seconds in results.items():
+        name, size = key.rsplit("/", 1)
+        rows = table.setdefault(name, [])
+        k = None
+        if rows and rows[-1][1] > 0 and seconds > 0:
+            k = math.log(seconds / rows[-1][1]) / math.log(int(size) / rows[-1][0])
+        rows.append((int(size), seconds, k))
+    return table
+
+
+def compare(
+    results: dict[str, float],
+    baselines: dict[str, float],
+    threshold: float,
+    min_delta: float,
+) -> list[str]:
+    """Keys whose time exceeds threshold * baseline by at least min_delta seconds."""
+    return [
+        key for key, seconds in results.items()
+        if key in baselines
+        and seconds > baselines[key] * threshold
+        and seconds - baselines[key] >= min_delta
+    ]
+
+
+def load_baselines(path: Path = BASELINES_PATH) -> dict[str, float]:
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text()).get("timings", {})
+
+
+def save_baselines(results: dict[str, float], path: Path = BASELINES_PATH) -> None:
+    """Merge results into the stored baselines (cases not run keep their old value)."""
+    timings = {**load_baselines(path), **{k: round(v, 6) for k, v in results.items()}}
+    path.write_text(json.dumps({
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "recorded_at": datetime.now(tz=timezone.utc).isoformat(timespec="seconds"),
+        "timings": dict(sorted(timings.items())),
+    }, indent=2) + "\n")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--filter", default="", help="Only run cases whose name contains this")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--threshold", type=float, default=2.0, help="Regression if slower than threshold * baseline")
+    parser.add_argument("--min-delta", type=float, default=0.002, help="Ignore regressions smaller than this (seconds)")
+    parser.add_argument("--save", action="store_true", help="Record these timings as the new baselines")
+    parser.add_argument("--quick", action="store_true", help="Smallest size of each case only")
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.filter, args.repeat, args.quick)
+    baselines = load_baselines()
+
+    print(f"{'case':<14} {'size':>6} {'time':>10} {'baseline':>10} {'ratio':>6} {'scaling':>8}")
+    for name, rows in scaling(results).items():
+        for size, seconds, k in rows:
+            key = f"{name}/{size}"
+            base = baselines.get(key)
+            base_col = f"{base * 1000:>8.2f}ms" if base else f"{'-':>10}"
+            ratio_col = f"{seconds / base:>5.2f}x" if base else f"{'-':>6}"
+            k_col = f"n^{k:.2f}" if k is not None else "-"
+            print(f"{name:<14} {size:>6} {seconds * 1000:>8.2f}ms {base_col} {ratio_col} {k_col:>8}")
+
+    if args.save:
+        save_baselines(results)
+        print(f"Saved {len(results)} baselines to {BASELINES_PATH}")
+        return 0
+
+    regressions = compare(results, baselines, args.threshold, args.min_delta)
+    for key in regressions:
+        print(f"REGRESSION {key}: {results[key] * 1000:.2f}ms vs baseline {baselines[key] * 1000:.2f}ms")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
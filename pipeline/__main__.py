@@ -0,0 +1,195 @@
+"""
+Run the pipeline in one process.
+
+Usage:
+  python -m pipeline run [--from STAGE] [--until STAGE] [--skip STAGE ...] [--dump]
+                         [--active-sources active_sources.json] [--no-http-cache] [--no-resolve]
+
+Stages: fetch, normalize, rank, summarize, deliver, publish. Each hands its
+output to the next as Story objects in memory instead of through a JSON
+artifact, so a run costs the network and LLM waits plus one interpreter
+start — not a checkout, install and artifact round trip per stage.
+
+fetch fetches every source concurrently (as `fetch.py --all --validate`) and
+writes feed_health.json / active_sources.json. --from starts at a later
+stage, reading its input from the artifact the stage before it writes
+(data/raw/*.json, data/normalized.json, data/ranked.json,
+data/summarized.json). --until stops after a stage; --skip leaves one out
+(e.g. --skip deliver for a run that shouldn't post to Telegram). --dump also
+writes every stage's artifact to that usual path, for debugging or for a
+later --from. publish always writes data/rdradar.json.
+
+The HTTP, redirect, score and summary caches and the environment variables
+(RANK_COMBINED, RANK_TOKEN_BUDGET, SUMMARIZE_CONCURRENCY, ...) work as they
+do for the stage scripts, and each stage writes its run_metrics.json section
+when it finishes. The story store (STORY_STORE) is not used: it exists to
+hand stories between processes.
+"""
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+from pipeline.artifacts import RANKED, STORIES, SUMMARIZED, read_artifact, read_records, write_artifact
+from pipeline.common import get_async_client, get_client
+from pipeline.deliver import deliver_digest
+from pipeline.fetch import fetch_sources, load_sources, save_stories
+from pipeline.metrics import timed_stage
+from pipeline.normalize import filter_older_than_days, load_raw_records, normalize_stories
+from pipeline.publish import build_rdradar, save_rdradar
+from pipeline.rank import RANK_TOKEN_BUDGET, _load_source_weights, load_score_cache, rank_stories, save_score_cache
+from pipeline.summarize import CACHE_MAX_DAYS, SUMMARIZE_CATEGORY_LEADS, SUMMARIZE_CONCURRENCY, summarize_ranked
+from pipeline.summary_cache import SummaryCache
+from pipeline.validate_feeds import write_health_report
+from scrapers.canonical import load_redirect_cache, save_redirect_cache
+from scrapers.http_cache import load_http_cache, save_http_cache
+
+STAGES = ["fetch", "normalize", "rank", "summarize", "deliver", "publish"]
+
+
+def _fetch(state: dict, args: argparse.Namespace) -> None:
+    sources = load_sources()
+    if args.active_sources:
+        active = set(json.loads(Path(args.active_sources).read_text()))
+        sources = [s for s in sources if s["name"] in active]
+    cache = None if args.no_http_cache else load_http_cache()
+    redirect_cache = None if args.no_resolve else load_redirect_cache()
+
+    print(f"Fetching {len(sources)} sources concurrently ...")
+    results, health = fetch_sources(sources, cache, redirect_cache, not args.no_resolve)
+    if cache is not None:
+        save_http_cache(cache)
+    if redirect_cache is not None:
+        save_redirect_cache(redirect_cache)
+    if args.dump:
+        for name, stories in results.items():
+            save_stories(stories, f"data/raw/{name}.json")
+
+    state["raw"] = [story for stories in results.values() for story in stories]
+    print(f"  Got {len(state['raw'])} stories from {len(results)} sources")
+    if not write_health_report(health):
+        print("ERROR: No active sources found.", file=sys.stderr)
+        sys.exit(1)
+
+
+def _normalize(state: dict, args: argparse.Namespace) -> None:
+    raw = state.get("raw")
+    if raw is None:
+        raw = load_raw_records()
+    print(f"Normalizing {len(raw)} stories...")
+    state["normalized"] = normalize_stories(raw)
+    print(f"  {len(state['normalized'])} normalized stories")
+    if args.dump:
+        write_artifact("data/normalized.json", state["normalized"], STORIES)
+
+
+def _rank(state: dict, args: argparse.Namespace) -> None:
+    stories = state.get("normalized")
+    if stories is None:
+        # Unvalidated records, as rank.py reads them, with its 14-day cutoff
+        stories = filter_older_than_days(read_records("data/normalized.json"), days=14)
+    score_cache = load_score_cache()
+    state["ranked"] = rank_stories(
+        stories,
+        get_client(),
+        _load_source_weights(),
+        score_cache,
+        combined=os.environ.get("RANK_COMBINED", "") not in ("", "0"),
+        token_budget=int(os.environ.get("RANK_TOKEN_BUDGET", RANK_TOKEN_BUDGET)),
+    )
+    save_score_cache(score_cache)
+    if args.dump:
+        write_artifact("data/ranked.json", state["ranked"], RANKED)
+
+
+def _ranked(state: dict) -> dict:
+    if "ranked" not in state:
+        state["ranked"] = read_artifact("data/ranked.json", RANKED)
+    return state["ranked"]
+
+
+def _summarize(state: dict, args: argparse.Namespace) -> None:
+    ranked = _ranked(state)
+    with SummaryCache(max_days=CACHE_MAX_DAYS) as cache:
+        state["summarized"] = summarize_ranked(
+            ranked.get("personal_items", []),
+            ranked.get("enterprise_items", []),
+            get_async_client(),
+            cache,
+            int(os.environ.get("SUMMARIZE_CONCURRENCY", SUMMARIZE_CONCURRENCY)),
+            int(os.environ.get("SUMMARIZE_CATEGORY_LEADS", SUMMARIZE_CATEGORY_LEADS)),
+        )
+    if args.dump:
+        write_artifact("data/summarized.json", state["summarized"], SUMMARIZED)
+
+
+def _deliver(state: dict, args: argparse.Namespace) -> None:
+    bot_token = os.environ.get("TELEGRAM_BOT_TOKEN")
+    chat_id = os.environ.get("TELEGRAM_CHAT_ID")
+    if not bot_token or not chat_id:
+        raise ValueError("TELEGRAM_BOT_TOKEN and TELEGRAM_CHAT_ID are required")
+    summarized = state.get("summarized")
+    if summarized is None:
+        summarized = read_artifact("data/summarized.json", SUMMARIZED)
+    deliver_digest(
+        summarized["top3"], summarized["categories"], summarized.get("enterprise_items", []), bot_token, chat_id
+    )
+
+
+def _publish(state: dict, args: argparse.Namespace) -> None:
+    ranked = _ranked(state)
+    save_rdradar(build_rdradar(ranked.get("personal_items", []), ranked.get("enterprise_items", [])))
+
+
+STAGE_FUNCTIONS = {
+    "fetch": _fetch,
+    "normalize": _normalize,
+    "rank": _rank,
+    "summarize": _summarize,
+    "deliver": _deliver,
+    "publish": _publish,
+}
+
+
+def selected_stages(start: str, until: str, skip: list[str] | None = None) -> list[str]:
+    """Stages from start through until, in pipeline order, minus skip."""
+    first, last = STAGES.index(start), STAGES.index(until)
+    if first > last:
+        raise ValueError(f"--from {start} comes after --until {until}")
+    return [stage for stage in STAGES[first:last + 1] if stage not in (skip or [])]
+
+
+def run(stages: list[str], args: argparse.Namespace) -> dict:
+    """Run stages in order, each fed by the previous one's output. Returns the stage outputs."""
+    state: dict = {}
+    for stage in stages:
+        print(f"\n=== {stage} ===")
+        with timed_stage(stage):
+            STAGE_FUNCTIONS[stage](state, args)
+    return state
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m pipeline")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="Run the pipeline stages in one process")
+    run_parser.add_argument("--from", dest="start", choices=STAGES, default=STAGES[0])
+    run_parser.add_argument("--until", choices=STAGES, default=STAGES[-1])
+    run_parser.add_argument("--skip", choices=STAGES, action="append", default=[])
+    run_parser.add_argument("--dump", action="store_true", help="Also write each stage's artifact under data/")
+    run_parser.add_argument("--active-sources", help="JSON list of source names to restrict fetch to")
+    run_parser.add_argument("--no-http-cache", action="store_true", help="Skip ETag/Last-Modified revalidation")
+    run_parser.add_argument("--no-resolve", action="store_true", help="Don't follow shortener / feed-proxy links")
+    args = parser.parse_args(argv)
+
+    try:
+        stages = selected_stages(args.start, args.until, args.skip)
+    except ValueError as e:
+        parser.error(str(e))
+    run(stages, args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
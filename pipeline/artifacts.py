@@ -0,0 +1,64 @@
+"""
+Stage handoff files: data/raw/*.json, normalized.json, ranked.json and
+summarized.json.
+
+Each artifact shape has a pydantic TypeAdapter, so a whole file is
+validated (or serialized) in one call into pydantic-core instead of a
+Python loop of Story(**item) with published_at patched up by hand:
+
+    STORIES     list[Story]                         raw/*.json, normalized.json
+    RANKED      dict[str, list[Story]]              ranked.json
+    SUMMARIZED  {top3, categories, enterprise_items} summarized.json
+
+Files are indented JSON unless ARTIFACT_COMPACT is set. A path ending in
+.gz is written gzip-compressed; readers detect gzip from the content, so
+either form can be read from any path.
+"""
+import gzip
+import json
+import os
+from pathlib import Path
+from typing import Any, NotRequired, TypedDict
+from pydantic import TypeAdapter
+from schemas.record import StoryRecord
+from schemas.story import Story
+
+ARTIFACT_INDENT = 2
+_GZIP_MAGIC = b"\x1f\x8b"
+
+
+class SummarizedArtifact(TypedDict):
+    top3: list[Story]
+    categories: dict[str, list[Story]]
+    enterprise_items: NotRequired[list[Story]]
+
+
+STORIES = TypeAdapter(list[Story])
+RANKED = TypeAdapter(dict[str, list[Story]])
+SUMMARIZED = TypeAdapter(SummarizedArtifact)
+
+
+def _read_bytes(path: str | Path) -> bytes:
+    data = Path(path).read_bytes()
+    return gzip.decompress(data) if data[:2] == _GZIP_MAGIC else data
+
+
+def write_artifact(path: str | Path, data: Any, adapter: TypeAdapter = STORIES) -> None:
+    """Serialize data (shaped as adapter's type) to path, gzip'd if path ends in .gz."""
+    path = Path(path)
+    indent = None if os.environ.get("ARTIFACT_COMPACT", "") not in ("", "0") else ARTIFACT_INDENT
+    payload = adapter.dump_json(data, indent=indent)
+    if path.suffix == ".gz":
+        payload = gzip.compress(payload, mtime=0)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(payload)
+
+
+def read_artifact(path: str | Path, adapter: TypeAdapter = STORIES) -> Any:
+    """Validate the artifact at path as adapter's type in one call."""
+    return adapter.validate_json(_read_bytes(path))
+
+
+def read_records(path: str | Path) -> list[StoryRecord]:
+    """A list[Story] artifact as unvalidated StoryRecords (see schemas/record.py)."""
+    return [StoryRecord.from_dict(item) for item in json.loads(_read_bytes(path))]
@@ -0,0 +1,116 @@
+"""
+Helpers shared by the rank and summarize stages: the GitHub Models clients,
+the rate-limited completion call and the recency multiplier.
+
+Kept light so summarize doesn't import the whole rank stage: openai and
+httpx are only imported when a client is made, so a process that never calls
+the models API (tests, --from publish, a cached run) doesn't pay for them.
+
+The clients are built with the SDK's own retries off: a 429 is retried by
+create_completion(), through the model's rate limiter, so every attempt
+waits for a request slot and is recorded in the run metrics.
+"""
+import os
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING
+
+from pipeline.metrics import (
+    observe_llm_response,
+    observe_llm_response_async,
+    tracked_completion,
+    tracked_completion_async,
+)
+from pipeline.ratelimit import RateLimiter, limiter_for, observe_response, observe_response_async
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI, OpenAI
+
+MODELS_BASE_URL = "https://models.github.ai/inference"
+LLM_RETRIES = 2   # retries after a 429, on top of the first attempt
+
+
+def recency_multiplier(published_at: datetime, now: datetime | None = None) -> float:
+    """Return 1.0 for stories ≤7 days old, 0.5 for any older story.
+
+    Pass now to score a whole list against one timestamp.
+    """
+    pub = published_at if published_at.tzinfo else published_at.replace(tzinfo=timezone.utc)
+    age_days = ((now or datetime.now(tz=timezone.utc)) - pub).days
+    return 1.0 if age_days <= 7 else 0.5
+
+
+def _github_token() -> str:
+    token = os.environ.get("GITHUB_TOKEN")
+    if not token:
+        raise ValueError("GITHUB_TOKEN environment variable is required")
+    return token
+
+
+def get_client() -> "OpenAI":
+    import httpx
+    from openai import OpenAI
+
+    return OpenAI(
+        base_url=os.environ.get("MODELS_BASE_URL", MODELS_BASE_URL),
+        api_key=_github_token(),
+        max_retries=0,   # the rate limiter is the only retry layer (create_completion)
+        # Every response's rate-limit headers feed the shared per-model limiter,
+        # and its status the run metrics
+        http_client=httpx.Client(event_hooks={"response": [observe_response, observe_llm_response]}),
+    )
+
+
+def get_async_client() -> "AsyncOpenAI":
+    """get_client() for asyncio callers (concurrent summarization)."""
+    import httpx
+    from openai import AsyncOpenAI
+
+    return AsyncOpenAI(
+        base_url=os.environ.get("MODELS_BASE_URL", MODELS_BASE_URL),
+        api_key=_github_token(),
+        max_retries=0,
+        http_client=httpx.AsyncClient(
+            event_hooks={"response": [observe_response_async, observe_llm_response_async]}
+        ),
+    )
+
+
+def _backoff_after_429(limiter: RateLimiter, error, attempt: int, retries: int) -> None:
+    if not limiter.retry_after(error.response.headers):
+        limiter.pause(15 * (attempt + 1))   # no hint from the server: 15s, then 30s
+    print(f"  Rate limited — waiting {limiter.wait_time():.0f}s before retry {attempt + 1}/{retries}")
+
+
+def create_completion(client: "OpenAI", retries: int = LLM_RETRIES, **request):
+    """client.chat.completions.create(**request), paced and retried by the rate limiter.
+
+    Waits for a slot from the request model's limiter before each attempt and
+    records every attempt in the run metrics. A 429 is retried up to `retries`
+    times after the server's Retry-After; anything else, or the last 429, raises.
+    """
+    from openai import RateLimitError   # the client is already built, so this costs nothing
+
+    limiter = limiter_for(request["model"])
+    for attempt in range(retries + 1):
+        waited = limiter.acquire()
+        try:
+            return tracked_completion(client.chat.completions.create, waited, attempt, **request)
+        except RateLimitError as e:
+            if attempt >= retries:
+                raise
+            _backoff_after_429(limiter, e, attempt, retries)
+
+
+async def create_completion_async(client: "AsyncOpenAI", retries: int = LLM_RETRIES, **request):
+    """create_completion() for AsyncOpenAI."""
+    from openai import RateLimitError
+
+    limiter = limiter_for(request["model"])
+    for attempt in range(retries + 1):
+        waited = await limiter.acquire_async()
+        try:
+            return await tracked_completion_async(client.chat.completions.create, waited, attempt, **request)
+        except RateLimitError as e:
+            if attempt >= retries:
+                raise
+            _backoff_after_429(limiter, e, attempt, retries)
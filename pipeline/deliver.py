@@ -4,13 +4,13 @@ Job 5: Format stories and deliver to Telegram.
 Format: Top 3 must-reads in full (HTML), then category digests.
 Uses Telegram HTML parse mode. No emoji except 🔗 on links.
 """
-import json
 import os
 import asyncio
 from datetime import datetime, timezone
-from pathlib import Path
-from telegram import Bot
 from schemas.story import Story
+from pipeline.artifacts import SUMMARIZED, read_artifact
+from pipeline.metrics import stage_metrics
+from pipeline.store import open_store
 
 CATEGORY_LABELS = {
     "enterprise_software_delivery": "ENTERPRISE SOFTWARE DELIVERY",
@@ -123,6 +123,8 @@ def split_message(text: str, max_length: int = MAX_TELEGRAM_LENGTH) -> list[str]
 
 
 async def send_to_telegram(text: str, bot_token: str, chat_id: str) -> None:
+    from telegram import Bot
+
     bot = Bot(token=bot_token)
     parts = split_message(text)
     for part in parts:
@@ -134,29 +136,14 @@ async def send_to_telegram(text: str, bot_token: str, chat_id: str) -> None:
         )
 
 
-def main():
-    bot_token = os.environ.get("TELEGRAM_BOT_TOKEN")
-    chat_id = os.environ.get("TELEGRAM_CHAT_ID")
-    if not bot_token or not chat_id:
-        raise ValueError("TELEGRAM_BOT_TOKEN and TELEGRAM_CHAT_ID are required")
-
-    data = json.loads(Path("data/summarized.json").read_text())
-
-    def load_stories(items):
-        result = []
-        for item in items:
-            if isinstance(item.get("published_at"), str):
-                item["published_at"] = datetime.fromisoformat(item["published_at"])
-            result.append(Story(**item))
-        return result
-
-    top3 = load_stories(data["top3"])
-    stories_by_category = {
-        cat: load_stories(items)
-        for cat, items in data["categories"].items()
-    }
-    enterprise_items = load_stories(data.get("enterprise_items", []))
-
+def deliver_digest(
+    top3: list[Story],
+    stories_by_category: dict[str, list[Story]],
+    enterprise_items: list[Story],
+    bot_token: str,
+    chat_id: str,
+) -> None:
+    """Format this week's digest and send it to Telegram."""
     week_of = datetime.now(tz=timezone.utc).strftime("%b %d, %Y")
     digest = format_digest(top3, stories_by_category, week_of=week_of, enterprise_items=enterprise_items)
 
@@ -165,5 +152,31 @@ def main():
     print("Delivered to Telegram.")
 
 
+@stage_metrics("deliver")
+def main():
+    bot_token = os.environ.get("TELEGRAM_BOT_TOKEN")
+    chat_id = os.environ.get("TELEGRAM_CHAT_ID")
+    if not bot_token or not chat_id:
+        raise ValueError("TELEGRAM_BOT_TOKEN and TELEGRAM_CHAT_ID are required")
+
+    store = open_store()
+    if store:
+        with store:
+            top3 = store.read_stage("summarized", "top3")
+            stories_by_category = {
+                name.removeprefix("categories/"): store.read_stage("summarized", name)
+                for name in store.stage_lists("summarized")
+                if name.startswith("categories/")
+            }
+            enterprise_items = store.read_stage("summarized", "enterprise_items")
+    else:
+        data = read_artifact("data/summarized.json", SUMMARIZED)
+        top3 = data["top3"]
+        stories_by_category = data["categories"]
+        enterprise_items = data.get("enterprise_items", [])
+
+    deliver_digest(top3, stories_by_category, enterprise_items, bot_token, chat_id)
+
+
 if __name__ == "__main__":
     main()
@@ -1,78 +1,436 @@
 """
-Job 1: Fetch stories from a single source.
-Called once per source in the GitHub Actions matrix.
+Job 1: Fetch stories from one source, or from every source in a single process.
 
-Usage: python pipeline/fetch.py --source <source_name>
-Output: data/raw/<source_name>.json
+Usage:
+  python pipeline/fetch.py --source <source_name>
+  python pipeline/fetch.py --all [--active-sources active_sources.json]
+  python pipeline/fetch.py --all --validate
+Output: data/raw/<source_name>.json (one file per source)
+        --validate also writes feed_health.json / active_sources.json
+
+--source fetches one source the same way --all fetches each, so its download
+and parse times land in run_metrics.json too.
+
+--all drives every source on one asyncio event loop over a shared
+httpx.AsyncClient, capped at MAX_CONCURRENCY requests overall and
+MAX_PER_HOST requests per host (several sources share github.blog,
+reddit.com, deepmind.google, ...).
+
+Feeds and listing pages are revalidated with ETag / Last-Modified against
+data/http_cache.json; a 304 reuses the stories parsed on the previous run.
+
+Every download has a wall-clock deadline (FETCH_DEADLINE seconds for
+connect, headers and body together, so a host dripping bytes can't reset
+the read timeout forever), and the whole fetch has a budget (FETCH_BUDGET);
+sources unfinished when it runs out are marked skipped.
+
+--validate replaces the separate validate_feeds.py pass: each source's
+health (HTTP status, entry count, latency) is taken from the fetch itself,
+so every feed is downloaded and parsed once per run.
+
+Story links are canonicalized before saving (scrapers/canonical.py):
+tracking params, AMP and host variants collapse to one URL, and shortener /
+feed-proxy links are resolved concurrently (cached in
+data/redirect_cache.json; --no-resolve skips the network step).
 """
 import argparse
+import asyncio
 import json
 import sys
+import time
 import yaml
 from pathlib import Path
+from urllib.parse import urlparse
+import feedparser
+import httpx
 from schemas.story import Story
-from scrapers.rss import fetch_rss
-from scrapers.html import fetch_html
-from scrapers.api import fetch_hackernews, fetch_reddit
+from scrapers.rss import fetch_rss, parse_feed
+from scrapers.html import fetch_html, parse_html
+from scrapers.html import HEADERS as HTML_HEADERS
+from scrapers.api import fetch_hackernews, fetch_reddit, parse_hackernews, parse_reddit
+from scrapers.api import HEADERS as API_HEADERS
+from pipeline.artifacts import write_artifact
+from pipeline.metrics import current_metrics, stage_metrics
+from pipeline.validate_feeds import feed_verdict, write_health_report
+from scrapers.canonical import (
+    canonicalize_story,
+    load_redirect_cache,
+    resolve_redirects,
+    save_redirect_cache,
+)
+from scrapers.http_cache import (
+    cached_stories,
+    conditional_headers,
+    is_not_modified,
+    load_http_cache,
+    remember,
+    save_http_cache,
+)
 
+MAX_CONCURRENCY = 16
+MAX_PER_HOST = 4
+FETCH_TIMEOUT = 20     # per httpx phase (connect, each read, ...)
+FETCH_DEADLINE = 30    # per source download, all phases together
+FETCH_BUDGET = 180     # whole fetch
 
-def load_source_config(name: str, config_path: str = "sources/sources.yaml") -> dict:
+
+def load_sources(config_path: str = "sources/sources.yaml") -> list[dict]:
     with open(config_path) as f:
-        sources = yaml.safe_load(f)["sources"]
-    for s in sources:
+        return yaml.safe_load(f)["sources"]
+
+
+def load_source_config(name: str, config_path: str = "sources/sources.yaml") -> dict:
+    for s in load_sources(config_path):
         if s["name"] == name:
             return s
     raise ValueError(f"Source '{name}' not found in {config_path}")
 
 
-def fetch_source(source: dict) -> list[Story]:
+def _base_url(url: str) -> str:
+    parsed = urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc}"
+
+
+def fetch_source(source: dict, cache: dict | None = None) -> list[Story]:
     stype = source["type"]
     url = source["url"]
     name = source["display_name"]
     keywords = source.get("filter_keywords")
 
     if stype == "rss":
-        return fetch_rss(source_name=name, url=url, filter_keywords=keywords, max_age_days=7)
+        return fetch_rss(source_name=name, url=url, filter_keywords=keywords, max_age_days=7, cache=cache)
 
     elif stype == "scrape":
-        from urllib.parse import urlparse
-        parsed = urlparse(url)
-        base = f"{parsed.scheme}://{parsed.netloc}"
         selectors = source.get("selectors")
-        return fetch_html(source_name=name, url=url, base_url=base, filter_keywords=keywords, selectors=selectors)
+        return fetch_html(
+            source_name=name,
+            url=url,
+            base_url=_base_url(url),
+            filter_keywords=keywords,
+            selectors=selectors,
+            cache=cache,
+        )
 
     elif stype == "api":
         params = source.get("params", {})
         return fetch_hackernews(url=url, params=params)
 
     elif stype == "reddit":
-        return fetch_reddit(source_name=name, url=url, max_age_days=7)
+        return fetch_reddit(source_name=name, url=url, max_age_days=7, cache=cache)
 
     else:
         print(f"Unknown source type: {stype}", file=sys.stderr)
         return []
 
 
+def _parse_with_verdict(source: dict, response: httpx.Response) -> tuple[list[Story], bool, str]:
+    """Parse a downloaded response into stories plus a validate_feeds-style verdict."""
+    stype = source["type"]
+    name = source["display_name"]
+    keywords = source.get("filter_keywords")
+
+    if stype == "rss":
+        stats: dict = {}
+        stories = parse_feed(response.content, name, keywords, max_age_days=7, stats=stats)
+        return (stories, *stream_verdict(stats))
+    elif stype == "reddit":
+        feed = feedparser.parse(response.content)
+        ok, detail = feed_verdict(feed)
+        return parse_reddit(feed, name, max_age_days=7), ok, detail
+    elif stype == "scrape":
+        base = _base_url(source["url"])
+        stories = parse_html(
+            name, response.content, base, keywords, source.get("selectors"),
+            encoding=response.charset_encoding,
+        )
+        return stories, True, f"HTTP {response.status_code}"
+    elif stype == "api":
+        return parse_hackernews(response.json()), True, f"HTTP {response.status_code}"
+    return [], False, f"unknown type: {stype}"
+
+
+def stream_verdict(stats: dict) -> tuple[bool, str]:
+    """feed_verdict() for a feed read by parse_feed()."""
+    if stats.get("parse_error"):
+        return False, "parse error"
+    if not stats.get("entries"):
+        return False, "no entries"
+    if stats.get("stopped_early"):
+        return True, f"{stats['entries']}+ entries (stopped at cutoff)"
+    return True, f"{stats['entries']} entries"
+
+
+def parse_source_response(source: dict, response: httpx.Response) -> list[Story]:
+    """Turn a downloaded response into stories, mirroring fetch_source()."""
+    return _parse_with_verdict(source, response)[0]
+
+
+class HostLimiter:
+    """Concurrency cap applied both overall and per host."""
+
+    def __init__(self, max_concurrency: int = MAX_CONCURRENCY, max_per_host: int = MAX_PER_HOST):
+        self._overall = asyncio.Semaphore(max_concurrency)
+        self._max_per_host = max_per_host
+        self._hosts: dict[str, asyncio.Semaphore] = {}
+
+    def for_host(self, url: str) -> asyncio.Semaphore:
+        host = urlparse(url).netloc.lower()
+        if host not in self._hosts:
+            self._hosts[host] = asyncio.Semaphore(self._max_per_host)
+        return self._hosts[host]
+
+    @property
+    def overall(self) -> asyncio.Semaphore:
+        return self._overall
+
+
+async def fetch_source_async(
+    source: dict,
+    client: httpx.AsyncClient,
+    limiter: HostLimiter,
+    cache: dict | None = None,
+    deadline: float = FETCH_DEADLINE,
+) -> tuple[list[Story], dict]:
+    """Fetch one source over a shared client. Never raises — failures yield [].
+
+    The download is abandoned once `deadline` seconds have passed since it
+    got its concurrency slot.
+
+    Returns the stories and a feed_health.json-style record for the source.
+    """
+    stype = source["type"]
+    if stype not in ("rss", "scrape", "api", "reddit"):
+        print(f"Unknown source type: {stype}", file=sys.stderr)
+        return [], {**source, "status": "skipped", "detail": f"unknown type: {stype}"}
+
+    url = source["url"]
+    headers = HTML_HEADERS if stype == "scrape" else API_HEADERS
+    params = source.get("params") if stype == "api" else None
+    # The HN search API has no validators; feeds and listing pages do
+    if stype == "api":
+        cache = None
+
+    stories: list[Story] = []
+    status_code = None
+    size = None
+    downloaded = None
+    start = time.monotonic()
+    try:
+        async with limiter.for_host(url), limiter.overall:
+            start = time.monotonic()
+            response = await asyncio.wait_for(
+                client.get(url, params=params, headers={**headers, **conditional_headers(cache, url)}),
+                deadline,
+            )
+        downloaded = time.monotonic()
+        status_code = response.status_code
+        size = len(response.content)
+        if is_not_modified(cache, url, response):
+            stories = cached_stories(cache, url, None if stype == "scrape" else 7)
+            ok, detail = True, f"not modified ({len(stories)} cached stories)"
+        elif not response.is_success:
+            ok, detail = False, f"HTTP {response.status_code}"
+        else:
+            stories, ok, detail = _parse_with_verdict(source, response)
+            remember(cache, url, response, stories)
+    except TimeoutError:
+        print(f"  Warning: fetch failed for {source['name']}: deadline {deadline:g}s exceeded")
+        ok, detail = False, f"deadline {deadline:g}s exceeded"
+    except Exception as e:
+        print(f"  Warning: fetch failed for {source['name']}: {str(e)[:80]}")
+        ok, detail = False, str(e)[:80]
+
+    health = {
+        **source,
+        "status": "active" if ok else "skipped",
+        "detail": detail,
+        "http_status": status_code,
+        "latency_ms": round((time.monotonic() - start) * 1000),
+    }
+    # Download and parse time separately — a timeout counts entirely as download
+    finished = time.monotonic()
+    current_metrics().record_fetch(
+        source["name"], url, status_code, round(((downloaded or finished) - start) * 1000), size, detail,
+        parse_ms=round((finished - downloaded) * 1000) if downloaded else None,
+    )
+    return stories, health
+
+
+async def fetch_all_with_health(
+    sources: list[dict],
+    max_concurrency: int = MAX_CONCURRENCY,
+    max_per_host: int = MAX_PER_HOST,
+    timeout: float = FETCH_TIMEOUT,
+    cache: dict | None = None,
+    source_deadline: float = FETCH_DEADLINE,
+    overall_budget: float = FETCH_BUDGET,
+) -> tuple[dict[str, list[Story]], list[dict]]:
+    """Fetch every source concurrently.
+
+    Returns source name → stories, plus one health record per source (in
+    source order) in the feed_health.json format. Sources still running
+    after overall_budget seconds are cancelled and marked skipped.
+    """
+    limiter = HostLimiter(max_concurrency, max_per_host)
+    start = time.monotonic()
+    async with httpx.AsyncClient(timeout=timeout, follow_redirects=True) as client:
+        tasks = [
+            asyncio.create_task(fetch_source_async(s, client, limiter, cache, source_deadline))
+            for s in sources
+        ]
+        _, pending = await asyncio.wait(tasks, timeout=overall_budget)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    results = []
+    for source, task in zip(sources, tasks):
+        if task in pending:
+            detail = f"fetch budget ({overall_budget:g}s) exceeded"
+            print(f"  Warning: fetch failed for {source['name']}: {detail}")
+            latency_ms = round((time.monotonic() - start) * 1000)
+            current_metrics().record_fetch(source["name"], source["url"], None, latency_ms, detail=detail)
+            results.append(([], {
+                **source, "status": "skipped", "detail": detail, "http_status": None, "latency_ms": latency_ms,
+            }))
+        else:
+            results.append(task.result())
+    stories = {s["name"]: source_stories for s, (source_stories, _) in zip(sources, results)}
+    return stories, [health for _, health in results]
+
+
+async def fetch_all(
+    sources: list[dict],
+    max_concurrency: int = MAX_CONCURRENCY,
+    max_per_host: int = MAX_PER_HOST,
+    timeout: float = FETCH_TIMEOUT,
+    cache: dict | None = None,
+) -> dict[str, list[Story]]:
+    """Fetch every source concurrently. Returns source name → stories."""
+    stories, _ = await fetch_all_with_health(sources, max_concurrency, max_per_host, timeout, cache)
+    return stories
+
+
+def canonicalize_results(
+    results: dict[str, list[Story]],
+    redirect_cache: dict | None = None,
+    resolve: bool = True,
+) -> dict[str, list[Story]]:
+    """Rewrite every story's URL to its canonical form, resolving shortener links first."""
+    resolved: dict[str, str] = {}
+    if resolve:
+        urls = [s.canonical_url for stories in results.values() for s in stories]
+        resolved = asyncio.run(resolve_redirects(urls, redirect_cache))
+    return {
+        name: [canonicalize_story(s, resolved) for s in stories]
+        for name, stories in results.items()
+    }
+
+
+def fetch_sources(
+    sources: list[dict],
+    cache: dict | None = None,
+    redirect_cache: dict | None = None,
+    resolve: bool = True,
+    max_concurrency: int = MAX_CONCURRENCY,
+    max_per_host: int = MAX_PER_HOST,
+    timeout: float = FETCH_TIMEOUT,
+    source_deadline: float = FETCH_DEADLINE,
+    overall_budget: float = FETCH_BUDGET,
+) -> tuple[dict[str, list[Story]], list[dict]]:
+    """What --all does before saving: fetch every source, then canonicalize the links.
+
+    Returns source name → stories and the feed_health.json records.
+    """
+    results, health = asyncio.run(fetch_all_with_health(
+        sources,
+        max_concurrency=max_concurrency,
+        max_per_host=max_per_host,
+        timeout=timeout,
+        cache=cache,
+        source_deadline=source_deadline,
+        overall_budget=overall_budget,
+    ))
+    return canonicalize_results(results, redirect_cache, resolve), health
+
+
 def save_stories(stories: list[Story], output_path: str) -> None:
-    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
-    data = [s.model_dump(mode="json") for s in stories]
-    Path(output_path).write_text(json.dumps(data, indent=2, default=str))
+    write_artifact(output_path, stories)
 
 
+@stage_metrics("fetch")
 def main():
     parser = argparse.ArgumentParser()
-    parser.add_argument("--source", required=True, help="Source name from sources.yaml")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--source", help="Source name from sources.yaml")
+    target.add_argument("--all", action="store_true", help="Fetch every source concurrently")
+    parser.add_argument("--active-sources", help="JSON list of source names to restrict --all to")
     parser.add_argument("--output-dir", default="data/raw")
+    parser.add_argument("--max-concurrency", type=int, default=MAX_CONCURRENCY)
+    parser.add_argument("--max-per-host", type=int, default=MAX_PER_HOST)
+    parser.add_argument("--timeout", type=float, default=FETCH_TIMEOUT, help="Per-request timeout in seconds")
+    parser.add_argument("--deadline", type=float, default=FETCH_DEADLINE, help="Per-source download deadline in seconds")
+    parser.add_argument("--budget", type=float, default=FETCH_BUDGET, help="Overall fetch budget in seconds")
+    parser.add_argument("--no-http-cache", action="store_true", help="Skip ETag/Last-Modified revalidation")
+    parser.add_argument("--no-resolve", action="store_true", help="Don't follow shortener / feed-proxy links")
+    parser.add_argument(
+        "--validate",
+        action="store_true",
+        help="With --all: write feed_health.json / active_sources.json from the fetch results",
+    )
     args = parser.parse_args()
+    if args.validate and not args.all:
+        parser.error("--validate requires --all")
+
+    cache = None if args.no_http_cache else load_http_cache()
+    redirect_cache = None if args.no_resolve else load_redirect_cache()
+
+    if args.source:
+        source = load_source_config(args.source)
+        print(f"Fetching: {source['display_name']} ({source['type']}) ...")
+        results, health = fetch_sources(
+            [source], cache, redirect_cache, not args.no_resolve,
+            timeout=args.timeout, source_deadline=args.deadline, overall_budget=args.budget,
+        )
+        stories = results[args.source]
+        print(f"  Got {len(stories)} stories ({health[0]['detail']})")
+
+        output_path = f"{args.output_dir}/{args.source}.json"
+        save_stories(stories, output_path)
+        print(f"  Saved to {output_path}")
+        if cache is not None:
+            save_http_cache(cache)
+        if redirect_cache is not None:
+            save_redirect_cache(redirect_cache)
+        return
+
+    sources = load_sources()
+    if args.active_sources:
+        active = set(json.loads(Path(args.active_sources).read_text()))
+        sources = [s for s in sources if s["name"] in active]
 
-    source = load_source_config(args.source)
-    print(f"Fetching: {source['display_name']} ({source['type']}) ...")
-    stories = fetch_source(source)
-    print(f"  Got {len(stories)} stories")
+    print(f"Fetching {len(sources)} sources concurrently ...")
+    results, health = fetch_sources(
+        sources, cache, redirect_cache, not args.no_resolve,
+        args.max_concurrency, args.max_per_host, args.timeout, args.deadline, args.budget,
+    )
+    for record in health:
+        name = record["name"]
+        save_stories(results[name], f"{args.output_dir}/{name}.json")
+        ok = record["status"] == "active"
+        print(f"  {'[OK]' if ok else '[SKIP]'} {name:<35} {len(results[name]):>3} stories  {record['detail']}")
+    total = sum(len(v) for v in results.values())
+    print(f"  Saved {total} stories from {len(results)} sources to {args.output_dir}/")
+    if cache is not None:
+        save_http_cache(cache)
+    if redirect_cache is not None:
+        save_redirect_cache(redirect_cache)
 
-    output_path = f"{args.output_dir}/{args.source}.json"
-    save_stories(stories, output_path)
-    print(f"  Saved to {output_path}")
+    if args.validate:
+        active = write_health_report(health)
+        if not active:
+            print("ERROR: No active sources found.", file=sys.stderr)
+            sys.exit(1)
 
 
 if __name__ == "__main__":
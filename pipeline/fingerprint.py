@@ -0,0 +1,57 @@
+"""
+SimHash content fingerprints for near-duplicate detection.
+
+A story's fingerprint is a 64-bit SimHash over word 3-gram shingles of its
+title and content. Texts that share most of their shingles differ in only a
+few bits, so the Hamming distance between two fingerprints measures how much
+the text changed: syndicated copies of one announcement land within a few
+bits of each other, while a rewritten article drifts much further.
+
+Shingles are hashed with blake2b rather than hash(), which is salted per
+process — fingerprints have to be stable across runs to be cached.
+"""
+import hashlib
+import re
+
+FINGERPRINT_BITS = 64
+SHINGLE_SIZE = 3
+
+_WORD = re.compile(r"\w+")
+
+
+def shingles(text: str, k: int = SHINGLE_SIZE) -> list[str]:
+    """Lowercased word k-grams; the whole text as one shingle if it has fewer than k words."""
+    words = _WORD.findall(text.lower())
+    if len(words) < k:
+        return [" ".join(words)] if words else []
+    return [" ".join(words[i:i + k]) for i in range(len(words) - k + 1)]
+
+
+def _shingle_hash(shingle: str) -> int:
+    return int.from_bytes(hashlib.blake2b(shingle.encode(), digest_size=8).digest(), "big")
+
+
+def simhash(text: str) -> int:
+    """64-bit SimHash of text's shingles. Empty text hashes to 0."""
+    counts = [0] * FINGERPRINT_BITS
+    for shingle in shingles(text):
+        h = _shingle_hash(shingle)
+        for bit in range(FINGERPRINT_BITS):
+            counts[bit] += 1 if h >> bit & 1 else -1
+    return sum(1 << bit for bit, count in enumerate(counts) if count > 0)
+
+
+def hamming(a: int, b: int) -> int:
+    """Number of differing bits between two fingerprints."""
+    return (a ^ b).bit_count()
+
+
+def story_fingerprint(title: str, content: str) -> str:
+    """Fingerprint of a story's title plus content, as 16 hex digits (JSON-friendly)."""
+    text = f"{title}\n{content}"
+    return f"{simhash(text):016x}"
+
+
+def fingerprint_distance(a: str, b: str) -> int:
+    """Hamming distance between two hex fingerprints from story_fingerprint()."""
+    return hamming(int(a, 16), int(b, 16))
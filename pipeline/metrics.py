@@ -0,0 +1,244 @@
+"""
+Run metrics: per-stage wall time, per-source fetch results and per-call LLM
+latency, rate-limiter wait, retries and token usage, written to
+run_metrics.json next to feed_health.json.
+
+Each stage runs in its own process (one workflow job per stage), so a stage
+records into the module-level RunMetrics while it runs and, on exit, merges
+its section into run_metrics.json under its own name — the file carried
+from job to job ends up with every stage (`python -m pipeline run` writes
+the same sections from one process):
+
+    {"stages": {
+        "fetch": {"wall_seconds": 41.2, "status": "ok",
+                  "http": [{"source", "url", "status", "latency_ms", "parse_ms",
+                            "bytes", "detail"}, ...]},
+        "rank":  {"wall_seconds": 95.0, "status": "ok",
+                  "llm": {"calls": [{"model", "status", "latency_ms", "waited_ms",
+                                     "attempt", "prompt_tokens", "completion_tokens"}, ...],
+                          "models": {"openai/gpt-4o-mini": {"calls", "prompt_tokens",
+                                     "completion_tokens", "rate_limited", "http_statuses"}}}},
+        ...}}
+
+LLM calls are recorded twice over: tracked_completion() wraps each
+chat.completions.create() call the pipeline makes (latency, the limiter
+wait before it, which retry it was, usage), and observe_llm_response() —
+an httpx response hook on the OpenAI client — counts every HTTP response
+by status, including any the call site never saw.
+"""
+import json
+import time
+from collections import Counter
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from functools import wraps
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import httpx
+
+RUN_METRICS_PATH = Path("run_metrics.json")
+
+
+def _tokens(usage: Any, field: str) -> int | None:
+    value = getattr(usage, field, None)
+    return value if isinstance(value, int) else None
+
+
+def _request_model(request: "httpx.Request") -> str | None:
+    try:
+        return json.loads(request.content).get("model")
+    except Exception:
+        return None
+
+
+class RunMetrics:
+    """What one stage measured. Not thread-safe; the pipeline records from one event loop."""
+
+    def __init__(self):
+        self.http: list[dict] = []
+        self.llm_calls: list[dict] = []
+        self.llm_statuses: dict[str, Counter] = {}
+
+    def record_fetch(
+        self,
+        source: str,
+        url: str,
+        status: int | None,
+        latency_ms: int,
+        size: int | None = None,
+        detail: str | None = None,
+        parse_ms: int | None = None,
+    ) -> None:
+        """One source's download: latency_ms until the response arrived, parse_ms after it."""
+        self.http.append({
+            "source": source,
+            "url": url,
+            "status": status,
+            "latency_ms": latency_ms,
+            "parse_ms": parse_ms,
+            "bytes": size,
+            "detail": detail,
+        })
+
+    def record_llm_call(
+        self,
+        model: str,
+        status: int | str,
+        latency: float,
+        waited: float = 0.0,
+        attempt: int = 0,
+        usage: Any = None,
+    ) -> None:
+        self.llm_calls.append({
+            "model": model,
+            "status": status,
+            "latency_ms": round(latency * 1000),
+            "waited_ms": round(waited * 1000),
+            "attempt": attempt,
+            "prompt_tokens": _tokens(usage, "prompt_tokens"),
+            "completion_tokens": _tokens(usage, "completion_tokens"),
+        })
+
+    def record_llm_status(self, model: str, status: int) -> None:
+        self.llm_statuses.setdefault(model, Counter())[status] += 1
+
+    def llm_summary(self) -> dict[str, dict]:
+        """Per model: calls, token totals, 429 count and HTTP responses by status."""
+        models: dict[str, dict] = {}
+        for model in [c["model"] for c in self.llm_calls] + list(self.llm_statuses):
+            models.setdefault(model, {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "rate_limited": 0})
+        for call in self.llm_calls:
+            totals = models[call["model"]]
+            totals["calls"] += 1
+            totals["prompt_tokens"] += call["prompt_tokens"] or 0
+            totals["completion_tokens"] += call["completion_tokens"] or 0
+            totals["rate_limited"] += call["status"] == 429
+        for model, statuses in self.llm_statuses.items():
+            # The hook also sees responses no call site did (e.g. retries inside the client)
+            models[model]["rate_limited"] = max(models[model]["rate_limited"], statuses[429])
+            models[model]["http_statuses"] = {str(code): n for code, n in sorted(statuses.items())}
+        return models
+
+    def section(self, wall_seconds: float, status: str) -> dict:
+        """This stage's entry in run_metrics.json."""
+        section: dict = {
+            "finished_at": datetime.now(tz=timezone.utc).isoformat(timespec="seconds"),
+            "wall_seconds": round(wall_seconds, 3),
+            "status": status,
+        }
+        if self.http:
+            section["http"] = self.http
+        if self.llm_calls or self.llm_statuses:
+            section["llm"] = {"calls": self.llm_calls, "models": self.llm_summary()}
+        return section
+
+
+_metrics = RunMetrics()
+
+
+def current_metrics() -> RunMetrics:
+    """The running stage's metrics."""
+    return _metrics
+
+
+def reset_metrics() -> None:
+    """Start recording afresh (a new stage in the same process, or a test)."""
+    global _metrics
+    _metrics = RunMetrics()
+
+
+def write_run_metrics(stage: str, section: dict, path: Path = RUN_METRICS_PATH) -> None:
+    """Merge one stage's section into run_metrics.json, keeping the other stages'."""
+    try:
+        data = json.loads(path.read_text()) if path.exists() else {}
+    except (OSError, ValueError) as e:
+        print(f"  Warning: could not read {path}, starting it afresh: {e}")
+        data = {}
+    data.setdefault("stages", {})[stage] = section
+    try:
+        path.write_text(json.dumps(data, indent=2))
+    except OSError as e:
+        print(f"  Warning: could not write {path}: {e}")
+
+
+@contextmanager
+def timed_stage(stage: str) -> Iterator[RunMetrics]:
+    """Record one stage from scratch and write its run_metrics.json section on exit.
+
+    The section is written even when the stage raises or calls sys.exit(),
+    with status "error" (or the exit code).
+    """
+    reset_metrics()
+    start = time.monotonic()
+    status = "error"
+    try:
+        yield _metrics
+        status = "ok"
+    except SystemExit as e:
+        status = "ok" if e.code in (None, 0) else f"exit {e.code}"
+        raise
+    finally:
+        write_run_metrics(stage, _metrics.section(time.monotonic() - start, status))
+
+
+def stage_metrics(stage: str) -> Callable:
+    """Decorator for a stage's main(): run it inside timed_stage(stage)."""
+    def decorate(main: Callable) -> Callable:
+        @wraps(main)
+        def run(*args, **kwargs):
+            with timed_stage(stage):
+                return main(*args, **kwargs)
+        return run
+    return decorate
+
+
+def _error_status(error: Exception) -> int | str:
+    status = getattr(error, "status_code", None)
+    return status if isinstance(status, int) else type(error).__name__
+
+
+def tracked_completion(create: Callable, waited: float = 0.0, attempt: int = 0, **request) -> Any:
+    """create(**request), recording the call's latency, status and token usage.
+
+    waited is how long the rate limiter held the call back; attempt is the
+    caller's retry number (0 for the first try). Exceptions are re-raised.
+    """
+    start = time.monotonic()
+    try:
+        response = create(**request)
+    except Exception as e:
+        _metrics.record_llm_call(request.get("model", ""), _error_status(e), time.monotonic() - start, waited, attempt)
+        raise
+    _metrics.record_llm_call(
+        request.get("model", ""), 200, time.monotonic() - start, waited, attempt, getattr(response, "usage", None)
+    )
+    return response
+
+
+async def tracked_completion_async(create: Callable, waited: float = 0.0, attempt: int = 0, **request) -> Any:
+    """tracked_completion() for AsyncOpenAI's create()."""
+    start = time.monotonic()
+    try:
+        response = await create(**request)
+    except Exception as e:
+        _metrics.record_llm_call(request.get("model", ""), _error_status(e), time.monotonic() - start, waited, attempt)
+        raise
+    _metrics.record_llm_call(
+        request.get("model", ""), 200, time.monotonic() - start, waited, attempt, getattr(response, "usage", None)
+    )
+    return response
+
+
+def observe_llm_response(response: "httpx.Response") -> None:
+    """httpx response hook: count the models API's responses by status, per model."""
+    model = _request_model(response.request)
+    if model:
+        _metrics.record_llm_status(model, response.status_code)
+
+
+async def observe_llm_response_async(response: "httpx.Response") -> None:
+    """observe_llm_response() for httpx.AsyncClient, whose hooks must be coroutines."""
+    observe_llm_response(response)
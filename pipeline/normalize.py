@@ -2,37 +2,59 @@
 Job 2: Merge all raw JSON files, deduplicate stories.
 
 Dedup strategy:
-1. URL exact match — merge immediately, collect all source references
+1. URL match after canonicalization (scrapers/canonical.py) — merge immediately,
+   collect all source references
 2. Title similarity — Jaccard token overlap >= threshold groups same story
+   (candidates come from a prefix-filtered inverted token index, not a full scan)
+
+Raw stories are loaded as StoryRecords (schemas/record.py) and only the
+deduplicated survivors are validated into Story models.
 
 Output: data/normalized.json (list of deduplicated Story objects)
 """
-import json
+import math
+import re
+from collections import Counter
 from pathlib import Path
 from datetime import datetime, timezone, timedelta
+from schemas.record import StoryRecord, StoryT
 from schemas.story import Story
+from pipeline.artifacts import read_artifact, read_records, write_artifact
+from pipeline.metrics import stage_metrics
+from pipeline.store import open_store
+from scrapers.canonical import canonicalize_story, url_key
 
 
 def load_raw_stories(raw_dir: str = "data/raw") -> list[Story]:
     stories = []
     for path in Path(raw_dir).glob("*.json"):
         try:
-            items = json.loads(path.read_text())
-            for item in items:
-                # Restore datetime from string
-                if isinstance(item.get("published_at"), str):
-                    item["published_at"] = datetime.fromisoformat(item["published_at"])
-                stories.append(Story(**item))
+            stories.extend(read_artifact(path))
         except Exception as e:
             print(f"  Warning: could not load {path}: {e}")
     return stories
 
 
+def load_raw_records(raw_dir: str = "data/raw") -> list[StoryRecord]:
+    """Raw stories as unvalidated records — normalize() validates only the survivors."""
+    records = []
+    for path in Path(raw_dir).glob("*.json"):
+        try:
+            items = read_records(path)
+        except Exception as e:
+            print(f"  Warning: could not load {path}: {e}")
+            continue
+        records.extend(items)
+    return records
+
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_STOPWORDS = frozenset({"the", "a", "an", "is", "in", "on", "at", "to", "for", "of", "and", "or", "with"})
+
+
 def _title_tokens(title: str) -> set[str]:
-    import re
-    words = re.sub(r"[^\w\s]", "", title.lower()).split()
-    stopwords = {"the", "a", "an", "is", "in", "on", "at", "to", "for", "of", "and", "or", "with"}
-    return {w for w in words if w not in stopwords and len(w) > 2}
+    words = _PUNCTUATION.sub("", title.lower()).split()
+    return {w for w in words if w not in _STOPWORDS and len(w) > 2}
 
 
 def _jaccard(a: set, b: set) -> float:
@@ -41,46 +63,110 @@ def _jaccard(a: set, b: set) -> float:
     return len(a & b) / len(a | b)
 
 
-def deduplicate_by_url(stories: list[Story]) -> list[Story]:
-    seen: dict[str, Story] = {}
+def _merge_sources(canonical: StoryT, story: StoryT) -> None:
+    canonical_source_names = {s.name for s in canonical.sources}
+    for src in story.sources:
+        if src.name not in canonical_source_names:
+            canonical.sources.append(src)
+
+
+def deduplicate_by_url(stories: list[StoryT]) -> list[StoryT]:
+    seen: dict[str, StoryT] = {}
     for story in stories:
-        url = story.canonical_url
-        if url in seen:
-            existing = seen[url]
-            # Merge sources, avoid duplicates
-            existing_source_names = {s.name for s in existing.sources}
-            for src in story.sources:
-                if src.name not in existing_source_names:
-                    existing.sources.append(src)
+        # fetch.py already canonicalizes; this also covers raw files from older runs
+        story = canonicalize_story(story)
+        key = url_key(story.canonical_url)
+        kept = seen.get(key)
+        if kept is None:
+            seen[key] = story
+        elif story.canonical_url.startswith("https:") and not kept.canonical_url.startswith("https:"):
+            # Same page over http and https: keep the https link, with both sets of sources
+            _merge_sources(story, kept)
+            seen[key] = story
         else:
-            seen[url] = story
+            # Merge sources, avoid duplicates
+            _merge_sources(kept, story)
     return list(seen.values())
 
 
-def deduplicate_by_title_similarity(
-    stories: list[Story],
-    threshold: float = 0.6,
-) -> list[Story]:
-    groups: list[Story] = []
+def _deduplicate_pairwise(stories: list[StoryT], threshold: float) -> list[StoryT]:
+    """Reference O(n²) grouping: each story joins the first group it matches."""
+    groups: list[StoryT] = []
     for story in stories:
         tokens = _title_tokens(story.title)
-        merged = False
         for canonical in groups:
-            canonical_tokens = _title_tokens(canonical.title)
-            if _jaccard(tokens, canonical_tokens) >= threshold:
-                # Merge into canonical
-                canonical_source_names = {s.name for s in canonical.sources}
-                for src in story.sources:
-                    if src.name not in canonical_source_names:
-                        canonical.sources.append(src)
-                merged = True
+            if _jaccard(tokens, _title_tokens(canonical.title)) >= threshold:
+                _merge_sources(canonical, story)
                 break
-        if not merged:
+        else:
             groups.append(story)
     return groups
 
 
-def filter_older_than_days(stories: list[Story], days: int = 7) -> list[Story]:
+def _prefix_length(size: int, threshold: float) -> int:
+    """Tokens (in global rare-first order) that must be indexed/probed for a set of this size.
+
+    If J(x, y) >= t then |x ∩ y| >= ceil(t·|x|), so the first |x| - ceil(t·|x|) + 1
+    tokens of x and of y must share at least one token.
+    """
+    return size - math.ceil(threshold * size - 1e-9) + 1
+
+
+def deduplicate_by_title_similarity(
+    stories: list[StoryT],
+    threshold: float = 0.6,
+) -> list[StoryT]:
+    """Group stories whose title tokens have Jaccard similarity >= threshold.
+
+    Produces exactly the groups of the pairwise first-match algorithm, but only
+    scores groups found through a prefix-filtered inverted token index. Tokens
+    are ordered rarest-first across the whole batch, so common words ("openai",
+    "model") rarely enter a prefix and candidate lists stay short.
+    """
+    if threshold <= 0:
+        return _deduplicate_pairwise(stories, threshold)
+
+    token_sets = [_title_tokens(s.title) for s in stories]
+    doc_freq: Counter[str] = Counter(tok for tokens in token_sets for tok in tokens)
+    rank = {tok: i for i, tok in enumerate(sorted(doc_freq, key=lambda t: (doc_freq[t], t)))}
+
+    groups: list[StoryT] = []
+    group_tokens: list[set[str]] = []
+    index: dict[str, list[int]] = {}
+
+    for story, tokens in zip(stories, token_sets):
+        size = len(tokens)
+        prefix = sorted(tokens, key=rank.__getitem__)[:_prefix_length(size, threshold)]
+        # Size filter: Jaccard >= t is impossible unless t·|x| <= |y| <= |x|/t
+        min_size = threshold * size - 1e-9
+        max_size = size / threshold + 1e-9
+
+        match = None
+        candidates = {gid for tok in prefix for gid in index.get(tok, ())}
+        for gid in sorted(candidates):
+            other = group_tokens[gid]
+            other_size = len(other)
+            if not min_size <= other_size <= max_size:
+                continue
+            common = len(tokens & other)
+            if common / (size + other_size - common) >= threshold:
+                match = gid
+                break
+
+        if match is not None:
+            _merge_sources(groups[match], story)
+            continue
+
+        gid = len(groups)
+        groups.append(story)
+        group_tokens.append(tokens)
+        for tok in prefix:
+            index.setdefault(tok, []).append(gid)
+
+    return groups
+
+
+def filter_older_than_days(stories: list[StoryT], days: int = 7) -> list[StoryT]:
     cutoff = datetime.now(tz=timezone.utc) - timedelta(days=days)
     return [
         s for s in stories
@@ -89,9 +175,16 @@ def filter_older_than_days(stories: list[Story], days: int = 7) -> list[Story]:
 
 
 def normalize(raw_dir: str = "data/raw") -> list[Story]:
-    stories = load_raw_stories(raw_dir)
-    print(f"  Loaded {len(stories)} raw stories")
+    records = load_raw_records(raw_dir)
+    print(f"  Loaded {len(records)} raw stories")
+    return normalize_stories(records)
 
+
+def normalize_stories(stories: list[StoryT]) -> list[Story]:
+    """Age filter, URL and title dedup, then sort — on Stories or StoryRecords.
+
+    Merging sources mutates the surviving stories in place.
+    """
     stories = filter_older_than_days(stories, days=7)
     print(f"  After age filter: {len(stories)}")
 
@@ -103,18 +196,22 @@ def normalize(raw_dir: str = "data/raw") -> list[Story]:
 
     # Sort by source_count desc, then published_at desc
     stories.sort(key=lambda s: (s.source_count, s.published_at), reverse=True)
-    return stories
+    return [s.to_story() if isinstance(s, StoryRecord) else s for s in stories]
 
 
+@stage_metrics("normalize")
 def main():
     print("Normalizing stories...")
     stories = normalize()
-    output = [s.model_dump(mode="json") for s in stories]
-    Path("data/normalized.json").write_text(
-        json.dumps(output, indent=2, default=str)
-    )
+    write_artifact("data/normalized.json", stories)
     print(f"  Saved {len(stories)} normalized stories to data/normalized.json")
 
+    store = open_store()
+    if store:
+        with store:
+            store.write_stage("normalized", {"stories": stories})
+        print("  Recorded normalized stories in the story store")
+
 
 if __name__ == "__main__":
     main()
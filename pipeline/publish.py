@@ -10,6 +10,11 @@ from datetime import datetime, timezone
 from pathlib import Path
 
 from schemas.story import Story
+from pipeline.artifacts import RANKED, read_artifact
+from pipeline.metrics import stage_metrics
+from pipeline.store import open_store
+
+RDRADAR_PATH = Path("data/rdradar.json")
 
 # SDLC tags that map to a recommended action
 _ACTION_MAP = {
@@ -76,24 +81,25 @@ def build_rdradar(
     }
 
 
+def save_rdradar(payload: dict, path: Path = RDRADAR_PATH) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload, indent=2, default=str))
+    print(f"  Saved {len(payload['items'])} high-signal items to {path}")
+
+
+@stage_metrics("publish")
 def main() -> None:
-    ranked_raw = json.loads(Path("data/ranked.json").read_text())
-
-    def _load(items_raw: list[dict]) -> list[Story]:
-        stories = []
-        for item in items_raw:
-            if isinstance(item.get("published_at"), str):
-                item["published_at"] = datetime.fromisoformat(item["published_at"])
-            stories.append(Story(**item))
-        return stories
-
-    personal_items = _load(ranked_raw.get("personal_items", []))
-    enterprise_items = _load(ranked_raw.get("enterprise_items", []))
-
-    payload = build_rdradar(personal_items, enterprise_items)
-    Path("data").mkdir(exist_ok=True)
-    Path("data/rdradar.json").write_text(json.dumps(payload, indent=2, default=str))
-    print(f"  Saved {len(payload['items'])} high-signal items to data/rdradar.json")
+    store = open_store()
+    if store:
+        with store:
+            personal_items = store.read_stage("ranked", "personal_items")
+            enterprise_items = store.read_stage("ranked", "enterprise_items")
+    else:
+        ranked = read_artifact("data/ranked.json", RANKED)
+        personal_items = ranked.get("personal_items", [])
+        enterprise_items = ranked.get("enterprise_items", [])
+
+    save_rdradar(build_rdradar(personal_items, enterprise_items))
 
 
 if __name__ == "__main__":
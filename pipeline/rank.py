@@ -1,24 +1,41 @@
 """
 Job 3: Score stories by enterprise relevance using GitHub Models API.
 
-GitHub Models endpoint: https://models.github.ai/inference
+GitHub Models endpoint: https://models.github.ai/inference (MODELS_BASE_URL overrides
+it, e.g. to point at the offline stand-in in benchmarks/fake_models.py)
 Auth: GITHUB_TOKEN environment variable (uses your existing GitHub license)
 Model: openai/gpt-4o-mini (Low tier: 150 req/day, 15 req/min — sufficient for scoring)
 Summarize uses openai/gpt-4o (same tier as gpt-4o-mini — 150 req/day)
 
 Rate limit optimisation (Low tier: 15 req/min, 150 req/day):
 1. Heuristic pre-filter: cuts ~200 stories → 40 using source weight + source_count + keywords
-2. Batch ranking: 5 stories per LLM call → ~8 calls total (was 200+ previously)
-3. 5s delay between batches to stay within 15 req/min, with retry on 429
+2. Score cache: stories already scored under the same model + prompts (data/score_cache.json)
+   reuse their category, score and SDLC tags — only never-seen stories reach the LLM
+3. Batch ranking: stories are packed into each call up to a prompt token budget
+   (RANK_TOKEN_BUDGET, default 6000) → 2 calls for 40 stories (was 200+ previously)
+4. RANK_COMBINED=1 asks for scores and SDLC tags in one response, skipping the
+   separate classification pass
+5. Shared token-bucket rate limiter (pipeline/ratelimit.py) instead of a fixed 5s
+   delay between batches: calls go out as fast as 15 req/min allows, and the
+   limiter follows Retry-After / x-ratelimit-* headers on 429s
 """
+import hashlib
+import heapq
 import json
 import os
-import time
-import yaml
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
-from openai import OpenAI
+from typing import TYPE_CHECKING
+from schemas.record import StoryRecord, StoryT
 from schemas.story import Story
+from scrapers.keywords import keyword_matcher
+from pipeline.artifacts import RANKED, read_records, write_artifact
+from pipeline.common import MODELS_BASE_URL, create_completion, get_async_client, get_client, recency_multiplier  # noqa: F401
+from pipeline.metrics import stage_metrics
+from pipeline.store import open_store
+
+if TYPE_CHECKING:
+    from openai import OpenAI
 
 RANK_SYSTEM_PROMPT = """You are an AI news curator for enterprise technology leaders and developers.
 Score news stories by enterprise relevance. Be strict — only score high if there is
@@ -40,7 +57,7 @@ Content: {content}
 Return JSON only:
 {{"scores": {{"enterprise_software_delivery": 0, "enterprise_solutions": 0, "finance_utilities": 0, "general_significance": 0}}, "include": true}}"""
 
-# Batch prompt — scores up to 5 stories in a single LLM call
+# Batch prompt — scores a token-budgeted batch of stories in a single LLM call
 RANK_BATCH_PROMPT = """Score these {n} AI news stories across 4 categories (0-100 each):
 1. enterprise_software_delivery — AI in dev tools, coding agents, CI/CD, IDEs
 2. enterprise_solutions — AI in ERP, CRM, business process automation
@@ -51,6 +68,25 @@ RANK_BATCH_PROMPT = """Score these {n} AI news stories across 4 categories (0-10
 Return JSON only — one entry per story, 0-indexed:
 {{"stories": [{{"index": 0, "scores": {{"enterprise_software_delivery": 0, "enterprise_solutions": 0, "finance_utilities": 0, "general_significance": 0}}, "include": true}}]}}"""
 
+# Combined prompt — scores and SDLC tags in one call (RANK_COMBINED=1)
+RANK_COMBINED_PROMPT = """Score these {n} AI news stories across 4 categories (0-100 each):
+1. enterprise_software_delivery — AI in dev tools, coding agents, CI/CD, IDEs
+2. enterprise_solutions — AI in ERP, CRM, business process automation
+3. finance_utilities — AI in fintech, energy, regulated industries
+4. general_significance — broad impact on developers and people
+
+Also tag each story with one or more SDLC tags from: tooling, testing, delivery, governance, ai-agents, general.
+- tooling: new dev tools, IDEs, extensions
+- testing: AI in QA, test generation, coverage
+- delivery: CI/CD, deployment, release automation
+- governance: AI policy, compliance, audit
+- ai-agents: agent frameworks, MCP, orchestration
+- general: everything else
+
+{stories_text}
+Return JSON only — one entry per story, 0-indexed:
+{{"stories": [{{"index": 0, "scores": {{"enterprise_software_delivery": 0, "enterprise_solutions": 0, "finance_utilities": 0, "general_significance": 0}}, "include": true, "sdlc_tags": ["tooling", "ai-agents"]}}]}}"""
+
 CATEGORIES = [
     "enterprise_software_delivery",
     "enterprise_solutions",
@@ -99,21 +135,27 @@ ENTERPRISE_KEYWORDS = {
     "release", "launch", "announcement", "changelog", "update", "o1", "o3", "o4",
     "anthropic", "openai", "codex", "sonnet", "opus", "haiku",
 }
+_ENTERPRISE_MATCHER = keyword_matcher(ENTERPRISE_KEYWORDS, whole_words=True)
 
 _WEIGHT_SCORES = {"high": 20, "medium": 10, "low": 0}
 PRESCORE_LIMIT = 40
-BATCH_SIZE = 5
+RANK_MODEL = "openai/gpt-4o-mini"
 
+# Batches are packed by estimated prompt tokens rather than a fixed story count.
+# gpt-4o-mini on GitHub Models accepts 8000 input tokens per request; the story cap
+# keeps the JSON reply (~60 output tokens per story) well inside its output limit.
+RANK_TOKEN_BUDGET = 6000
+MAX_STORIES_PER_BATCH = 20
 
-def recency_multiplier(published_at: datetime) -> float:
-    """Return 1.0 for stories ≤7 days old, 0.5 for any older story."""
-    pub = published_at if published_at.tzinfo else published_at.replace(tzinfo=timezone.utc)
-    age_days = (datetime.now(tz=timezone.utc) - pub).days
-    return 1.0 if age_days <= 7 else 0.5
+# Scores are cached per story + prompt fingerprint; longer than the 14-day window
+SCORE_CACHE_PATH = Path("data/score_cache.json")
+SCORE_CACHE_MAX_DAYS = 30
 
 
 def _load_source_weights() -> dict[str, int]:
     """Map source name → numeric weight from sources/sources.yaml."""
+    import yaml
+
     try:
         data = yaml.safe_load(Path("sources/sources.yaml").read_text())
         return {
@@ -124,7 +166,11 @@ def _load_source_weights() -> dict[str, int]:
         return {}
 
 
-def heuristic_prescore(story: Story, source_weights: dict[str, int]) -> int:
+def heuristic_prescore(
+    story: Story | StoryRecord,
+    source_weights: dict[str, int],
+    now: datetime | None = None,
+) -> int:
     """Score a story without LLM using source weight, source_count, and keywords."""
     score = 0
     # Multi-source bonus: each extra source adds 10 pts, capped at +30
@@ -133,38 +179,89 @@ def heuristic_prescore(story: Story, source_weights: dict[str, int]) -> int:
     for src in story.sources:
         score += source_weights.get(src.name, 0)
     # Keyword bonus: enterprise-relevant terms in the title
-    title_words = set(story.title.lower().split())
-    score += len(title_words & ENTERPRISE_KEYWORDS) * 5
-    return int(score * recency_multiplier(story.published_at))
+    score += _ENTERPRISE_MATCHER.count(story.title) * 5
+    return int(score * recency_multiplier(story.published_at, now))
+
+
+def prescore_stories(stories: list[StoryT], source_weights: dict[str, int]) -> list[int]:
+    """heuristic_prescore() for a whole candidate pool, aged against one run timestamp."""
+    now = datetime.now(tz=timezone.utc)
+    return [heuristic_prescore(story, source_weights, now) for story in stories]
 
 
 def presort_and_limit(
-    stories: list[Story],
+    stories: list[StoryT],
     source_weights: dict[str, int],
     limit: int = PRESCORE_LIMIT,
-) -> list[Story]:
-    """Sort by heuristic prescore and keep top N candidates for LLM ranking."""
-    scored = sorted(
-        stories,
-        key=lambda s: heuristic_prescore(s, source_weights),
-        reverse=True,
-    )
-    selected = scored[:limit]
+) -> list[StoryT]:
+    """Keep the top N candidates for LLM ranking by heuristic prescore.
+
+    heapq.nlargest selects them without sorting the whole pool — O(n log N)
+    rather than O(n log n) — and, like a stable descending sort, keeps tied
+    stories in input order.
+    """
+    scores = prescore_stories(stories, source_weights)
+    top = heapq.nlargest(limit, range(len(stories)), key=scores.__getitem__)
+    selected = [stories[i] for i in top]
     print(f"  Heuristic pre-filter: {len(selected)} of {len(stories)} stories kept")
     return selected
 
 
-def get_client() -> OpenAI:
-    token = os.environ.get("GITHUB_TOKEN")
-    if not token:
-        raise ValueError("GITHUB_TOKEN environment variable is required")
-    return OpenAI(
-        base_url="https://models.github.ai/inference",
-        api_key=token,
+def estimate_tokens(text: str) -> int:
+    """Rough token count — ~4 characters per token for English text."""
+    return len(text) // 4 + 1
+
+
+def _rank_story_text(i: int, story: Story) -> str:
+    source = story.sources[0].name if story.sources else "unknown"
+    return (
+        f"\nStory {i} — Title: {story.title}\n"
+        f"  Source: {source}\n"
+        f"  Content: {story.raw_content[:400]}\n"
+    )
+
+
+def _classify_story_text(i: int, story: Story) -> str:
+    return (
+        f"\nStory {i} — Title: {story.title}\n"
+        f"  Content: {story.raw_content[:400]}\n"
     )
 
 
-def rank_story(story: Story, client: OpenAI) -> Story | None:
+def plan_batches(
+    stories: list[Story],
+    story_text,
+    prompt_overhead: int,
+    token_budget: int = RANK_TOKEN_BUDGET,
+    max_stories: int = MAX_STORIES_PER_BATCH,
+) -> list[list[Story]]:
+    """Greedily pack stories, in order, into batches whose prompt fits token_budget.
+
+    story_text(index, story) renders one story's block of the prompt;
+    prompt_overhead is the estimated size of everything else (system prompt,
+    instructions). A story too large for the budget on its own still gets a
+    batch of one.
+    """
+    batches: list[list[Story]] = []
+    current: list[Story] = []
+    used = prompt_overhead
+    for story in stories:
+        cost = estimate_tokens(story_text(len(current), story))
+        if current and (used + cost > token_budget or len(current) >= max_stories):
+            batches.append(current)
+            current, used = [], prompt_overhead
+        current.append(story)
+        used += cost
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _prompt_overhead(system_prompt: str, user_prompt: str) -> int:
+    return estimate_tokens(system_prompt + user_prompt.format(n=0, stories_text=""))
+
+
+def rank_story(story: Story, client: "OpenAI") -> Story | None:
     """Rank a single story. Kept for backwards compatibility and unit tests."""
     prompt = RANK_USER_PROMPT.format(
         title=story.title,
@@ -172,8 +269,9 @@ def rank_story(story: Story, client: OpenAI) -> Story | None:
         content=story.raw_content[:800],
     )
     try:
-        response = client.chat.completions.create(
-            model="openai/gpt-4o-mini",         # Low tier: 150 req/day, 15 req/min
+        response = create_completion(
+            client,
+            model=RANK_MODEL,         # Low tier: 150 req/day, 15 req/min
             messages=[
                 {"role": "system", "content": RANK_SYSTEM_PROMPT},
                 {"role": "user", "content": prompt},
@@ -202,99 +300,112 @@ def rank_story(story: Story, client: OpenAI) -> Story | None:
         return None
 
 
-def rank_batch(batch: list[Story], client: OpenAI, retries: int = 2) -> list[Story]:
-    """Rank up to BATCH_SIZE stories in a single LLM call. Retries on 429 with backoff."""
-    stories_text = ""
-    for i, story in enumerate(batch):
-        source = story.sources[0].name if story.sources else "unknown"
-        stories_text += (
-            f"\nStory {i} — Title: {story.title}\n"
-            f"  Source: {source}\n"
-            f"  Content: {story.raw_content[:400]}\n"
-        )
+def _score_batch(
+    batch: list[Story],
+    client: "OpenAI",
+    retries: int = 2,
+    combined: bool = False,
+) -> dict[int, tuple[str, int, list[str] | None] | None] | None:
+    """Score a batch in one LLM call. Retries on 429 after the server's Retry-After.
 
-    prompt = RANK_BATCH_PROMPT.format(n=len(batch), stories_text=stories_text)
-
-    for attempt in range(retries + 1):
-        try:
-            response = client.chat.completions.create(
-                model="openai/gpt-4o-mini",         # Low tier: 150 req/day, 15 req/min
-                messages=[
-                    {"role": "system", "content": RANK_SYSTEM_PROMPT},
-                    {"role": "user", "content": prompt},
-                ],
-                temperature=0,
-                response_format={"type": "json_object"},
-            )
-            data = json.loads(response.choices[0].message.content)
-            results = data.get("stories", [])
+    Returns index → (best category, best score, sdlc tags) for every story the
+    model scored, or None for stories it excluded. Tags are only returned with
+    combined=True, and are None when the model left them out. Indices the model
+    skipped are absent. Returns None if the call itself failed.
+    """
+    stories_text = "".join(_rank_story_text(i, story) for i, story in enumerate(batch))
+    template = RANK_COMBINED_PROMPT if combined else RANK_BATCH_PROMPT
+    prompt = template.format(n=len(batch), stories_text=stories_text)
 
-            ranked = []
-            for item in results:
-                idx = item.get("index", -1)
-                if not isinstance(idx, int) or idx < 0 or idx >= len(batch):
-                    continue
-                if not item.get("include", True):
-                    continue
-                scores = item.get("scores", {})
-                if not scores:
-                    continue
-                best_category = max(scores, key=lambda k: scores[k])
-                best_score = scores[best_category]
-                if best_score < 20:
-                    continue
-                story = batch[idx]
-                story.priority_category = best_category
-                story.priority_score = best_score
-                ranked.append(story)
+    try:
+        response = create_completion(
+            client,
+            retries,
+            model=RANK_MODEL,         # Low tier: 150 req/day, 15 req/min
+            messages=[
+                {"role": "system", "content": RANK_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt},
+            ],
+            temperature=0,
+            response_format={"type": "json_object"},
+        )
+        data = json.loads(response.choices[0].message.content)
+        results = data.get("stories", [])
+
+        verdicts: dict[int, tuple[str, int, list[str] | None] | None] = {}
+        for item in results:
+            idx = item.get("index", -1)
+            if not isinstance(idx, int) or idx < 0 or idx >= len(batch):
+                continue
+            if not item.get("include", True):
+                verdicts[idx] = None
+                continue
+            scores = item.get("scores", {})
+            if not scores:
+                continue
+            best_category = max(scores, key=lambda k: scores[k])
+            best_score = scores[best_category]
+            if best_score < 20:
+                verdicts[idx] = None
+                continue
+            tags = None
+            if combined and "sdlc_tags" in item:
+                tags = [t for t in item["sdlc_tags"] if t in SDLC_TAGS] or ["general"]
+            verdicts[idx] = (best_category, best_score, tags)
+
+        return verdicts
 
-            return ranked
+    except Exception as e:
+        print(f"  Warning: batch rank failed: {e}")
+        return None
 
-        except Exception as e:
-            is_rate_limit = "429" in str(e) or "Too many requests" in str(e)
-            if is_rate_limit and attempt < retries:
-                wait = 15 * (attempt + 1)   # 15s, then 30s
-                print(f"  Rate limited — waiting {wait}s before retry {attempt + 1}/{retries}")
-                time.sleep(wait)
-            else:
-                print(f"  Warning: batch rank failed: {e}")
-                return []
 
-    return []
+def _apply_verdict(story: Story, verdict: tuple[str, int, list[str] | None]) -> None:
+    story.priority_category, story.priority_score, tags = verdict
+    if tags is not None:
+        story.sdlc_tags = tags
 
 
-def classify_sdlc_tags(stories: list[Story], client: OpenAI) -> list[Story]:
-    """Classify each ranked story with SDLC tags using batched LLM calls.
+def rank_batch(batch: list[Story], client: "OpenAI", retries: int = 2, combined: bool = False) -> list[Story]:
+    """Rank a batch of stories in a single LLM call. Retries on 429.
 
-    Processes BATCH_SIZE stories per call, same rate-limit pattern as rank_batch().
-    Falls back to ["general"] for any story whose tags cannot be determined.
+    With combined=True the same call also assigns sdlc_tags.
     """
-    total_batches = (len(stories) + BATCH_SIZE - 1) // BATCH_SIZE
-    print(f"Classifying SDLC tags for {len(stories)} stories in {total_batches} batches of {BATCH_SIZE}...")
-
-    # Build an index map so we can update stories in-place
-    story_index: dict[int, Story] = {}
-    for i, story in enumerate(stories):
-        story_index[i] = story
-
-    for batch_start in range(0, len(stories), BATCH_SIZE):
-        if batch_start > 0:
-            time.sleep(5)   # stay within 15 req/min limit
-
-        batch = stories[batch_start:batch_start + BATCH_SIZE]
-        stories_text = ""
-        for j, story in enumerate(batch):
-            stories_text += (
-                f"\nStory {j} — Title: {story.title}\n"
-                f"  Content: {story.raw_content[:400]}\n"
-            )
+    verdicts = _score_batch(batch, client, retries, combined) or {}
+    ranked = []
+    for idx, verdict in verdicts.items():
+        if verdict is None:
+            continue
+        story = batch[idx]
+        _apply_verdict(story, verdict)
+        ranked.append(story)
+    return ranked
+
 
+def _classify_stories(
+    stories: list[Story],
+    client: "OpenAI",
+    token_budget: int = RANK_TOKEN_BUDGET,
+) -> set[str]:
+    """Tag stories in place (see classify_sdlc_tags). Returns ids the LLM actually tagged."""
+    batches = plan_batches(
+        stories,
+        _classify_story_text,
+        _prompt_overhead(SDLC_CLASSIFY_SYSTEM_PROMPT, SDLC_CLASSIFY_BATCH_PROMPT),
+        token_budget,
+    )
+    total_batches = len(batches)
+    print(f"Classifying SDLC tags for {len(stories)} stories in {total_batches} batches (budget {token_budget} tokens)...")
+
+    classified: set[str] = set()
+    for batch_num, batch in enumerate(batches, start=1):
+        stories_text = "".join(_classify_story_text(j, story) for j, story in enumerate(batch))
         prompt = SDLC_CLASSIFY_BATCH_PROMPT.format(stories_text=stories_text)
-        batch_num = batch_start // BATCH_SIZE + 1
 
         try:
-            response = client.chat.completions.create(
-                model="openai/gpt-4o-mini",
+            response = create_completion(
+                client,
+                model=RANK_MODEL,
                 messages=[
                     {"role": "system", "content": SDLC_CLASSIFY_SYSTEM_PROMPT},
                     {"role": "user", "content": prompt},
@@ -314,6 +425,7 @@ def classify_sdlc_tags(stories: list[Story], client: OpenAI) -> list[Story]:
                 valid_tags = [t for t in raw_tags if t in SDLC_TAGS]
                 batch[idx].sdlc_tags = valid_tags if valid_tags else ["general"]
                 tagged_indices.add(idx)
+                classified.add(batch[idx].id)
 
             # Fallback for any story the LLM didn't return
             for j in range(len(batch)):
@@ -333,9 +445,98 @@ def classify_sdlc_tags(stories: list[Story], client: OpenAI) -> list[Story]:
         if not story.sdlc_tags:
             story.sdlc_tags = ["general"]
 
+    return classified
+
+
+def classify_sdlc_tags(stories: list[Story], client: "OpenAI") -> list[Story]:
+    """Classify each ranked story with SDLC tags using batched LLM calls.
+
+    Packs stories into calls by token budget and shares rank_batch()'s rate limiter.
+    Falls back to ["general"] for any story whose tags cannot be determined.
+    """
+    _classify_stories(stories, client)
     return stories
 
 
+def prompt_fingerprint(combined: bool = False) -> str:
+    """Short hash of the model and every prompt that shapes a story's score or tags."""
+    parts = [
+        RANK_MODEL,
+        RANK_SYSTEM_PROMPT,
+        RANK_BATCH_PROMPT,
+        SDLC_CLASSIFY_SYSTEM_PROMPT,
+        SDLC_CLASSIFY_BATCH_PROMPT,
+    ]
+    if combined:
+        parts.append(RANK_COMBINED_PROMPT)
+    return hashlib.sha256("\x00".join(parts).encode()).hexdigest()[:16]
+
+
+def load_score_cache(path: Path = SCORE_CACHE_PATH) -> dict:
+    """Load score cache, evicting entries older than SCORE_CACHE_MAX_DAYS."""
+    if not path.exists():
+        return {}
+    try:
+        raw = json.loads(path.read_text())
+        cutoff = datetime.now(tz=timezone.utc) - timedelta(days=SCORE_CACHE_MAX_DAYS)
+        result = {}
+        for key, entry in raw.items():
+            try:
+                cached_at = datetime.fromisoformat(entry["cached_at"])
+                if cached_at.tzinfo is None:
+                    cached_at = cached_at.replace(tzinfo=timezone.utc)
+                if cached_at >= cutoff:
+                    result[key] = entry
+            except (KeyError, ValueError):
+                pass  # skip malformed entries rather than discarding the whole cache
+        return result
+    except Exception:
+        return {}
+
+
+def save_score_cache(cache: dict, path: Path = SCORE_CACHE_PATH) -> None:
+    """Persist score cache to disk."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(cache))
+
+
+def _score_key(story: Story, fingerprint: str) -> str:
+    return f"{fingerprint}:{story.id}"
+
+
+def apply_cached_scores(
+    stories: list[Story],
+    cache: dict,
+    fingerprint: str,
+) -> tuple[list[Story], list[Story]]:
+    """Split stories into (previously ranked and kept, never scored under this fingerprint).
+
+    Kept stories get their cached priority_category, priority_score and
+    sdlc_tags back. Stories previously excluded by the model are dropped.
+    """
+    kept, unscored = [], []
+    for story in stories:
+        entry = cache.get(_score_key(story, fingerprint))
+        if entry is None:
+            unscored.append(story)
+        elif entry["included"]:
+            story.priority_category = entry["priority_category"]
+            story.priority_score = entry["priority_score"]
+            story.sdlc_tags = entry.get("sdlc_tags", [])
+            kept.append(story)
+    return kept, unscored
+
+
+def _remember_score(cache: dict, fingerprint: str, story: Story, included: bool) -> None:
+    cache[_score_key(story, fingerprint)] = {
+        "included": included,
+        "priority_category": story.priority_category if included else None,
+        "priority_score": story.priority_score if included else None,
+        "sdlc_tags": story.sdlc_tags if included else [],
+        "cached_at": datetime.now(tz=timezone.utc).isoformat(),
+    }
+
+
 def select_top_stories(
     stories: list[Story],
     per_category: int = 5,
@@ -345,10 +546,11 @@ def select_top_stories(
         if story.priority_category and story.priority_category in categorized:
             categorized[story.priority_category].append(story)
 
+    now = datetime.now(tz=timezone.utc)
     for cat in categorized:
         categorized[cat].sort(
             key=lambda s: (
-                (s.priority_score or 0) * recency_multiplier(s.published_at),
+                (s.priority_score or 0) * recency_multiplier(s.published_at, now),
                 s.source_count,
             ),
             reverse=True,
@@ -358,46 +560,66 @@ def select_top_stories(
     return categorized
 
 
-def main():
-    client = get_client()
-    source_weights = _load_source_weights()
-
-    stories_raw = json.loads(Path("data/normalized.json").read_text())
-    stories = []
-    for item in stories_raw:
-        if isinstance(item.get("published_at"), str):
-            item["published_at"] = datetime.fromisoformat(item["published_at"])
-        stories.append(Story(**item))
-
-    # Drop stories older than 14 days — prevents repeat stories across weeks
-    cutoff = datetime.now(tz=timezone.utc) - timedelta(days=14)
-    before = len(stories)
-    stories = [
-        s for s in stories
-        if (s.published_at if s.published_at.tzinfo else s.published_at.replace(tzinfo=timezone.utc)) >= cutoff
-    ]
-    print(f"  Recency filter: {before - len(stories)} stories dropped (>14 days), {len(stories)} remain")
+def rank_stories(
+    stories: list[StoryT],
+    client: "OpenAI",
+    source_weights: dict[str, int],
+    score_cache: dict | None = None,
+    combined: bool = False,
+    token_budget: int = RANK_TOKEN_BUDGET,
+) -> dict[str, list[Story]]:
+    """Pre-filter, score, tag and select stories — main() minus the file handling.
 
+    Cached scores are reused and new ones added to score_cache (the caller
+    saves it). Returns the ranked.json lists: personal_items and enterprise_items.
+    """
     # Step 1: heuristic pre-filter — no LLM calls
     stories = presort_and_limit(stories, source_weights, limit=PRESCORE_LIMIT)
-
-    # Step 2: batch LLM ranking — BATCH_SIZE stories per call
-    total_batches = (len(stories) + BATCH_SIZE - 1) // BATCH_SIZE
-    print(f"Ranking {len(stories)} stories in {total_batches} batches of {BATCH_SIZE}...")
-    ranked = []
-    for i in range(0, len(stories), BATCH_SIZE):
-        if i > 0:
-            time.sleep(5)   # 5s gap → ~12 req/min, under the 15 req/min limit
-        batch = stories[i:i + BATCH_SIZE]
-        results = rank_batch(batch, client)
-        ranked.extend(results)
-        batch_num = i // BATCH_SIZE + 1
+    # Validate just the survivors (story store rows are already Stories)
+    stories = [s.to_story() if isinstance(s, StoryRecord) else s for s in stories]
+
+    # Step 2: reuse scores from previous runs — the 14-day window overlaps last week's
+    fingerprint = prompt_fingerprint(combined)
+    if score_cache is None:
+        score_cache = {}
+    ranked, stories = apply_cached_scores(stories, score_cache, fingerprint)
+    print(f"  Score cache: {len(ranked)} kept from earlier runs, {len(stories)} never scored")
+
+    # Step 3: batch LLM ranking of unscored stories — packed to the token budget
+    batches = plan_batches(
+        stories,
+        _rank_story_text,
+        _prompt_overhead(RANK_SYSTEM_PROMPT, RANK_COMBINED_PROMPT if combined else RANK_BATCH_PROMPT),
+        token_budget,
+    )
+    total_batches = len(batches)
+    mode = "scores + SDLC tags" if combined else "scores"
+    print(f"Ranking {len(stories)} stories in {total_batches} batches ({mode}, budget {token_budget} tokens)...")
+    newly_ranked = []
+    for batch_num, batch in enumerate(batches, start=1):
+        verdicts = _score_batch(batch, client, combined=combined)
+        results = []
+        for idx, verdict in (verdicts or {}).items():
+            story = batch[idx]
+            if verdict is not None:
+                _apply_verdict(story, verdict)
+                results.append(story)
+            # Only cache what the model actually answered — failed calls are retried next run
+            _remember_score(score_cache, fingerprint, story, included=verdict is not None)
+        newly_ranked.extend(results)
         print(f"  Batch {batch_num}/{total_batches}: {len(results)}/{len(batch)} ranked")
 
+    ranked.extend(newly_ranked)
     print(f"  {len(ranked)} stories passed ranking filter")
 
-    # Step 3: classify SDLC tags — BATCH_SIZE stories per call
-    ranked = classify_sdlc_tags(ranked, client)
+    # Step 4: classify SDLC tags for stories still without tags (cache misses, or
+    # stories the combined prompt left untagged)
+    untagged = [s for s in ranked if not s.sdlc_tags]
+    classified = _classify_stories(untagged, client, token_budget) if untagged else set()
+    for story in untagged:
+        entry = score_cache.get(_score_key(story, fingerprint))
+        if entry is not None and story.id in classified:
+            entry["sdlc_tags"] = story.sdlc_tags
 
     categorized = select_top_stories(ranked)
     total = sum(len(v) for v in categorized.values())
@@ -410,13 +632,49 @@ def main():
     enterprise_items = filter_enterprise_items(personal_items)
     print(f"  {len(enterprise_items)} enterprise items (non-general SDLC tags)")
 
-    output = {
-        "personal_items": [s.model_dump(mode="json") for s in personal_items],
-        "enterprise_items": [s.model_dump(mode="json") for s in enterprise_items],
-    }
-    Path("data/ranked.json").write_text(json.dumps(output, indent=2, default=str))
+    return {"personal_items": personal_items, "enterprise_items": enterprise_items}
+
+
+@stage_metrics("rank")
+def main():
+    client = get_client()
+    source_weights = _load_source_weights()
+
+    # Drop stories older than 14 days — prevents repeat stories across weeks
+    cutoff = datetime.now(tz=timezone.utc) - timedelta(days=14)
+    store = open_store()
+    if store:
+        # The store applies the cutoff in SQL and only decodes rows that survive it
+        stories = store.read_stage("normalized", "stories", published_since=cutoff)
+        print(f"  Recency filter: {len(stories)} stories within 14 days loaded from the story store")
+    else:
+        # Unvalidated records until the pre-filter has cut the list to PRESCORE_LIMIT
+        records = read_records("data/normalized.json")
+        stories = [
+            r for r in records
+            if (r.published_at if r.published_at.tzinfo else r.published_at.replace(tzinfo=timezone.utc)) >= cutoff
+        ]
+        print(f"  Recency filter: {len(records) - len(stories)} stories dropped (>14 days), {len(stories)} remain")
+
+    combined = os.environ.get("RANK_COMBINED", "") not in ("", "0")
+    score_cache = load_score_cache()
+    ranked = rank_stories(
+        stories,
+        client,
+        source_weights,
+        score_cache,
+        combined=combined,
+        token_budget=int(os.environ.get("RANK_TOKEN_BUDGET", RANK_TOKEN_BUDGET)),
+    )
+    save_score_cache(score_cache)
+
+    write_artifact("data/ranked.json", ranked, RANKED)
     print("  Saved to data/ranked.json")
 
+    if store:
+        with store:
+            store.write_stage("ranked", ranked)
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,208 @@
+"""
+Client-side rate limiting for GitHub Models calls.
+
+Each model gets a RateLimiter with two token buckets — requests per minute
+and requests per day — sized to the GitHub Models Low tier (15 req/min,
+150 req/day). Callers acquire() before every request instead of sleeping a
+fixed interval between batches, so calls go out at the allowed rate.
+
+The limiter also learns from the server. observe_response() is installed as
+an httpx response hook on the OpenAI client (see common.get_client):
+x-ratelimit-remaining-requests clamps the per-minute bucket, a zero
+remaining count pauses until x-ratelimit-reset-requests, and Retry-After on
+a 429 pauses for the given time. A wait longer than max_wait (typically the daily quota
+running out) raises RateLimitExhausted instead of sleeping for hours.
+"""
+import asyncio
+import json
+import re
+import time
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import httpx
+
+# Requests per minute, requests per day
+MODEL_LIMITS = {
+    "openai/gpt-4o-mini": (15, 150),
+    "openai/gpt-4o": (15, 150),
+}
+DEFAULT_LIMITS = (15, 150)
+MAX_WAIT = 120   # seconds; longer waits mean the quota is gone for this run
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+
+
+class RateLimitExhausted(RuntimeError):
+    """Raised by acquire() when the next request slot is more than max_wait away."""
+
+
+def _parse_duration(value: str | None) -> float | None:
+    """Seconds from '12', '1.5', '6m0s', '20ms' or an HTTP date. None if unparseable."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if parts and "".join(n + u for n, u in parts) == value:
+        scale = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+        return sum(float(n) * scale[u] for n, u in parts)
+    try:
+        when = parsedate_to_datetime(value)
+        return max((when - datetime.now(tz=timezone.utc)).total_seconds(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """capacity tokens, refilled continuously over period seconds."""
+
+    def __init__(self, capacity: int, period: float, now: float):
+        self.capacity = capacity
+        self.rate = capacity / period
+        self.tokens = float(capacity)
+        self._updated = now
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, now: float) -> float:
+        """Seconds until one token is available."""
+        self._refill(now)
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self, now: float) -> None:
+        self._refill(now)
+        self.tokens -= 1
+
+    def clamp(self, remaining: int, now: float) -> None:
+        """Never believe we have more tokens than the server says are left."""
+        self._refill(now)
+        self.tokens = min(self.tokens, float(remaining))
+
+
+class RateLimiter:
+    """Requests-per-minute and requests-per-day buckets for one model."""
+
+    def __init__(
+        self,
+        per_minute: int,
+        per_day: int,
+        max_wait: float = MAX_WAIT,
+        clock=time.monotonic,
+        sleep=time.sleep,
+    ):
+        now = clock()
+        self.minute = TokenBucket(per_minute, 60, now)
+        self.day = TokenBucket(per_day, 86_400, now)
+        self.max_wait = max_wait
+        self._clock = clock
+        self._sleep = sleep
+        self._blocked_until = now
+
+    def wait_time(self) -> float:
+        now = self._clock()
+        return max(self._blocked_until - now, self.minute.wait_time(now), self.day.wait_time(now), 0.0)
+
+    def reserve(self) -> float:
+        """Claim the next request slot now. Returns how long to wait before using it.
+
+        Claiming before waiting lets concurrent callers queue up behind each
+        other instead of all seeing the same free slot.
+        """
+        wait = self.wait_time()
+        if wait > self.max_wait:
+            raise RateLimitExhausted(f"next request slot is {wait:.0f}s away")
+        now = self._clock()
+        self.minute.take(now)
+        self.day.take(now)
+        return wait
+
+    def acquire(self) -> float:
+        """Block until a request may be sent, then consume it. Returns seconds waited."""
+        wait = self.reserve()
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+    async def acquire_async(self) -> float:
+        """acquire() for coroutines — waits with asyncio.sleep."""
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def pause(self, seconds: float) -> None:
+        """Hold off every request for the next `seconds`."""
+        self._blocked_until = max(self._blocked_until, self._clock() + seconds)
+
+    def observe(self, headers: "httpx.Headers | dict") -> None:
+        """Update the buckets from x-ratelimit-* and Retry-After response headers."""
+        import httpx   # loaded by the client whose responses these are
+
+        headers = httpx.Headers(headers)
+        now = self._clock()
+
+        remaining = headers.get("x-ratelimit-remaining-requests")
+        if remaining is not None:
+            try:
+                remaining_count = max(int(float(remaining)), 0)
+            except ValueError:
+                remaining_count = None
+            if remaining_count is not None:
+                # The header doesn't say which window it counts; a daily cutoff
+                # shows up as a zero count with a long reset instead
+                self.minute.clamp(remaining_count, now)
+                if remaining_count == 0:
+                    reset = _parse_duration(headers.get("x-ratelimit-reset-requests"))
+                    self.pause(60 if reset is None else reset)
+
+        retry_after_ms = _parse_duration(headers.get("retry-after-ms"))
+        retry_after = retry_after_ms / 1000 if retry_after_ms is not None else _parse_duration(headers.get("retry-after"))
+        if retry_after is not None:
+            self.pause(retry_after)
+
+    def retry_after(self, headers: "httpx.Headers | dict") -> bool:
+        """Observe a 429's headers. True if they said how long to wait."""
+        import httpx
+
+        headers = httpx.Headers(headers)
+        self.observe(headers)
+        return any(h in headers for h in ("retry-after", "retry-after-ms", "x-ratelimit-reset-requests"))
+
+
+_limiters: dict[str, RateLimiter] = {}
+
+
+def limiter_for(model: str) -> RateLimiter:
+    """The shared limiter for a model, created on first use from MODEL_LIMITS."""
+    if model not in _limiters:
+        per_minute, per_day = MODEL_LIMITS.get(model, DEFAULT_LIMITS)
+        _limiters[model] = RateLimiter(per_minute, per_day)
+    return _limiters[model]
+
+
+def reset_limiters() -> None:
+    """Forget all limiter state (a fresh process starts with full buckets)."""
+    _limiters.clear()
+
+
+def observe_response(response: "httpx.Response") -> None:
+    """httpx response hook: feed rate-limit headers to the limiter of the request's model."""
+    try:
+        model = json.loads(response.request.content).get("model")
+    except Exception:
+        return
+    if model:
+        limiter_for(model).observe(response.headers)
+
+
+async def observe_response_async(response: "httpx.Response") -> None:
+    """observe_response() for httpx.AsyncClient, whose hooks must be coroutines."""
+    observe_response(response)
@@ -0,0 +1,150 @@
+"""
+Persistent SQLite story store shared by the pipeline stages.
+
+Stories are stored once, keyed on Story.id, as their validated JSON. Each
+stage records which stories it produced (and in what order) as named lists,
+so the next stage reads just those rows — optionally filtered by
+published_at in SQL — instead of re-parsing the previous stage's JSON file.
+Rows are kept across runs, which gives a history of every story seen.
+
+Enabled by pointing STORY_STORE at a database file, e.g.
+    STORY_STORE=data/stories.db python pipeline/rank.py
+Without it every stage keeps using its JSON artifact.
+"""
+import os
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+from schemas.story import Story
+
+STORE_ENV = "STORY_STORE"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS stories (
+    id            TEXT PRIMARY KEY,
+    canonical_url TEXT NOT NULL,
+    published_at  TEXT NOT NULL,   -- UTC ISO-8601, so string order is time order
+    payload       TEXT NOT NULL,   -- Story.model_dump_json()
+    first_seen    TEXT NOT NULL,
+    updated_at    TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_stories_published_at ON stories (published_at);
+
+CREATE TABLE IF NOT EXISTS stage_items (
+    stage     TEXT NOT NULL,
+    list_name TEXT NOT NULL,
+    position  INTEGER NOT NULL,
+    story_id  TEXT NOT NULL REFERENCES stories (id),
+    PRIMARY KEY (stage, list_name, position)
+);
+"""
+
+
+def _utc_iso(dt: datetime) -> str:
+    dt = dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc).isoformat()
+
+
+class StoryStore:
+    """Small repository API over the stories database."""
+
+    def __init__(self, path: str | Path):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path))
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "StoryStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def upsert(self, stories: list[Story]) -> None:
+        """Insert new stories and update changed ones; unchanged rows are not rewritten."""
+        now = datetime.now(tz=timezone.utc).isoformat()
+        rows = [
+            (s.id, s.canonical_url, _utc_iso(s.published_at), s.model_dump_json(), now, now)
+            for s in stories
+        ]
+        with self._conn:
+            self._conn.executemany(
+                """
+                INSERT INTO stories (id, canonical_url, published_at, payload, first_seen, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (id) DO UPDATE SET
+                    canonical_url = excluded.canonical_url,
+                    published_at  = excluded.published_at,
+                    payload       = excluded.payload,
+                    updated_at    = excluded.updated_at
+                WHERE stories.payload != excluded.payload
+                """,
+                rows,
+            )
+
+    def get(self, ids: list[str]) -> list[Story]:
+        """Fetch stories by id, in the order given. Unknown ids are skipped."""
+        if not ids:
+            return []
+        placeholders = ",".join("?" * len(ids))
+        rows = dict(self._conn.execute(
+            f"SELECT id, payload FROM stories WHERE id IN ({placeholders})", ids
+        ).fetchall())
+        return [Story.model_validate_json(rows[i]) for i in ids if i in rows]
+
+    def published_since(self, cutoff: datetime) -> list[Story]:
+        """Every stored story published at or after cutoff, newest first."""
+        rows = self._conn.execute(
+            "SELECT payload FROM stories WHERE published_at >= ? ORDER BY published_at DESC",
+            (_utc_iso(cutoff),),
+        ).fetchall()
+        return [Story.model_validate_json(payload) for (payload,) in rows]
+
+    def write_stage(self, stage: str, lists: dict[str, list[Story]]) -> None:
+        """Record a stage's output lists, replacing whatever that stage wrote before."""
+        self.upsert([s for stories in lists.values() for s in stories])
+        with self._conn:
+            self._conn.execute("DELETE FROM stage_items WHERE stage = ?", (stage,))
+            self._conn.executemany(
+                "INSERT INTO stage_items (stage, list_name, position, story_id) VALUES (?, ?, ?, ?)",
+                [
+                    (stage, name, pos, story.id)
+                    for name, stories in lists.items()
+                    for pos, story in enumerate(stories)
+                ],
+            )
+
+    def read_stage(
+        self,
+        stage: str,
+        list_name: str,
+        published_since: datetime | None = None,
+    ) -> list[Story]:
+        """Stories a stage wrote under list_name, in their original order."""
+        query = """
+            SELECT s.payload FROM stage_items i JOIN stories s ON s.id = i.story_id
+            WHERE i.stage = ? AND i.list_name = ?
+        """
+        params: list = [stage, list_name]
+        if published_since is not None:
+            query += " AND s.published_at >= ?"
+            params.append(_utc_iso(published_since))
+        query += " ORDER BY i.position"
+        return [Story.model_validate_json(p) for (p,) in self._conn.execute(query, params)]
+
+    def stage_lists(self, stage: str) -> list[str]:
+        """Names of the lists a stage wrote."""
+        rows = self._conn.execute(
+            "SELECT DISTINCT list_name FROM stage_items WHERE stage = ? ORDER BY list_name",
+            (stage,),
+        ).fetchall()
+        return [name for (name,) in rows]
+
+
+def open_store() -> StoryStore | None:
+    """Open the store named by $STORY_STORE, or None when the store is not enabled."""
+    path = os.environ.get(STORE_ENV)
+    return StoryStore(path) if path else None
@@ -4,13 +4,37 @@ Job 4: Generate structured 6-dimension analysis for top-ranked stories.
 Uses GitHub Models API (openai/gpt-4o) for higher quality summaries.
 Only runs on top 3 stories to stay within rate limits (150 req/day).
 Note: anthropic/claude-sonnet-4-6 is not available on GitHub Models API.
+
+Stories are summarized concurrently over AsyncOpenAI, at most
+SUMMARIZE_CONCURRENCY calls in flight (env var, default 3).
+SUMMARIZE_CATEGORY_LEADS=N also summarizes the top N stories of each
+category (default 0 — top 3 only).
+
+Cached summaries are keyed by URL and carry a SimHash fingerprint of the
+title + content the prompt saw (pipeline/fingerprint.py). A story at a new
+URL reuses a summary whose fingerprint is within SUMMARY_REUSE_DISTANCE bits
+(syndicated copies, tracking-param variants); a story at a cached URL is
+re-summarized when its fingerprint has drifted more than
+SUMMARY_CHANGED_DISTANCE bits (the article was materially rewritten).
+
+main() keeps the cache in the append-only journal data/summary_cache.jsonl
+(pipeline/summary_cache.py).
 """
+import asyncio
 import json
-from datetime import datetime, timezone, timedelta
-from pathlib import Path
-from openai import OpenAI
+import os
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING
 from schemas.story import Story, StorySummary
-from pipeline.rank import get_client, recency_multiplier
+from pipeline.common import create_completion, create_completion_async, get_async_client, recency_multiplier
+from pipeline.fingerprint import fingerprint_distance, story_fingerprint
+from pipeline.metrics import stage_metrics
+from pipeline.artifacts import RANKED, SUMMARIZED, read_artifact, write_artifact
+from pipeline.store import open_store
+from pipeline.summary_cache import SummaryCache
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI, OpenAI
 
 SUMMARIZE_SYSTEM_PROMPT = """You are a senior enterprise AI analyst writing for technical
 leaders and developers. Be concise, specific, and practical. Avoid hype and marketing language.
@@ -33,79 +57,145 @@ Return JSON only:
 }}"""
 
 
-CACHE_PATH = Path("data/summary_cache.json")
+SUMMARIZE_MODEL = "openai/gpt-4o"   # best available on GitHub Models API
+
+SUMMARIZE_CONCURRENCY = 3
+SUMMARIZE_CATEGORY_LEADS = 0
+
 CACHE_MAX_DAYS = 14
 
+# Hamming distances between 64-bit fingerprints. ~1% of words changed moves
+# a fingerprint ~5 bits, ~10% moves it ~17, unrelated texts sit around 32.
+SUMMARY_REUSE_DISTANCE = 6
+SUMMARY_CHANGED_DISTANCE = 16
 
-def load_cache(path: Path = CACHE_PATH) -> dict:
-    """Load summary cache, evicting entries older than CACHE_MAX_DAYS."""
-    if not path.exists():
-        return {}
-    try:
-        raw = json.loads(path.read_text())
-        cutoff = datetime.now(tz=timezone.utc) - timedelta(days=CACHE_MAX_DAYS)
-        result = {}
-        for url, entry in raw.items():
-            try:
-                cached_at = datetime.fromisoformat(entry["cached_at"])
-                # Treat naive timestamps as UTC (guards against manually-edited files)
-                if cached_at.tzinfo is None:
-                    cached_at = cached_at.replace(tzinfo=timezone.utc)
-                if cached_at >= cutoff:
-                    result[url] = entry
-            except (KeyError, ValueError):
-                pass  # skip malformed entries rather than discarding the whole cache
-        return result
-    except Exception:
-        return {}
-
-
-def save_cache(cache: dict, path: Path = CACHE_PATH) -> None:
-    """Persist summary cache to disk."""
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(cache, indent=2))
-
-
-def summarize_story(story: Story, client: OpenAI, cache: dict | None = None) -> Story:
-    # Check cache first — skip LLM if we already have a summary for this URL
-    if cache is not None and story.canonical_url in cache:
-        print(f"  Cache hit: {story.title[:50]}")
-        story.summary = StorySummary(**cache[story.canonical_url]["summary"])
-        return story
 
+def _content_fingerprint(story: Story) -> str:
+    # Same content slice the prompt sends, so the fingerprint tracks what was summarized
+    return story_fingerprint(story.title, story.raw_content[:1500])
+
+
+def find_cached_summary(story: Story, cache: dict) -> dict | None:
+    """Cache entry whose summary still applies to story, or None.
+
+    Same URL: a hit unless the content changed materially since it was
+    summarized (entries from before fingerprinting always hit). Other URLs:
+    the closest entry within SUMMARY_REUSE_DISTANCE bits.
+    """
+    fingerprint = _content_fingerprint(story)
+    entry = cache.get(story.canonical_url)
+    if entry is not None:
+        if "fingerprint" not in entry:
+            return entry
+        if fingerprint_distance(entry["fingerprint"], fingerprint) <= SUMMARY_CHANGED_DISTANCE:
+            return entry
+        print(f"  Content changed since cached summary: {story.title[:50]}")
+        return None
+
+    best, best_distance = None, SUMMARY_REUSE_DISTANCE + 1
+    for candidate in cache.values():
+        if "fingerprint" not in candidate:
+            continue
+        distance = fingerprint_distance(candidate["fingerprint"], fingerprint)
+        if distance < best_distance:
+            best, best_distance = candidate, distance
+    return best
+
+
+def _apply_cached_summary(story: Story, cache: dict | None) -> bool:
+    """Fill story.summary from the cache. True on a hit."""
+    if cache is None:
+        return False
+    entry = find_cached_summary(story, cache)
+    if entry is None:
+        return False
+    print(f"  Cache hit: {story.title[:50]}")
+    story.summary = StorySummary(**entry["summary"])
+    # Re-writing the entry marks it recently used (and aliases a near-duplicate
+    # hit under this URL); cached_at is kept so it still expires on time
+    cache[story.canonical_url] = entry
+    return True
+
+
+def _summary_request(story: Story) -> dict:
+    """Keyword arguments for chat.completions.create()."""
     sources_str = " | ".join(s.name for s in story.sources)
     prompt = SUMMARIZE_USER_PROMPT.format(
         title=story.title,
         sources=sources_str,
         content=story.raw_content[:1500],
     )
+    return {
+        "model": SUMMARIZE_MODEL,
+        "messages": [
+            {"role": "system", "content": SUMMARIZE_SYSTEM_PROMPT},
+            {"role": "user", "content": prompt},
+        ],
+        "temperature": 0.3,
+        "response_format": {"type": "json_object"},
+    }
+
+
+def _apply_summary_response(story: Story, response, cache: dict | None) -> None:
+    data = json.loads(response.choices[0].message.content)
+    story.summary = StorySummary(**data)
+    if cache is not None:
+        cache[story.canonical_url] = {
+            "summary": data,
+            "fingerprint": _content_fingerprint(story),
+            "cached_at": datetime.now(tz=timezone.utc).isoformat(),
+        }
+
+
+def summarize_story(story: Story, client: "OpenAI", cache: dict | None = None) -> Story:
+    # Check cache first — skip LLM if we already have a summary for this URL
+    if _apply_cached_summary(story, cache):
+        return story
     try:
-        response = client.chat.completions.create(
-            model="openai/gpt-4o",  # best available on GitHub Models API
-            messages=[
-                {"role": "system", "content": SUMMARIZE_SYSTEM_PROMPT},
-                {"role": "user", "content": prompt},
-            ],
-            temperature=0.3,
-            response_format={"type": "json_object"},
-        )
-        data = json.loads(response.choices[0].message.content)
-        story.summary = StorySummary(**data)
-        if cache is not None:
-            cache[story.canonical_url] = {
-                "summary": data,
-                "cached_at": datetime.now(tz=timezone.utc).isoformat(),
-            }
+        response = create_completion(client, **_summary_request(story))
+        _apply_summary_response(story, response, cache)
+    except Exception as e:
+        print(f"  Warning: summarize failed for '{story.title[:50]}': {e}")
+    return story
+
+
+async def summarize_story_async(story: Story, client: "AsyncOpenAI", cache: dict | None = None) -> Story:
+    """summarize_story() over AsyncOpenAI — same cache semantics, never raises."""
+    if _apply_cached_summary(story, cache):
+        return story
+    try:
+        response = await create_completion_async(client, **_summary_request(story))
+        _apply_summary_response(story, response, cache)
     except Exception as e:
         print(f"  Warning: summarize failed for '{story.title[:50]}': {e}")
     return story
 
 
+async def summarize_stories(
+    stories: list[Story],
+    client: "AsyncOpenAI",
+    cache: dict | None = None,
+    max_concurrency: int = SUMMARIZE_CONCURRENCY,
+) -> list[Story]:
+    """Summarize stories concurrently, at most max_concurrency LLM calls in flight.
+
+    Returns the stories in the order given.
+    """
+    semaphore = asyncio.Semaphore(max(max_concurrency, 1))
+
+    async def bounded(story: Story) -> Story:
+        async with semaphore:
+            return await summarize_story_async(story, client, cache)
+
+    return list(await asyncio.gather(*(bounded(s) for s in stories)))
+
+
 def pick_top3(stories_by_category: dict[str, list[Story]]) -> list[Story]:
     all_stories = [s for stories in stories_by_category.values() for s in stories]
+    now = datetime.now(tz=timezone.utc)
     all_stories.sort(
         key=lambda s: (
-            (s.priority_score or 0) * recency_multiplier(s.published_at),
+            (s.priority_score or 0) * recency_multiplier(s.published_at, now),
             s.source_count,
         ),
         reverse=True,
@@ -113,47 +203,89 @@ def pick_top3(stories_by_category: dict[str, list[Story]]) -> list[Story]:
     return all_stories[:3]
 
 
-def main():
-    client = get_client()
-    cache = load_cache()
-    print(f"  Loaded {len(cache)} cached summaries")
+def pick_category_leads(
+    stories_by_category: dict[str, list[Story]],
+    per_category: int,
+    exclude: list[Story] | None = None,
+) -> list[Story]:
+    """The top per_category stories of each category (list order), skipping excluded ones."""
+    seen = {s.id for s in exclude or []}
+    leads = []
+    for stories in stories_by_category.values():
+        for story in stories[:per_category]:
+            if story.id not in seen:
+                seen.add(story.id)
+                leads.append(story)
+    return leads
+
 
-    ranked_raw = json.loads(Path("data/ranked.json").read_text())
+def summarize_ranked(
+    personal_items: list[Story],
+    enterprise_items: list[Story],
+    client: "AsyncOpenAI",
+    cache: dict | None = None,
+    max_concurrency: int = SUMMARIZE_CONCURRENCY,
+    leads_per_category: int = SUMMARIZE_CATEGORY_LEADS,
+) -> dict:
+    """Summarize the top 3 (and category leads) of the ranked lists.
 
+    Returns the summarized.json payload: top3, categories and enterprise_items
+    (passed through without re-summarising).
+    """
     # Build stories_by_category from flat personal_items list
     stories_by_category: dict[str, list[Story]] = {}
-    for item in ranked_raw.get("personal_items", []):
-        if isinstance(item.get("published_at"), str):
-            item["published_at"] = datetime.fromisoformat(item["published_at"])
-        story = Story(**item)
+    for story in personal_items:
         cat = story.priority_category or "general_significance"
         stories_by_category.setdefault(cat, []).append(story)
 
-    # Pass enterprise items through without re-summarising
-    enterprise_items: list[Story] = []
-    for item in ranked_raw.get("enterprise_items", []):
-        if isinstance(item.get("published_at"), str):
-            item["published_at"] = datetime.fromisoformat(item["published_at"])
-        enterprise_items.append(Story(**item))
-
     top3 = pick_top3(stories_by_category)
-    print("Summarizing top 3 must-reads...")
-    top3 = [summarize_story(s, client, cache) for s in top3]
-
-    save_cache(cache)
-    print(f"  Saved {len(cache)} summaries to cache")
-
-    output = {
-        "top3": [s.model_dump(mode="json") for s in top3],
-        "categories": {
-            cat: [s.model_dump(mode="json") for s in stories]
-            for cat, stories in stories_by_category.items()
-        },
-        "enterprise_items": [s.model_dump(mode="json") for s in enterprise_items],
+    leads = pick_category_leads(stories_by_category, leads_per_category, exclude=top3)
+    print(f"Summarizing top 3 must-reads and {len(leads)} category leads ({max_concurrency} at a time)...")
+    summarized = asyncio.run(summarize_stories(top3 + leads, client, cache, max_concurrency))
+    # Category lists hold the same Story objects, so leads carry their summaries there
+    return {
+        "top3": summarized[:len(top3)],
+        "categories": stories_by_category,
+        "enterprise_items": enterprise_items,
     }
-    Path("data/summarized.json").write_text(json.dumps(output, indent=2, default=str))
+
+
+@stage_metrics("summarize")
+def main():
+    client = get_async_client()
+    max_concurrency = int(os.environ.get("SUMMARIZE_CONCURRENCY", SUMMARIZE_CONCURRENCY))
+    leads_per_category = int(os.environ.get("SUMMARIZE_CATEGORY_LEADS", SUMMARIZE_CATEGORY_LEADS))
+
+    store = open_store()
+    if store:
+        personal_items = store.read_stage("ranked", "personal_items")
+        # Pass enterprise items through without re-summarising
+        enterprise_items = store.read_stage("ranked", "enterprise_items")
+    else:
+        ranked = read_artifact("data/ranked.json", RANKED)
+        personal_items = ranked.get("personal_items", [])
+        # Pass enterprise items through without re-summarising
+        enterprise_items = ranked.get("enterprise_items", [])
+
+    # Close the journal even if summarizing fails (close() also compacts it once stale)
+    with SummaryCache(max_days=CACHE_MAX_DAYS) as cache:
+        print(f"  Loaded {len(cache)} cached summaries")
+        summarized = summarize_ranked(
+            personal_items, enterprise_items, client, cache, max_concurrency, leads_per_category
+        )
+    print(f"  {len(cache)} summaries in cache")
+
+    write_artifact("data/summarized.json", summarized, SUMMARIZED)
     print("  Saved to data/summarized.json")
 
+    if store:
+        with store:
+            store.write_stage("summarized", {
+                "top3": summarized["top3"],
+                "enterprise_items": enterprise_items,
+                **{f"categories/{cat}": stories for cat, stories in summarized["categories"].items()},
+            })
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,155 @@
+"""
+Append-only JSON-lines journal backing the summary cache.
+
+SummaryCache is a dict-like mapping (URL → cache entry) that summarize.py
+uses in place of the summary_cache.json dict. Every write appends one line
+to data/summary_cache.jsonl instead of rewriting the file, and startup
+replays the journal rather than parsing one large document:
+
+    {"key": "<url>", "entry": {"summary": {...}, "fingerprint": ..., "cached_at": ...}}
+    {"key": "<url>", "deleted": true}
+
+Eviction: entries older than max_days (by cached_at) are dropped on load,
+and once more than max_entries are live the least recently written entry is
+deleted — summarize re-writes an entry on every cache hit, so write order is
+use order. close() compacts the journal (rewrites just the live entries,
+atomically) once superseded lines outnumber live ones.
+
+A missing journal is seeded from the legacy summary_cache.json if present.
+"""
+import json
+import os
+from collections import OrderedDict
+from collections.abc import Iterator, MutableMapping
+from datetime import datetime, timezone, timedelta
+from pathlib import Path
+
+SUMMARY_JOURNAL_PATH = Path("data/summary_cache.jsonl")
+LEGACY_CACHE_PATH = Path("data/summary_cache.json")
+SUMMARY_CACHE_MAX_DAYS = 14
+SUMMARY_CACHE_MAX_ENTRIES = 500
+COMPACT_MIN_LINES = 64
+
+
+def _is_fresh(entry: dict, cutoff: datetime) -> bool:
+    try:
+        cached_at = datetime.fromisoformat(entry["cached_at"])
+    except (KeyError, TypeError, ValueError):
+        return False
+    if cached_at.tzinfo is None:
+        cached_at = cached_at.replace(tzinfo=timezone.utc)
+    return cached_at >= cutoff
+
+
+class SummaryCache(MutableMapping):
+    """URL → summary cache entry, persisted as an append-only journal."""
+
+    def __init__(
+        self,
+        path: Path = SUMMARY_JOURNAL_PATH,
+        max_days: int = SUMMARY_CACHE_MAX_DAYS,
+        max_entries: int = SUMMARY_CACHE_MAX_ENTRIES,
+        legacy_path: Path | None = LEGACY_CACHE_PATH,
+    ):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self._cutoff = datetime.now(tz=timezone.utc) - timedelta(days=max_days)
+        self._entries: OrderedDict[str, dict] = OrderedDict()
+        self._lines = 0
+        self._file = None
+        self._torn_tail = False
+
+        if self.path.exists():
+            self._replay()
+        elif legacy_path is not None and Path(legacy_path).exists():
+            self._import_legacy(Path(legacy_path))
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _replay(self) -> None:
+        line = ""
+        with self.path.open() as f:
+            for line in f:
+                self._lines += 1
+                try:
+                    record = json.loads(line)
+                    key = record["key"]
+                except (ValueError, KeyError, TypeError):
+                    continue  # torn write from an interrupted run — skip the line
+                self._entries.pop(key, None)
+                if not record.get("deleted") and _is_fresh(record.get("entry", {}), self._cutoff):
+                    self._entries[key] = record["entry"]
+        # A torn last line has no newline; the next append must not be glued onto it
+        self._torn_tail = bool(line) and not line.endswith("\n")
+
+    def _import_legacy(self, legacy_path: Path) -> None:
+        try:
+            raw = json.loads(legacy_path.read_text())
+        except Exception:
+            return
+        fresh = {k: v for k, v in raw.items() if isinstance(v, dict) and _is_fresh(v, self._cutoff)}
+        for key, entry in sorted(fresh.items(), key=lambda kv: kv[1]["cached_at"]):
+            self[key] = entry
+
+    def _append(self, record: dict) -> None:
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = self.path.open("a")
+            if self._torn_tail:
+                self._file.write("\n")
+                self._torn_tail = False
+        self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
+        self._lines += 1
+
+    def __getitem__(self, key: str) -> dict:
+        return self._entries[key]
+
+    def __setitem__(self, key: str, entry: dict) -> None:
+        self._entries.pop(key, None)
+        self._entries[key] = entry
+        self._append({"key": key, "entry": entry})
+        while len(self._entries) > self.max_entries:
+            oldest, _ = self._entries.popitem(last=False)
+            self._append({"key": oldest, "deleted": True})
+
+    def __delitem__(self, key: str) -> None:
+        del self._entries[key]
+        self._append({"key": key, "deleted": True})
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def needs_compaction(self) -> bool:
+        return self._lines >= COMPACT_MIN_LINES and self._lines > 2 * len(self._entries)
+
+    def compact(self) -> None:
+        """Rewrite the journal with one line per live entry (atomic replace)."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        with tmp.open("w") as f:
+            for key, entry in self._entries.items():
+                f.write(json.dumps({"key": key, "entry": entry}) + "\n")
+        os.replace(tmp, self.path)
+        self._lines = len(self._entries)
+
+    def close(self) -> None:
+        """Flush the journal, compacting it first if it has grown stale."""
+        if self.needs_compaction():
+            self.compact()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "SummaryCache":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
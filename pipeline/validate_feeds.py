@@ -3,9 +3,17 @@ Job 0: Validate all feeds in sources.yaml.
 Outputs:
   - feed_health.json  (full status report)
   - active_sources.json (list of active source names for GitHub Actions matrix)
+
+Sources are checked concurrently on a thread pool. Each check has a hard
+deadline (SOURCE_DEADLINE seconds, covering connect, headers and body) and
+the whole run has an overall budget (OVERALL_BUDGET); anything unfinished
+when the budget runs out is marked skipped.
 """
+import asyncio
 import json
+import os
 import sys
+from concurrent.futures import ThreadPoolExecutor, wait
 import feedparser
 import httpx
 import yaml
@@ -13,46 +21,99 @@ from pathlib import Path
 
 HEADERS = {"User-Agent": "Mozilla/5.0 (compatible; AINewsletterBot/1.0)"}
 
+MAX_WORKERS = 16
+SOURCE_DEADLINE = 15
+OVERALL_BUDGET = 90
+
 
 def load_sources(config_path: str = "sources/sources.yaml") -> list[dict]:
     with open(config_path) as f:
         return yaml.safe_load(f)["sources"]
 
 
-def _check_rss(url: str) -> tuple[bool, str]:
+async def _get(url: str, read_body: bool) -> tuple[int, bytes]:
+    async with httpx.AsyncClient(headers=HEADERS, follow_redirects=True) as client:
+        async with client.stream("GET", url) as r:
+            body = await r.aread() if read_body else b""
+            return r.status_code, body
+
+
+def _get_with_deadline(url: str, deadline: float, read_body: bool = True) -> tuple[int, bytes]:
+    """GET url, giving up once `deadline` seconds have elapsed — connect, headers and body together.
+
+    httpx timeouts apply to each phase (and each read) separately, so the
+    request runs on its own event loop under asyncio.wait_for, which cancels
+    it wherever it is. The loop is closed without waiting on its executor: a
+    stuck DNS lookup is abandoned, not waited for.
+    """
+    loop = asyncio.new_event_loop()
     try:
-        feed = feedparser.parse(url)
-        if feed.bozo and not feed.entries:
-            return False, "parse error"
-        if not feed.entries:
-            return False, "no entries"
-        return True, f"{len(feed.entries)} entries"
+        return loop.run_until_complete(asyncio.wait_for(_get(url, read_body), deadline))
+    except TimeoutError:
+        raise TimeoutError(f"deadline {deadline:g}s exceeded") from None
+    finally:
+        loop.close()
+
+
+def feed_verdict(feed) -> tuple[bool, str]:
+    """Health verdict for a parsed feed: usable only if it has entries."""
+    if feed.bozo and not feed.entries:
+        return False, "parse error"
+    if not feed.entries:
+        return False, "no entries"
+    return True, f"{len(feed.entries)} entries"
+
+
+def _check_rss(url: str, deadline: float = SOURCE_DEADLINE) -> tuple[bool, str]:
+    try:
+        status, body = _get_with_deadline(url, deadline)
+        if status != 200:
+            return False, f"HTTP {status}"
+        return feed_verdict(feedparser.parse(body))
     except Exception as e:
         return False, str(e)[:80]
 
 
-def _check_http(url: str) -> tuple[bool, str]:
+def _check_http(url: str, deadline: float = SOURCE_DEADLINE) -> tuple[bool, str]:
     try:
-        r = httpx.get(url, headers=HEADERS, timeout=15, follow_redirects=True)
-        if r.status_code == 200:
-            return True, f"HTTP {r.status_code}"
-        return False, f"HTTP {r.status_code}"
+        status, _ = _get_with_deadline(url, deadline, read_body=False)
+        if status == 200:
+            return True, f"HTTP {status}"
+        return False, f"HTTP {status}"
     except Exception as e:
         return False, str(e)[:80]
 
 
-def validate_sources(sources: list[dict]) -> list[dict]:
+def _check_source(source: dict, deadline: float) -> tuple[bool, str]:
+    stype = source["type"]
+    url = source["url"]
+
+    if stype in ("rss", "reddit"):
+        return _check_rss(url, deadline)
+    elif stype in ("scrape", "api"):
+        return _check_http(url, deadline)
+    return False, f"unknown type: {stype}"
+
+
+def validate_sources(
+    sources: list[dict],
+    max_workers: int = MAX_WORKERS,
+    source_deadline: float = SOURCE_DEADLINE,
+    overall_budget: float = OVERALL_BUDGET,
+) -> list[dict]:
+    """Check every source concurrently. Results keep the order of `sources`."""
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    futures = [executor.submit(_check_source, source, source_deadline) for source in sources]
+    wait(futures, timeout=overall_budget)
+    # Workers are bounded by their own deadline, so never block on stragglers here
+    executor.shutdown(wait=False, cancel_futures=True)
+
     results = []
-    for source in sources:
-        stype = source["type"]
-        url = source["url"]
-
-        if stype in ("rss", "reddit"):
-            ok, detail = _check_rss(url)
-        elif stype in ("scrape", "api"):
-            ok, detail = _check_http(url)
+    for source, future in zip(sources, futures):
+        if future.done() and not future.cancelled():
+            ok, detail = future.result()
         else:
-            ok, detail = False, f"unknown type: {stype}"
+            ok, detail = False, f"validation budget ({overall_budget:g}s) exceeded"
 
         results.append({
             **source,
@@ -64,11 +125,8 @@ def validate_sources(sources: list[dict]) -> list[dict]:
     return results
 
 
-def main():
-    sources = load_sources()
-    print(f"\nValidating {len(sources)} sources...\n")
-    results = validate_sources(sources)
-
+def write_health_report(results: list[dict]) -> list[str]:
+    """Write feed_health.json, active_sources.json and the Actions output. Returns active names."""
     active = [r["name"] for r in results if r["status"] == "active"]
     skipped = [r["name"] for r in results if r["status"] == "skipped"]
 
@@ -81,11 +139,18 @@ def main():
 
     # Write as GitHub Actions output for matrix strategy
     active_json = json.dumps(active)
-    import os
     output_file = Path(os.environ.get("GITHUB_OUTPUT", "/dev/null"))
     with open(output_file, "a") as f:
         f.write(f"active_sources={active_json}\n")
+    return active
+
+
+def main():
+    sources = load_sources()
+    print(f"\nValidating {len(sources)} sources...\n")
+    results = validate_sources(sources)
 
+    active = write_health_report(results)
     if not active:
         print("ERROR: No active sources found.", file=sys.stderr)
         sys.exit(1)
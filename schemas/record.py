@@ -0,0 +1,131 @@
+"""
+Compact in-pipeline story record.
+
+Story is a pydantic model: constructing one validates every field and
+builds a StorySource model per source, which is most of the cost of
+loading a stage's JSON. StoryRecord carries the same fields in __slots__
+(sources as plain (name, url) tuples, the summary as a plain dict) with no
+validation, for the bulk steps that touch every story — the age filter,
+dedup and prescore sort — so only the stories that survive them are
+validated, via to_story(), on the way to the next stage's output.
+
+Records duck-type the Story attributes those steps read: id, title,
+canonical_url, sources (items with .name / .url), published_at and
+source_count.
+"""
+import hashlib
+from datetime import datetime
+from typing import NamedTuple, TypeVar
+from schemas.story import Story, StorySource
+
+
+class SourceRef(NamedTuple):
+    name: str
+    url: str
+
+
+class StoryRecord:
+    __slots__ = (
+        "id", "title", "canonical_url", "sources", "published_at", "raw_content",
+        "priority_category", "priority_score", "sdlc_tags", "summary",
+    )
+
+    def __init__(
+        self,
+        id: str,
+        title: str,
+        canonical_url: str,
+        sources: list[SourceRef],
+        published_at: datetime,
+        raw_content: str,
+        priority_category: str | None = None,
+        priority_score: int | None = None,
+        sdlc_tags: list[str] | None = None,
+        summary: dict | None = None,
+    ):
+        self.id = id
+        self.title = title
+        self.canonical_url = canonical_url
+        self.sources = sources
+        self.published_at = published_at
+        self.raw_content = raw_content
+        self.priority_category = priority_category
+        self.priority_score = priority_score
+        self.sdlc_tags = sdlc_tags if sdlc_tags is not None else []
+        self.summary = summary
+
+    @property
+    def source_count(self) -> int:
+        return len(self.sources)
+
+    def __repr__(self) -> str:
+        return f"StoryRecord(id={self.id[:12]!r}, title={self.title!r}, sources={len(self.sources)})"
+
+    @classmethod
+    def from_dict(cls, item: dict) -> "StoryRecord":
+        """Record from a serialized Story (model_dump(mode="json") output). Not validated."""
+        published_at = item["published_at"]
+        if isinstance(published_at, str):
+            published_at = datetime.fromisoformat(published_at)
+        return cls(
+            id=item["id"],
+            title=item["title"],
+            canonical_url=item["canonical_url"],
+            sources=[SourceRef(s["name"], s["url"]) for s in item["sources"]],
+            published_at=published_at,
+            raw_content=item["raw_content"],
+            priority_category=item.get("priority_category"),
+            priority_score=item.get("priority_score"),
+            sdlc_tags=list(item.get("sdlc_tags") or []),
+            summary=item.get("summary"),
+        )
+
+    @classmethod
+    def from_story(cls, story: Story) -> "StoryRecord":
+        return cls(
+            id=story.id,
+            title=story.title,
+            canonical_url=story.canonical_url,
+            sources=[SourceRef(s.name, s.url) for s in story.sources],
+            published_at=story.published_at,
+            raw_content=story.raw_content,
+            priority_category=story.priority_category,
+            priority_score=story.priority_score,
+            sdlc_tags=list(story.sdlc_tags),
+            summary=story.summary.model_dump() if story.summary else None,
+        )
+
+    def to_story(self) -> Story:
+        """Validated Story with the same fields."""
+        return Story(
+            id=self.id,
+            title=self.title,
+            canonical_url=self.canonical_url,
+            sources=[StorySource(name=s.name, url=s.url) for s in self.sources],
+            published_at=self.published_at,
+            raw_content=self.raw_content,
+            priority_category=self.priority_category,
+            priority_score=self.priority_score,
+            sdlc_tags=list(self.sdlc_tags),
+            summary=self.summary,
+        )
+
+    def with_url(self, url: str) -> "StoryRecord":
+        """Copy re-keyed on url; sources that pointed at the old URL follow it."""
+        original = self.canonical_url
+        return StoryRecord(
+            id=hashlib.sha256(url.encode()).hexdigest(),
+            title=self.title,
+            canonical_url=url,
+            sources=[SourceRef(s.name, url) if s.url == original else s for s in self.sources],
+            published_at=self.published_at,
+            raw_content=self.raw_content,
+            priority_category=self.priority_category,
+            priority_score=self.priority_score,
+            sdlc_tags=list(self.sdlc_tags),
+            summary=self.summary,
+        )
+
+
+# Either representation, for steps that work on both
+StoryT = TypeVar("StoryT", Story, StoryRecord)
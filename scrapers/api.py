@@ -1,10 +1,26 @@
+import re
 import httpx
 import feedparser
 from datetime import datetime, timezone, timedelta
 from schemas.story import Story
+from scrapers.http_cache import cached_stories, conditional_get, is_not_modified, remember
 
 HEADERS = {"User-Agent": "Mozilla/5.0 (compatible; AINewsletterBot/1.0)"}
 
+# Link posts carry the article as '<a href="...">[link]</a>' in the entry summary
+_REDDIT_OUTBOUND = re.compile(r"""<a\s+href=["']([^"']+)["'][^>]*>\s*\[link\]\s*</a>""", re.IGNORECASE)
+
+
+def _reddit_outbound_link(content: str) -> str | None:
+    """Article URL of a Reddit link post, or None for self posts."""
+    match = _REDDIT_OUTBOUND.search(content)
+    if not match:
+        return None
+    href = match.group(1).replace("&amp;", "&")
+    if not href.startswith("http") or "reddit.com" in href or "redd.it" in href:
+        return None
+    return href
+
 
 def fetch_hackernews(url: str, params: dict) -> list[Story]:
     try:
@@ -13,7 +29,11 @@ def fetch_hackernews(url: str, params: dict) -> list[Story]:
         data = response.json()
     except Exception:
         return []
+    return parse_hackernews(data)
 
+
+def parse_hackernews(data: dict) -> list[Story]:
+    """Build stories from an Algolia HN search response body."""
     stories = []
     for hit in data.get("hits", []):
         title = hit.get("title", "")
@@ -43,10 +63,30 @@ def fetch_hackernews(url: str, params: dict) -> list[Story]:
     return stories
 
 
-def fetch_reddit(source_name: str, url: str, max_age_days: int = 7) -> list[Story]:
-    feedparser.USER_AGENT = HEADERS["User-Agent"]
-    feed = feedparser.parse(url)
+def fetch_reddit(
+    source_name: str,
+    url: str,
+    max_age_days: int = 7,
+    cache: dict | None = None,
+) -> list[Story]:
+    if cache is None:
+        feedparser.USER_AGENT = HEADERS["User-Agent"]
+        feed = feedparser.parse(url)
+        return parse_reddit(feed, source_name, max_age_days)
+
+    try:
+        response = conditional_get(url, cache, HEADERS)
+    except Exception:
+        return []
+    if is_not_modified(cache, url, response):
+        return cached_stories(cache, url, max_age_days)
+    stories = parse_reddit(feedparser.parse(response.content), source_name, max_age_days)
+    remember(cache, url, response, stories)
+    return stories
+
 
+def parse_reddit(feed, source_name: str, max_age_days: int = 7) -> list[Story]:
+    """Build stories from an already-parsed Reddit RSS feed."""
     if feed.bozo and not feed.entries:
         return []
 
@@ -59,6 +99,8 @@ def fetch_reddit(source_name: str, url: str, max_age_days: int = 7) -> list[Stor
 
         title = getattr(entry, "title", "") or ""
         content = getattr(entry, "summary", "") or ""
+        # Point link posts at the article so they dedup with other sources' copies
+        link = _reddit_outbound_link(content) or link
 
         published_at = None
         for attr in ("published_parsed", "updated_parsed"):
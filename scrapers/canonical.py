@@ -0,0 +1,311 @@
+"""
+URL canonicalization and redirect resolution.
+
+canonicalize_url() rewrites a story link to one stable form so the same
+article reached through different links dedups by URL:
+  - lowercase scheme and host, no default port, no fragment
+  - tracking parameters (utm_*, fbclid, gclid, ...) removed, the rest sorted;
+    generic names (ref, si, share, ...) only on hosts that use them for
+    tracking, since elsewhere they can select the content
+  - host aliases (old.reddit.com → www.reddit.com, mobile.twitter.com → twitter.com)
+  - AMP variants (amp. subdomain, ?amp=1, ?outputType=amp, google.com/amp/s/...)
+    mapped to the article; an /amp path suffix only on AMP_PATH_HOSTS or next
+    to an AMP query toggle, since elsewhere /amp can be a real page
+  - redirect wrappers that carry the target in the URL (google.com/url?q=,
+    TLDR's tracking links, out.reddit.com, l.facebook.com) unwrapped
+  - trailing slash dropped from non-root paths
+
+The scheme is kept — some sites are http-only, and this is the link readers
+get. url_key() drops it, so http:// and https:// copies still dedup.
+
+Shorteners and feed proxies (t.co, bit.ly, feedproxy.google.com, ...) only
+reveal their target over HTTP. resolve_redirects() follows those
+concurrently, reads <link rel="canonical"> from the landing page when it
+has one, and remembers the answer in data/redirect_cache.json.
+"""
+import asyncio
+import hashlib
+import json
+import re
+from datetime import datetime, timezone, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING
+from urllib.parse import parse_qsl, unquote, urlencode, urljoin, urlsplit, urlunsplit
+from schemas.record import StoryRecord
+from schemas.story import Story, StorySource
+
+if TYPE_CHECKING:
+    import httpx
+
+REDIRECT_CACHE_PATH = Path("data/redirect_cache.json")
+REDIRECT_CACHE_MAX_DAYS = 30
+RESOLVE_CONCURRENCY = 8
+RESOLVE_TIMEOUT = 10
+RESOLVE_MAX_BYTES = 64 * 1024   # <link rel=canonical> sits in <head>
+
+HEADERS = {"User-Agent": "Mozilla/5.0 (compatible; AINewsletterBot/1.0)"}
+
+TRACKING_PARAMS = frozenset({
+    "fbclid", "gclid", "dclid", "msclkid", "yclid", "igshid", "mc_cid", "mc_eid",
+    "_hsenc", "_hsmi", "mkt_tok", "ref_src", "ref_url", "cmpid", "ncid",
+    "sr_share", "s_kwcid", "spm",
+})
+TRACKING_PREFIXES = ("utm_", "pk_", "mtm_")
+
+# Generic parameter names, dropped only on hosts known to use them for tracking
+# (keyed on the host after HOST_ALIASES)
+HOST_TRACKING_PARAMS = {
+    "www.youtube.com": frozenset({"si", "feature", "pp"}),
+    "youtu.be": frozenset({"si", "feature"}),
+    "open.spotify.com": frozenset({"si"}),
+    "twitter.com": frozenset({"s", "t", "ref"}),
+    "x.com": frozenset({"s", "t", "ref"}),
+    "www.reddit.com": frozenset({"share_id", "ref", "ref_source"}),
+    "www.linkedin.com": frozenset({"trk", "trackingid", "lipi"}),
+    "www.producthunt.com": frozenset({"ref"}),
+    "medium.com": frozenset({"source"}),
+}
+
+# Parameters that switch a page to its AMP rendering: name → values that do
+AMP_TOGGLES = {"amp": frozenset({"", "1", "true"}), "outputtype": frozenset({"amp"})}
+
+# Publishers that serve the AMP copy of /article at /article/amp (the WordPress AMP plugin)
+AMP_PATH_HOSTS = frozenset({
+    "techcrunch.com", "venturebeat.com", "siliconangle.com", "the-decoder.com",
+    "www.kdnuggets.com", "www.marktechpost.com",
+})
+
+HOST_ALIASES = {
+    "reddit.com": "www.reddit.com",
+    "old.reddit.com": "www.reddit.com",
+    "new.reddit.com": "www.reddit.com",
+    "np.reddit.com": "www.reddit.com",
+    "mobile.twitter.com": "twitter.com",
+    "www.twitter.com": "twitter.com",
+    "m.youtube.com": "www.youtube.com",
+    "youtube.com": "www.youtube.com",
+    "mobile.x.com": "x.com",
+    "www.x.com": "x.com",
+    "en.m.wikipedia.org": "en.wikipedia.org",
+}
+
+# Hosts whose links only say where they go after an HTTP round trip
+RESOLVE_HOSTS = frozenset({
+    "t.co", "bit.ly", "buff.ly", "ow.ly", "lnkd.in", "tinyurl.com", "dlvr.it",
+    "trib.al", "ift.tt", "feedproxy.google.com", "feeds.feedburner.com",
+    "news.google.com", "tracking.tldrnewsletter.com", "links.tldrnewsletter.com",
+})
+
+# Redirect wrappers: host → query parameters that hold the target URL
+_WRAPPER_PARAMS = {
+    "www.google.com": ("q", "url"),
+    "google.com": ("q", "url"),
+    "out.reddit.com": ("url",),
+    "l.facebook.com": ("u",),
+    "lm.facebook.com": ("u",),
+    "l.instagram.com": ("u",),
+    "www.linkedin.com": ("url",),
+    "slack-redir.net": ("url",),
+}
+
+_CANONICAL_LINK = re.compile(r"<link\b[^>]*>", re.IGNORECASE)
+_REL_CANONICAL = re.compile(r"""\brel\s*=\s*["']?canonical\b""", re.IGNORECASE)
+_HREF = re.compile(r"""\bhref\s*=\s*["']([^"']+)["']""", re.IGNORECASE)
+
+
+def _unwrap(url: str) -> str | None:
+    """Target URL embedded in a known redirect wrapper, or None."""
+    parts = urlsplit(url)
+    host = parts.netloc.lower()
+
+    # Google AMP viewer: https://www.google.com/amp/s/example.com/article
+    if host in ("www.google.com", "google.com") and parts.path.startswith("/amp/"):
+        rest = parts.path[len("/amp/"):]
+        return "https://" + rest[2:] if rest.startswith("s/") else "http://" + rest
+
+    # TLDR newsletter: https://tracking.tldrnewsletter.com/CL0/<urlencoded target>/1/...
+    if host.endswith("tldrnewsletter.com") and parts.path.startswith("/CL0/"):
+        target = unquote(parts.path[len("/CL0/"):].split("/", 1)[0])
+        return target if target.startswith("http") else None
+
+    for param in _WRAPPER_PARAMS.get(host, ()):
+        for key, value in parse_qsl(parts.query):
+            if key == param and value.startswith(("http://", "https://")):
+                return value
+    return None
+
+
+def canonicalize_url(url: str) -> str:
+    """Stable form of url for dedup (see module docstring). Non-HTTP URLs pass through."""
+    url = url.strip()
+    for _ in range(3):   # wrappers occasionally nest
+        target = _unwrap(url)
+        if target is None:
+            break
+        url = target
+
+    parts = urlsplit(url)
+    if parts.scheme.lower() not in ("http", "https") or not parts.hostname:
+        return url
+
+    host = parts.hostname.lower()
+    # amp.example.com → example.com, but amp.dev is a domain of its own
+    if host.startswith("amp.") and host.count(".") >= 2:
+        host = host[len("amp."):]
+    host = HOST_ALIASES.get(host, host)
+    port = parts.port
+    netloc = host if port in (None, 80, 443) else f"{host}:{port}"
+
+    params = parse_qsl(parts.query, keep_blank_values=True)
+    path = parts.path or "/"
+    if host in AMP_PATH_HOSTS or any(v.lower() in AMP_TOGGLES.get(k.lower(), ()) for k, v in params):
+        for suffix in ("/amp/", "/amp", ".amp"):
+            if path.endswith(suffix) and len(path) > len(suffix):
+                path = path[: -len(suffix)]
+                break
+    if len(path) > 1:
+        path = path.rstrip("/") or "/"
+
+    host_params = HOST_TRACKING_PARAMS.get(host, frozenset())
+    query = sorted((k, v) for k, v in params if not _is_tracking_param(k.lower(), v, host_params))
+    return urlunsplit((parts.scheme.lower(), netloc, path, urlencode(query), ""))
+
+
+def _is_tracking_param(key: str, value: str, host_params: frozenset[str]) -> bool:
+    if key in TRACKING_PARAMS or key in host_params or key.startswith(TRACKING_PREFIXES):
+        return True
+    return value.lower() in AMP_TOGGLES.get(key, ())
+
+
+def url_key(url: str) -> str:
+    """Dedup key for a canonical URL: http:// and https:// copies of a page match."""
+    scheme, sep, rest = url.partition("://")
+    return rest if sep and scheme in ("http", "https") else url
+
+
+def needs_resolution(url: str) -> bool:
+    """True for shortener / feed-proxy links whose target is only known over HTTP."""
+    return (urlsplit(url).hostname or "").lower() in RESOLVE_HOSTS
+
+
+def extract_canonical_link(html: str, base_url: str) -> str | None:
+    """href of <link rel="canonical"> in html, made absolute against base_url."""
+    for tag in _CANONICAL_LINK.findall(html):
+        if _REL_CANONICAL.search(tag):
+            href = _HREF.search(tag)
+            if href:
+                return urljoin(base_url, href.group(1).strip())
+    return None
+
+
+def load_redirect_cache(path: Path = REDIRECT_CACHE_PATH) -> dict:
+    """Load resolved redirects, evicting entries older than REDIRECT_CACHE_MAX_DAYS."""
+    if not path.exists():
+        return {}
+    try:
+        raw = json.loads(path.read_text())
+        cutoff = datetime.now(tz=timezone.utc) - timedelta(days=REDIRECT_CACHE_MAX_DAYS)
+        result = {}
+        for url, entry in raw.items():
+            try:
+                resolved_at = datetime.fromisoformat(entry["resolved_at"])
+                if resolved_at.tzinfo is None:
+                    resolved_at = resolved_at.replace(tzinfo=timezone.utc)
+                if resolved_at >= cutoff:
+                    result[url] = entry
+            except (KeyError, ValueError):
+                pass  # skip malformed entries rather than discarding the whole cache
+        return result
+    except Exception:
+        return {}
+
+
+def save_redirect_cache(cache: dict, path: Path = REDIRECT_CACHE_PATH) -> None:
+    """Persist resolved redirects to disk."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(cache))
+
+
+async def _resolve_one(url: str, client: "httpx.AsyncClient", semaphore: asyncio.Semaphore) -> str | None:
+    """Follow url's redirects; prefer the landing page's rel=canonical. None on failure."""
+    try:
+        async with semaphore:
+            async with client.stream("GET", url) as response:
+                if not response.is_success:
+                    return None
+                final_url = str(response.url)
+                body = b""
+                if "html" in response.headers.get("content-type", ""):
+                    async for chunk in response.aiter_bytes():
+                        body += chunk
+                        if len(body) >= RESOLVE_MAX_BYTES or b"</head>" in body.lower():
+                            break
+        canonical = extract_canonical_link(body.decode("utf-8", errors="replace"), final_url)
+        return canonical or final_url
+    except Exception as e:
+        print(f"  Warning: could not resolve {url[:80]}: {str(e)[:80]}")
+        return None
+
+
+async def resolve_redirects(
+    urls: list[str],
+    cache: dict | None = None,
+    max_concurrency: int = RESOLVE_CONCURRENCY,
+    timeout: float = RESOLVE_TIMEOUT,
+) -> dict[str, str]:
+    """Map each shortener / proxy URL in urls to its canonical target.
+
+    Other URLs are ignored. Answers are read from and written to cache;
+    URLs that fail to resolve are left out (and retried next run).
+    """
+    resolved: dict[str, str] = {}
+    pending = []
+    for url in dict.fromkeys(urls):
+        if not needs_resolution(url):
+            continue
+        if cache is not None and url in cache:
+            resolved[url] = cache[url]["resolved"]
+        else:
+            pending.append(url)
+    if not pending:
+        return resolved
+
+    import httpx   # normalize only needs it when there is something to resolve
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+    async with httpx.AsyncClient(timeout=timeout, follow_redirects=True, headers=HEADERS) as client:
+        targets = await asyncio.gather(*(_resolve_one(u, client, semaphore) for u in pending))
+
+    now = datetime.now(tz=timezone.utc).isoformat()
+    for url, target in zip(pending, targets):
+        if target is None:
+            continue
+        target = canonicalize_url(target)
+        resolved[url] = target
+        if cache is not None:
+            cache[url] = {"resolved": target, "resolved_at": now}
+    return resolved
+
+
+def canonicalize_story(
+    story: Story | StoryRecord,
+    resolved: dict[str, str] | None = None,
+) -> Story | StoryRecord:
+    """Story (or record) with canonical_url (and its id) rewritten to the canonical form.
+
+    Source links that pointed at the old URL follow it.
+    """
+    original = story.canonical_url
+    url = canonicalize_url((resolved or {}).get(original, original))
+    if url == original:
+        return story
+    if isinstance(story, StoryRecord):
+        return story.with_url(url)
+    return story.model_copy(update={
+        "id": hashlib.sha256(url.encode()).hexdigest(),
+        "canonical_url": url,
+        "sources": [
+            StorySource(name=s.name, url=url) if s.url == original else s
+            for s in story.sources
+        ],
+    })
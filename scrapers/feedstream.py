@@ -0,0 +1,213 @@
+"""
+Streaming feed parser: RSS 2.0, RSS 1.0 (RDF), Atom and JSON Feed.
+
+feedparser builds every entry of a document (full content blobs included)
+before parse_rss() throws most of them away against the age cutoff. Here
+the XML is fed to an incremental pull parser in chunks and each <item> /
+<entry> becomes a Story as soon as it closes. Once a feed has shown itself
+to be newest-first and STOP_AFTER_OLD entries in a row fall past the
+cutoff, parsing stops — the rest of a multi-megabyte feed is never read.
+The count only starts after the first in-window entry, so old entries
+pinned to the top of a feed don't end it before the new ones.
+
+Anything the pull parser can't handle (HTML entities in XML, broken
+markup, an HTML page instead of a feed) raises FeedStreamError;
+scrapers.rss.parse_feed() then falls back to feedparser.
+"""
+import json
+import xml.etree.ElementTree as ET
+from collections.abc import Iterable, Iterator
+from datetime import datetime, timezone, timedelta
+from email.utils import parsedate_to_datetime
+from schemas.story import Story
+from scrapers.keywords import keyword_matcher
+
+CHUNK_SIZE = 64 * 1024
+STOP_AFTER_OLD = 3
+
+_ATOM = "http://www.w3.org/2005/Atom"
+_CONTENT = "http://purl.org/rss/1.0/modules/content/"
+_DC = "http://purl.org/dc/elements/1.1/"
+_RSS1 = "http://purl.org/rss/1.0/"
+
+
+class FeedStreamError(ValueError):
+    """The document can't be streamed — use feedparser instead."""
+
+
+def _split(tag: str) -> tuple[str, str]:
+    """'{ns}local' → (ns, local)."""
+    if tag.startswith("{"):
+        ns, local = tag[1:].split("}", 1)
+        return ns, local
+    return "", tag
+
+
+def _text(elem: ET.Element | None) -> str:
+    return "".join(elem.itertext()).strip() if elem is not None else ""
+
+
+def _parse_date(value: str) -> datetime | None:
+    """RFC 822 (RSS) or ISO 8601 (Atom, JSON Feed, dc:date) → aware UTC datetime."""
+    value = value.strip()
+    if not value:
+        return None
+    try:
+        dt = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        try:
+            dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+def _rss_fields(item: ET.Element) -> tuple[str, str, str, datetime | None]:
+    """(link, title, content, published) of an RSS 2.0 / 1.0 <item>."""
+    fields: dict[tuple[str, str], ET.Element] = {}
+    for child in item:
+        fields.setdefault(_split(child.tag), child)
+
+    def get(local: str, ns: str | None = None) -> ET.Element | None:
+        if ns is not None:
+            return fields.get((ns, local))
+        return fields.get(("", local), fields.get((_RSS1, local)))
+
+    link = _text(get("link"))
+    if not link:
+        atom_link = get("link", _ATOM)
+        link = atom_link.get("href", "") if atom_link is not None else ""
+    if not link:
+        guid = get("guid")
+        if guid is not None and guid.get("isPermaLink", "true") != "false" and _text(guid).startswith("http"):
+            link = _text(guid)
+
+    content = _text(get("description")) or _text(get("encoded", _CONTENT))
+    published = None
+    for date_elem in (get("pubDate"), get("date", _DC), get("published", _ATOM), get("updated", _ATOM)):
+        published = _parse_date(_text(date_elem)) if date_elem is not None else None
+        if published:
+            break
+    return link, _text(get("title")), content, published
+
+
+def _atom_fields(entry: ET.Element) -> tuple[str, str, str, datetime | None]:
+    """(link, title, content, published) of an Atom <entry>."""
+    link = ""
+    for child in entry.findall(f"{{{_ATOM}}}link"):
+        if child.get("rel", "alternate") == "alternate" and child.get("href"):
+            link = child.get("href")
+            break
+    content = _text(entry.find(f"{{{_ATOM}}}summary")) or _text(entry.find(f"{{{_ATOM}}}content"))
+    published = None
+    for local in ("published", "updated"):
+        published = _parse_date(_text(entry.find(f"{{{_ATOM}}}{local}")))
+        if published:
+            break
+    return link, _text(entry.find(f"{{{_ATOM}}}title")), content, published
+
+
+def _iter_xml_entries(chunks: Iterable[bytes]) -> Iterator[tuple[str, str, str, datetime | None]]:
+    parser = ET.XMLPullParser(events=("start", "end"))
+    root_seen = False
+    try:
+        for chunk in chunks:
+            parser.feed(chunk)
+            for event, elem in parser.read_events():
+                ns, local = _split(elem.tag)
+                if event == "start":
+                    if not root_seen:
+                        root_seen = True
+                        if local not in ("rss", "RDF", "feed"):
+                            raise FeedStreamError(f"not a feed: <{local}>")
+                    continue
+                if local == "item":
+                    yield _rss_fields(elem)
+                    elem.clear()
+                elif local == "entry" and ns == _ATOM:
+                    yield _atom_fields(elem)
+                    elem.clear()
+        parser.close()
+    except ET.ParseError as e:
+        raise FeedStreamError(str(e)) from e
+
+
+def _iter_json_feed_entries(data: bytes) -> Iterator[tuple[str, str, str, datetime | None]]:
+    try:
+        doc = json.loads(data)
+    except ValueError as e:
+        raise FeedStreamError(str(e)) from e
+    if not isinstance(doc, dict) or not str(doc.get("version", "")).startswith("https://jsonfeed.org/version/"):
+        raise FeedStreamError("not a JSON Feed")
+    for item in doc.get("items", []):
+        content = item.get("summary") or item.get("content_html") or item.get("content_text") or ""
+        published = _parse_date(item.get("date_published") or item.get("date_modified") or "")
+        yield item.get("url") or item.get("external_url") or "", item.get("title") or "", content, published
+
+
+def _chunks(data: bytes | Iterable[bytes]) -> Iterable[bytes]:
+    if isinstance(data, (bytes, bytearray)):
+        return (data[i:i + CHUNK_SIZE] for i in range(0, len(data), CHUNK_SIZE))
+    return data
+
+
+def iter_feed_stories(
+    data: bytes | Iterable[bytes],
+    source_name: str,
+    filter_keywords: list[str] | None = None,
+    max_age_days: int = 7,
+    stats: dict | None = None,
+) -> Iterator[Story]:
+    """Yield stories from a feed document (bytes or an iterable of byte chunks).
+
+    Same rules as parse_rss(). Raises FeedStreamError for input that needs
+    feedparser. stats, if given, receives "entries" (entries read) and
+    "stopped_early".
+    """
+    stats = stats if stats is not None else {}
+    stats.update(entries=0, stopped_early=False)
+
+    if isinstance(data, (bytes, bytearray)) and data.lstrip()[:1] == b"{":
+        entries = _iter_json_feed_entries(data)
+    else:
+        entries = _iter_xml_entries(_chunks(data))
+
+    cutoff = datetime.now(tz=timezone.utc) - timedelta(days=max_age_days)
+    keywords = keyword_matcher(filter_keywords)
+    previous: datetime | None = None
+    newest_first = True
+    seen_fresh = False
+    consecutive_old = 0
+
+    for link, title, content, published_at in entries:
+        stats["entries"] += 1
+        # Skip entries with no link or no parseable date — same as parse_rss()
+        if not link or published_at is None:
+            continue
+
+        if previous is not None and published_at > previous:
+            newest_first = False
+        previous = published_at
+
+        if published_at < cutoff:
+            consecutive_old += 1
+            if newest_first and seen_fresh and consecutive_old >= STOP_AFTER_OLD:
+                stats["stopped_early"] = True
+                return
+            continue
+        consecutive_old = 0
+        seen_fresh = True
+
+        if keywords and not keywords.search(title + " " + content):
+            continue
+
+        yield Story.from_url(
+            url=link,
+            title=title,
+            source_name=source_name,
+            published_at=published_at,
+            raw_content=content[:2000],
+        )
+
@@ -1,14 +1,57 @@
+"""
+HTML listing-page scraper.
+
+Pages are parsed from the raw response bytes with the fastest tree builder
+installed: lxml when available, else the stdlib html.parser (HTML_PARSER
+overrides the choice). Only the part of the page that can hold stories is
+built into a tree — a SoupStrainer keeps the elements matching
+selectors["list"] (when that selector doesn't depend on ancestors or
+siblings), or the generic fallback's candidates, and the parser discards
+everything else as it goes.
+"""
+import importlib.util
+import os
+import re
+from functools import lru_cache
 import httpx
 from datetime import datetime, timezone
 from urllib.parse import urljoin
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from schemas.story import Story
+from scrapers.keywords import keyword_matcher
+from scrapers.http_cache import cached_stories, conditional_get, is_not_modified, remember
 
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (compatible; AINewsletterBot/1.0)",
     "Accept": "text/html,application/xhtml+xml",
 }
 
+# Generic fallback: <article>/<div> whose class mentions one of these
+_CANDIDATE_TAGS = frozenset({"article", "div"})
+_CANDIDATE_CLASS = re.compile("post|article|blog|entry|item", re.IGNORECASE)
+_HEADING_TAGS = frozenset({"h2", "h3"})
+
+# A compound selector the parse scope can evaluate on one tag's own name and
+# attributes: tag, .class, #id and [attr], [attr op value] parts, no
+# combinators or pseudo-classes (those need the element's ancestors/siblings)
+_COMPOUND = re.compile(
+    r"""(?P<tag>[a-zA-Z][\w-]*|\*)?(?P<parts>(?:\.[\w-]+|\#[\w-]+|\[\s*[\w-]+\s*"""
+    r"""(?:[~|^$*]?=\s*(?:"[^"]*"|'[^']*'|[\w-]+)\s*)?\])*)"""
+)
+_COMPOUND_PART = re.compile(
+    r"""\.(?P<cls>[\w-]+)|\#(?P<id>[\w-]+)|\[\s*(?P<attr>[\w-]+)\s*"""
+    r"""(?:(?P<op>[~|^$*]?=)\s*(?:"(?P<dq>[^"]*)"|'(?P<sq>[^']*)'|(?P<bare>[\w-]+))\s*)?\]"""
+)
+
+
+def _default_backend() -> str:
+    if os.environ.get("HTML_PARSER"):
+        return os.environ["HTML_PARSER"]
+    return "lxml" if importlib.util.find_spec("lxml") is not None else "html.parser"
+
+
+HTML_BACKEND = _default_backend()
+
 
 def _parse_date(text: str | None) -> datetime:
     """Best-effort date parse, falls back to now()."""
@@ -22,6 +65,97 @@ def _parse_date(text: str | None) -> datetime:
         return datetime.now(tz=timezone.utc)
 
 
+def _attr_value(attrs: dict, name: str) -> str | None:
+    value = attrs.get(name)
+    return " ".join(value) if isinstance(value, list) else value
+
+
+def _attr_matches(op: str | None, expected: str, actual: str | None) -> bool:
+    """CSS attribute-selector semantics for [name], [name=v], [name~=v], ..."""
+    if actual is None:
+        return False
+    if op is None:
+        return True
+    if op == "=":
+        return actual == expected
+    if op == "~=":
+        return expected in actual.split()
+    if op == "|=":
+        return actual == expected or actual.startswith(expected + "-")
+    if not expected:
+        return False  # ^=, $= and *= with an empty value never match
+    if op == "^=":
+        return actual.startswith(expected)
+    if op == "$=":
+        return actual.endswith(expected)
+    return expected in actual
+
+
+def _compile_compound(selector: str):
+    """(name, attrs) -> bool for one compound selector, or None if it isn't one."""
+    match = _COMPOUND.fullmatch(selector)
+    if not match or not selector:
+        return None
+    tag = (match["tag"] or "*").lower()
+    checks = []   # (attribute, op, value)
+    for part in _COMPOUND_PART.finditer(match["parts"]):
+        if part["cls"]:
+            checks.append(("class", "~=", part["cls"]))
+        elif part["id"]:
+            checks.append(("id", "=", part["id"]))
+        else:
+            value = next((v for v in (part["dq"], part["sq"], part["bare"]) if v is not None), "")
+            checks.append((part["attr"].lower(), part["op"], value))
+
+    def matches(name: str, attrs: dict) -> bool:
+        if tag != "*" and name != tag:
+            return False
+        return all(_attr_matches(op, value, _attr_value(attrs, attr)) for attr, op, value in checks)
+
+    return matches
+
+
+def _is_scopable(selector: str) -> bool:
+    """True if selector matches an element on its own tag and attributes alone."""
+    return all(_compile_compound(part.strip()) for part in selector.split(","))
+
+
+@lru_cache(maxsize=64)
+def _list_scope(selector: str) -> SoupStrainer | None:
+    """SoupStrainer keeping only elements that match selector, or None if it can't be scoped."""
+    compounds = [_compile_compound(part.strip()) for part in selector.split(",")]
+    if not all(compounds):
+        return None
+    return SoupStrainer(lambda name, attrs: any(matches(name, attrs) for matches in compounds))
+
+
+def _has_candidate_class(value: str | list | None) -> bool:
+    if isinstance(value, list):
+        value = " ".join(value)
+    return bool(value) and _CANDIDATE_CLASS.search(value) is not None
+
+
+def _is_fallback_element(name: str, attrs: dict) -> bool:
+    if name in _HEADING_TAGS:
+        return True
+    return name in _CANDIDATE_TAGS and _has_candidate_class(attrs.get("class"))
+
+
+# Generic fallback scope: its candidates, plus headings in case there are none
+_FALLBACK_SCOPE = SoupStrainer(_is_fallback_element)
+
+
+def _make_soup(
+    html: str | bytes,
+    backend: str,
+    parse_only: SoupStrainer | None = None,
+    encoding: str | None = None,
+) -> BeautifulSoup:
+    if isinstance(html, bytes):
+        return BeautifulSoup(html, backend, parse_only=parse_only, from_encoding=encoding)
+    return BeautifulSoup(html, backend, parse_only=parse_only)
+
+
 def _extract_with_selectors(
     soup: BeautifulSoup,
     base_url: str,
@@ -38,6 +172,7 @@ def _extract_with_selectors(
     if not list_sel:
         return []
 
+    keywords = keyword_matcher(filter_keywords)
     stories = []
     seen_urls: set[str] = set()
 
@@ -73,9 +208,8 @@ def _extract_with_selectors(
 
         content = card.get_text(separator=" ", strip=True)[:2000]
 
-        if filter_keywords:
-            if not any(kw.lower() in (title + " " + content).lower() for kw in filter_keywords):
-                continue
+        if keywords and not keywords.search(title + " " + content):
+            continue
 
         stories.append(Story.from_url(
             url=full_url,
@@ -94,29 +228,57 @@ def fetch_html(
     base_url: str,
     filter_keywords: list[str] | None = None,
     selectors: dict | None = None,
+    cache: dict | None = None,
 ) -> list[Story]:
     try:
-        response = httpx.get(url, headers=HEADERS, timeout=20, follow_redirects=True)
-        response.raise_for_status()
+        if cache is None:
+            response = httpx.get(url, headers=HEADERS, timeout=20, follow_redirects=True)
+            response.raise_for_status()
+        else:
+            response = conditional_get(url, cache, HEADERS)
     except Exception:
         return []
+    if is_not_modified(cache, url, response):
+        return cached_stories(cache, url)
+    stories = parse_html(
+        source_name, response.content, base_url, filter_keywords, selectors,
+        encoding=response.charset_encoding,
+    )
+    remember(cache, url, response, stories)
+    return stories
 
-    soup = BeautifulSoup(response.text, "html.parser")
+
+def parse_html(
+    source_name: str,
+    html: str | bytes,
+    base_url: str,
+    filter_keywords: list[str] | None = None,
+    selectors: dict | None = None,
+    encoding: str | None = None,
+    backend: str | None = None,
+) -> list[Story]:
+    """Extract stories from a downloaded listing page.
+
+    html is the page as bytes (preferred — decoded by the parser, with
+    encoding from the Content-Type header taking precedence) or text.
+    """
+    backend = backend or HTML_BACKEND
 
     # Use precise selectors when provided (beats generic heuristics for CSS-module sites)
     if selectors:
+        list_sel = selectors.get("list")
+        scope = _list_scope(list_sel) if list_sel else None
+        soup = _make_soup(html, backend, scope, encoding)
         return _extract_with_selectors(soup, base_url, selectors, filter_keywords, source_name)
 
     # Generic fallback
+    soup = _make_soup(html, backend, _FALLBACK_SCOPE, encoding)
+    keywords = keyword_matcher(filter_keywords)
     stories = []
-    candidates = []
-    for tag in soup.find_all(["article", "div"], class_=lambda c: c and any(
-        k in c.lower() for k in ["post", "article", "blog", "entry", "item"]
-    )):
-        candidates.append(tag)
+    candidates = soup.find_all(list(_CANDIDATE_TAGS), class_=_CANDIDATE_CLASS)
 
     if not candidates:
-        candidates = soup.find_all(["h2", "h3"])
+        candidates = soup.find_all(list(_HEADING_TAGS))
 
     seen_urls: set[str] = set()
     for candidate in candidates[:20]:
@@ -138,10 +300,8 @@ def fetch_html(
         parent = link_tag.parent
         content = parent.get_text(separator=" ", strip=True)[:2000] if parent else title
 
-        if filter_keywords:
-            combined = (title + " " + content).lower()
-            if not any(kw.lower() in combined for kw in filter_keywords):
-                continue
+        if keywords and not keywords.search(title + " " + content):
+            continue
 
         stories.append(
             Story.from_url(
@@ -0,0 +1,110 @@
+"""
+Persistent HTTP validator cache for feed and page fetches.
+
+Keyed by source URL. Each entry stores the ETag / Last-Modified validators
+from the last 200 response plus the stories parsed from it, so a 304 Not
+Modified can be answered from disk without downloading or parsing the body.
+"""
+import json
+import httpx
+from datetime import datetime, timezone, timedelta
+from pathlib import Path
+from schemas.story import Story
+
+HTTP_CACHE_PATH = Path("data/http_cache.json")
+HTTP_CACHE_MAX_DAYS = 14
+
+
+def load_http_cache(path: Path = HTTP_CACHE_PATH) -> dict:
+    """Load validator cache, evicting entries not refreshed in HTTP_CACHE_MAX_DAYS."""
+    if not path.exists():
+        return {}
+    try:
+        raw = json.loads(path.read_text())
+        cutoff = datetime.now(tz=timezone.utc) - timedelta(days=HTTP_CACHE_MAX_DAYS)
+        result = {}
+        for url, entry in raw.items():
+            try:
+                fetched_at = datetime.fromisoformat(entry["fetched_at"])
+                if fetched_at.tzinfo is None:
+                    fetched_at = fetched_at.replace(tzinfo=timezone.utc)
+                if fetched_at >= cutoff:
+                    result[url] = entry
+            except (KeyError, ValueError):
+                pass  # skip malformed entries rather than discarding the whole cache
+        return result
+    except Exception:
+        return {}
+
+
+def save_http_cache(cache: dict, path: Path = HTTP_CACHE_PATH) -> None:
+    """Persist validator cache to disk."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(cache))
+
+
+def conditional_headers(cache: dict | None, url: str) -> dict[str, str]:
+    """Return If-None-Match / If-Modified-Since headers for a cached URL."""
+    entry = (cache or {}).get(url)
+    if not entry:
+        return {}
+    headers = {}
+    if entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
+
+
+def is_not_modified(cache: dict | None, url: str, response: httpx.Response) -> bool:
+    """True when the server answered 304 and we hold stories for this URL."""
+    return response.status_code == 304 and cache is not None and url in cache
+
+
+def cached_stories(cache: dict, url: str, max_age_days: int | None = None) -> list[Story]:
+    """Stories parsed from the last full response, re-applying the age cutoff.
+
+    Also refreshes the entry's timestamp — a 304 proves it is still current.
+    """
+    cache[url]["fetched_at"] = datetime.now(tz=timezone.utc).isoformat()
+    stories = [Story.model_validate(item) for item in cache[url].get("stories", [])]
+    if max_age_days is None:
+        return stories
+    cutoff = datetime.now(tz=timezone.utc) - timedelta(days=max_age_days)
+    return [s for s in stories if s.published_at >= cutoff]
+
+
+def remember(cache: dict | None, url: str, response: httpx.Response, stories: list[Story]) -> None:
+    """Store validators and parsed stories from a full response."""
+    if cache is None:
+        return
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    if not etag and not last_modified:
+        # Server offers no validators — nothing to revalidate against next run
+        cache.pop(url, None)
+        return
+    cache[url] = {
+        "etag": etag,
+        "last_modified": last_modified,
+        "stories": [s.model_dump(mode="json") for s in stories],
+        "fetched_at": datetime.now(tz=timezone.utc).isoformat(),
+    }
+
+
+def conditional_get(
+    url: str,
+    cache: dict | None,
+    headers: dict[str, str],
+    timeout: float = 20,
+) -> httpx.Response:
+    """GET with validators attached. Raises on network errors and 4xx/5xx."""
+    response = httpx.get(
+        url,
+        headers={**headers, **conditional_headers(cache, url)},
+        timeout=timeout,
+        follow_redirects=True,
+    )
+    if response.status_code != 304:
+        response.raise_for_status()
+    return response
@@ -1,6 +1,9 @@
 import feedparser
 from datetime import datetime, timezone, timedelta
 from schemas.story import Story
+from scrapers.feedstream import FeedStreamError, iter_feed_stories
+from scrapers.keywords import keyword_matcher
+from scrapers.http_cache import cached_stories, conditional_get, is_not_modified, remember
 
 HEADERS = {"User-Agent": "Mozilla/5.0 (compatible; AINewsletterBot/1.0)"}
 
@@ -20,14 +23,65 @@ def fetch_rss(
     url: str,
     filter_keywords: list[str] | None = None,
     max_age_days: int = 7,
+    cache: dict | None = None,
 ) -> list[Story]:
-    feedparser.USER_AGENT = HEADERS["User-Agent"]
-    feed = feedparser.parse(url)
+    if cache is None:
+        feedparser.USER_AGENT = HEADERS["User-Agent"]
+        feed = feedparser.parse(url)
+        return parse_rss(feed, source_name, filter_keywords, max_age_days)
 
+    # Conditional GET — reuse last run's stories when the feed is unchanged
+    try:
+        response = conditional_get(url, cache, HEADERS)
+    except Exception:
+        return []
+    if is_not_modified(cache, url, response):
+        return cached_stories(cache, url, max_age_days)
+    stories = parse_feed(response.content, source_name, filter_keywords, max_age_days)
+    remember(cache, url, response, stories)
+    return stories
+
+
+def parse_feed(
+    data: bytes,
+    source_name: str,
+    filter_keywords: list[str] | None = None,
+    max_age_days: int = 7,
+    stats: dict | None = None,
+) -> list[Story]:
+    """Stories from a downloaded feed — streamed (scrapers/feedstream.py), else via feedparser.
+
+    stats, if given, receives "entries" (entries read), "stopped_early",
+    "fallback" and "parse_error" (unusable even to feedparser).
+    """
+    stats = stats if stats is not None else {}
+    try:
+        stories = list(iter_feed_stories(data, source_name, filter_keywords, max_age_days, stats))
+        stats.update(fallback=False, parse_error=False)
+        return stories
+    except FeedStreamError:
+        feed = feedparser.parse(data)
+        stats.update(
+            entries=len(feed.entries),
+            stopped_early=False,
+            fallback=True,
+            parse_error=bool(feed.bozo and not feed.entries),
+        )
+        return parse_rss(feed, source_name, filter_keywords, max_age_days)
+
+
+def parse_rss(
+    feed,
+    source_name: str,
+    filter_keywords: list[str] | None = None,
+    max_age_days: int = 7,
+) -> list[Story]:
+    """Build stories from an already-parsed feed (``feedparser.parse`` result)."""
     if feed.bozo and not feed.entries:
         return []
 
     cutoff = datetime.now(tz=timezone.utc) - timedelta(days=max_age_days)
+    keywords = keyword_matcher(filter_keywords)
     stories = []
     for entry in feed.entries:
         link = getattr(entry, "link", None)
@@ -50,10 +104,8 @@ def fetch_rss(
         if published_at < cutoff:
             continue
 
-        if filter_keywords:
-            combined = (title + " " + content).lower()
-            if not any(kw.lower() in combined for kw in filter_keywords):
-                continue
+        if keywords and not keywords.search(title + " " + content):
+            continue
 
         stories.append(
             Story.from_url(
@@ -0,0 +1,10 @@
+import pytest
+from pipeline.ratelimit import reset_limiters
+
+
+@pytest.fixture(autouse=True)
+def fresh_rate_limiters():
+    """Each test starts with full rate-limit buckets, like a fresh pipeline run."""
+    reset_limiters()
+    yield
+    reset_limiters()
@@ -0,0 +1,65 @@
+import gzip
+import json
+from datetime import datetime, timezone
+from pipeline.artifacts import RANKED, STORIES, SUMMARIZED, read_artifact, read_records, write_artifact
+from schemas.story import Story, StorySource
+
+
+def make_story(i: int) -> Story:
+    story = Story.from_url(
+        url=f"https://example.com/{i}",
+        title=f"Story {i} — agents",
+        source_name="OpenAI",
+        published_at=datetime(2026, 2, 24, i, tzinfo=timezone.utc),
+        raw_content="content",
+    )
+    story.sources.append(StorySource(name="HN", url=f"https://news.ycombinator.com/{i}"))
+    story.priority_score = i
+    return story
+
+
+def test_story_list_round_trip(tmp_path):
+    stories = [make_story(i) for i in range(3)]
+    path = tmp_path / "normalized.json"
+    write_artifact(path, stories)
+    assert read_artifact(path) == stories
+    assert json.loads(path.read_text())[0]["source_count"] == 2
+
+
+def test_reads_files_written_by_json_dumps(tmp_path):
+    stories = [make_story(i) for i in range(2)]
+    legacy = [s.model_dump(mode="json") for s in stories]
+    legacy[1]["published_at"] = "2026-02-24T01:00:00"   # naive timestamps from older runs
+    path = tmp_path / "raw.json"
+    path.write_text(json.dumps(legacy, indent=2, default=str))
+    loaded = read_artifact(path, STORIES)
+    assert [s.id for s in loaded] == [s.id for s in stories]
+    assert loaded[1].published_at.replace(tzinfo=timezone.utc) == stories[1].published_at
+
+
+def test_ranked_and_summarized_shapes(tmp_path):
+    a, b, c = (make_story(i) for i in range(3))
+    write_artifact(tmp_path / "ranked.json", {"personal_items": [a, b], "enterprise_items": [b]}, RANKED)
+    ranked = read_artifact(tmp_path / "ranked.json", RANKED)
+    assert ranked["personal_items"] == [a, b] and ranked["enterprise_items"] == [b]
+
+    summarized = {"top3": [a], "categories": {"tools": [b, c]}}
+    write_artifact(tmp_path / "summarized.json", summarized, SUMMARIZED)
+    loaded = read_artifact(tmp_path / "summarized.json", SUMMARIZED)
+    assert loaded["categories"]["tools"] == [b, c]
+    assert "enterprise_items" not in loaded
+
+
+def test_gzip_by_suffix_and_detected_on_read(tmp_path, monkeypatch):
+    monkeypatch.setenv("ARTIFACT_COMPACT", "1")
+    stories = [make_story(i) for i in range(5)]
+    gz_path = tmp_path / "normalized.json.gz"
+    write_artifact(gz_path, stories)
+    raw = gz_path.read_bytes()
+    assert raw[:2] == b"\x1f\x8b"
+    assert b"\n" not in gzip.decompress(raw)
+
+    renamed = tmp_path / "normalized.json"
+    renamed.write_bytes(raw)
+    assert read_artifact(renamed) == stories
+    assert [r.to_story() for r in read_records(renamed)] == stories
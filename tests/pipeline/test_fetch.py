@@ -61,3 +61,228 @@ def test_fetch_saves_output_to_json(tmp_path):
     saved = json.loads(output_path.read_text())
     assert len(saved) == 1
     assert saved[0]["title"] == "GPT-5 launches"
+
+
+RSS_XML = """<?xml version="1.0"?>
+<rss version="2.0"><channel><title>OpenAI</title>
+<item><title>GPT-5 launches</title><link>https://openai.com/gpt-5</link>
+<description>OpenAI launched GPT-5.</description><pubDate>{date}</pubDate></item>
+</channel></rss>"""
+
+
+def _recent_rfc822() -> str:
+    from datetime import timedelta
+    from email.utils import format_datetime
+    return format_datetime(datetime.now(tz=timezone.utc) - timedelta(days=1))
+
+
+async def test_fetch_all_fetches_every_source_concurrently():
+    import httpx
+    import respx
+    from pipeline.fetch import fetch_all
+
+    sources = [
+        {"name": "openai", "display_name": "OpenAI", "type": "rss",
+         "url": "https://openai.com/news/rss.xml", "weight": "high"},
+        {"name": "cursor", "display_name": "Cursor", "type": "scrape",
+         "url": "https://cursor.com/blog", "weight": "high"},
+        {"name": "dead", "display_name": "Dead", "type": "rss",
+         "url": "https://dead.example.com/rss", "weight": "low"},
+    ]
+    html = '<html><body><article><h2><a href="/blog/agents">Cursor ships background agents</a></h2></article></body></html>'
+    with respx.mock:
+        respx.get("https://openai.com/news/rss.xml").mock(
+            return_value=httpx.Response(200, text=RSS_XML.format(date=_recent_rfc822()))
+        )
+        respx.get("https://cursor.com/blog").mock(return_value=httpx.Response(200, text=html))
+        respx.get("https://dead.example.com/rss").mock(side_effect=httpx.ConnectError("down"))
+        results = await fetch_all(sources)
+
+    assert set(results) == {"openai", "cursor", "dead"}
+    assert [s.title for s in results["openai"]] == ["GPT-5 launches"]
+    assert results["cursor"][0].canonical_url == "https://cursor.com/blog/agents"
+    assert results["dead"] == []
+
+
+async def test_fetch_all_respects_per_host_cap():
+    import asyncio
+    import httpx
+    import respx
+    from pipeline.fetch import fetch_all
+
+    in_flight = {"now": 0, "peak": 0}
+
+    async def slow_response(request):
+        in_flight["now"] += 1
+        in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+        await asyncio.sleep(0.01)
+        in_flight["now"] -= 1
+        return httpx.Response(200, json={"hits": []})
+
+    sources = [
+        {"name": f"hn{i}", "display_name": "HN", "type": "api",
+         "url": "https://hn.algolia.com/api/v1/search", "params": {"page": i}}
+        for i in range(6)
+    ]
+    with respx.mock:
+        respx.get("https://hn.algolia.com/api/v1/search").mock(side_effect=slow_response)
+        results = await fetch_all(sources, max_per_host=2)
+
+    assert len(results) == 6
+    assert in_flight["peak"] == 2
+
+
+async def test_fetch_all_short_circuits_on_304():
+    import httpx
+    import respx
+    from pipeline.fetch import fetch_all
+
+    source = {"name": "openai", "display_name": "OpenAI", "type": "rss",
+              "url": "https://openai.com/news/rss.xml", "weight": "high"}
+    cache = {}
+    with respx.mock:
+        route = respx.get("https://openai.com/news/rss.xml")
+        route.mock(return_value=httpx.Response(
+            200, text=RSS_XML.format(date=_recent_rfc822()), headers={"ETag": '"abc"'}
+        ))
+        first = await fetch_all([source], cache=cache)
+        route.mock(return_value=httpx.Response(304))
+        second = await fetch_all([source], cache=cache)
+
+    assert route.calls.last.request.headers["If-None-Match"] == '"abc"'
+    assert [s.id for s in second["openai"]] == [s.id for s in first["openai"]]
+
+
+async def test_fetch_all_with_health_derives_status_from_fetch():
+    import httpx
+    import respx
+    from pipeline.fetch import fetch_all_with_health
+
+    sources = [
+        {"name": "openai", "display_name": "OpenAI", "type": "rss",
+         "url": "https://openai.com/news/rss.xml", "weight": "high"},
+        {"name": "empty", "display_name": "Empty", "type": "rss",
+         "url": "https://empty.example.com/rss", "weight": "low"},
+        {"name": "gone", "display_name": "Gone", "type": "scrape",
+         "url": "https://gone.example.com/blog", "weight": "low"},
+    ]
+    with respx.mock:
+        respx.get("https://openai.com/news/rss.xml").mock(
+            return_value=httpx.Response(200, text=RSS_XML.format(date=_recent_rfc822()))
+        )
+        respx.get("https://empty.example.com/rss").mock(
+            return_value=httpx.Response(200, text='<?xml version="1.0"?><rss version="2.0"><channel></channel></rss>')
+        )
+        respx.get("https://gone.example.com/blog").mock(return_value=httpx.Response(404))
+        stories, health = await fetch_all_with_health(sources)
+
+    assert [h["name"] for h in health] == ["openai", "empty", "gone"]
+    assert [h["status"] for h in health] == ["active", "skipped", "skipped"]
+    assert health[0]["detail"] == "1 entries"
+    assert health[0]["http_status"] == 200
+    assert health[1]["detail"] == "no entries"
+    assert health[2]["detail"] == "HTTP 404"
+    assert all(isinstance(h["latency_ms"], int) for h in health)
+    assert len(stories["openai"]) == 1
+
+
+def test_main_validate_writes_health_report(monkeypatch, tmp_path):
+    import sys
+    import httpx
+    import respx
+    import yaml
+    from pipeline import fetch as mod
+
+    (tmp_path / "sources").mkdir()
+    (tmp_path / "sources" / "sources.yaml").write_text(yaml.dump({"sources": [
+        {"name": "openai", "display_name": "OpenAI", "type": "rss",
+         "url": "https://openai.com/news/rss.xml", "weight": "high"},
+        {"name": "dead", "display_name": "Dead", "type": "rss",
+         "url": "https://dead.example.com/rss", "weight": "low"},
+    ]}))
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, "argv", ["fetch.py", "--all", "--validate", "--no-http-cache"])
+
+    with respx.mock:
+        respx.get("https://openai.com/news/rss.xml").mock(
+            return_value=httpx.Response(200, text=RSS_XML.format(date=_recent_rfc822()))
+        )
+        respx.get("https://dead.example.com/rss").mock(side_effect=httpx.ConnectError("down"))
+        mod.main()
+
+    assert json.loads((tmp_path / "active_sources.json").read_text()) == ["openai"]
+    health = json.loads((tmp_path / "feed_health.json").read_text())["results"]
+    assert [r["status"] for r in health] == ["active", "skipped"]
+    assert len(json.loads((tmp_path / "data" / "raw" / "openai.json").read_text())) == 1
+
+    fetch_metrics = json.loads((tmp_path / "run_metrics.json").read_text())["stages"]["fetch"]
+    assert fetch_metrics["status"] == "ok"
+    http = {h["source"]: h for h in fetch_metrics["http"]}
+    assert http["openai"]["status"] == 200 and http["openai"]["bytes"] > 0
+    assert http["dead"]["status"] is None and http["dead"]["parse_ms"] is None
+
+
+def test_main_single_source_records_fetch_metrics(monkeypatch, tmp_path):
+    import sys
+    import httpx
+    import respx
+    import yaml
+    from pipeline import fetch as mod
+
+    (tmp_path / "sources").mkdir()
+    (tmp_path / "sources" / "sources.yaml").write_text(yaml.dump({"sources": [
+        {"name": "openai", "display_name": "OpenAI", "type": "rss",
+         "url": "https://openai.com/news/rss.xml", "weight": "high"},
+    ]}))
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, "argv", ["fetch.py", "--source", "openai", "--no-http-cache", "--no-resolve"])
+
+    with respx.mock:
+        respx.get("https://openai.com/news/rss.xml").mock(
+            return_value=httpx.Response(200, text=RSS_XML.format(date=_recent_rfc822()))
+        )
+        mod.main()
+
+    assert len(json.loads((tmp_path / "data" / "raw" / "openai.json").read_text())) == 1
+    fetch_metrics = json.loads((tmp_path / "run_metrics.json").read_text())["stages"]["fetch"]
+    [http] = fetch_metrics["http"]
+    assert http["source"] == "openai" and http["status"] == 200
+    assert http["bytes"] > 0 and isinstance(http["latency_ms"], int) and isinstance(http["parse_ms"], int)
+
+
+def test_canonicalize_results_resolves_shorteners_and_strips_tracking():
+    import httpx
+    import respx
+    from pipeline.fetch import canonicalize_results
+
+    def story(url):
+        return Story.from_url(
+            url=url, title="GPT-5", source_name="X",
+            published_at=datetime(2026, 2, 24, tzinfo=timezone.utc), raw_content="",
+        )
+
+    with respx.mock:
+        respx.get("https://t.co/abc").mock(
+            return_value=httpx.Response(301, headers={"Location": "https://openai.com/gpt-5"})
+        )
+        respx.get("https://openai.com/gpt-5").mock(return_value=httpx.Response(200, text="ok"))
+        cache = {}
+        results = canonicalize_results(
+            {"x": [story("https://t.co/abc")], "tldr": [story("https://openai.com/gpt-5?utm_source=tldr")]},
+            cache,
+        )
+
+    assert results["x"][0].canonical_url == "https://openai.com/gpt-5"
+    assert results["tldr"][0].canonical_url == "https://openai.com/gpt-5"
+    assert "https://t.co/abc" in cache
+
+
+def test_canonicalize_results_without_resolution_skips_network():
+    from pipeline.fetch import canonicalize_results
+
+    s = Story.from_url(
+        url="https://t.co/abc", title="GPT-5", source_name="X",
+        published_at=datetime(2026, 2, 24, tzinfo=timezone.utc), raw_content="",
+    )
+    results = canonicalize_results({"x": [s]}, None, resolve=False)
+    assert results["x"][0].canonical_url == "https://t.co/abc"
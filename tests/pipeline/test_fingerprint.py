@@ -0,0 +1,53 @@
+import random
+from pipeline.fingerprint import fingerprint_distance, hamming, shingles, simhash, story_fingerprint
+
+random.seed(7)
+VOCAB = [f"word{i}" for i in range(2000)]
+ARTICLE = " ".join(random.choice(VOCAB) for _ in range(250))
+
+
+def _edit(text: str, fraction: float, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    words = text.split()
+    for _ in range(int(len(words) * fraction)):
+        words[rng.randrange(len(words))] = rng.choice(VOCAB)
+    return " ".join(words)
+
+
+def test_shingles_are_lowercased_word_trigrams():
+    assert shingles("OpenAI launches GPT-5 today") == [
+        "openai launches gpt", "launches gpt 5", "gpt 5 today",
+    ]
+
+
+def test_shingles_short_text_is_one_shingle():
+    assert shingles("Hello world") == ["hello world"]
+    assert shingles("") == []
+
+
+def test_simhash_is_stable_and_deterministic():
+    # blake2b, not the per-process salted hash() — must match across runs
+    assert simhash("openai launches gpt 5") == simhash("openai launches gpt 5")
+    assert story_fingerprint("t", "c") == story_fingerprint("t", "c")
+    assert len(story_fingerprint("t", "c")) == 16
+
+
+def test_identical_text_has_zero_distance():
+    assert fingerprint_distance(story_fingerprint("T", ARTICLE), story_fingerprint("T", ARTICLE)) == 0
+
+
+def test_small_edit_is_closer_than_rewrite():
+    base = story_fingerprint("T", ARTICLE)
+    small = fingerprint_distance(base, story_fingerprint("T", _edit(ARTICLE, 0.01)))
+    rewrite = fingerprint_distance(base, story_fingerprint("T", _edit(ARTICLE, 0.5)))
+    assert small <= 10
+    assert rewrite > 16
+
+
+def test_unrelated_texts_are_far_apart():
+    other = " ".join(random.Random(99).choice(VOCAB) for _ in range(250))
+    assert fingerprint_distance(story_fingerprint("T", ARTICLE), story_fingerprint("T", other)) > 16
+
+
+def test_hamming_counts_differing_bits():
+    assert hamming(0b1011, 0b0001) == 2
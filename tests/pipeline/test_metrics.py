@@ -0,0 +1,179 @@
+import json
+import sys
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+import httpx
+import pytest
+from openai import RateLimitError
+from pipeline.metrics import (
+    current_metrics,
+    observe_llm_response,
+    reset_metrics,
+    stage_metrics,
+    tracked_completion,
+    tracked_completion_async,
+    write_run_metrics,
+)
+from schemas.story import Story
+
+MODEL = "openai/gpt-4o-mini"
+
+
+@pytest.fixture(autouse=True)
+def fresh_metrics():
+    reset_metrics()
+    yield
+    reset_metrics()
+
+
+def _chat_request(model: str = MODEL) -> httpx.Request:
+    return httpx.Request(
+        "POST", "https://models.github.ai/inference/chat/completions", json={"model": model, "messages": []}
+    )
+
+
+def _rate_limited() -> RateLimitError:
+    response = httpx.Response(429, headers={"Retry-After": "3"}, request=_chat_request())
+    return RateLimitError("Too many requests", response=response, body=None)
+
+
+def test_tracked_completion_records_latency_wait_and_usage():
+    response = SimpleNamespace(usage=SimpleNamespace(prompt_tokens=120, completion_tokens=30))
+    create = MagicMock(return_value=response)
+
+    assert tracked_completion(create, 1.5, model=MODEL, temperature=0) is response
+
+    create.assert_called_once_with(model=MODEL, temperature=0)
+    [call] = current_metrics().llm_calls
+    assert call["model"] == MODEL and call["status"] == 200
+    assert call["waited_ms"] == 1500 and call["attempt"] == 0
+    assert (call["prompt_tokens"], call["completion_tokens"]) == (120, 30)
+    assert isinstance(call["latency_ms"], int)
+
+
+def test_tracked_completion_records_failure_status_and_reraises():
+    create = MagicMock(side_effect=_rate_limited())
+
+    with pytest.raises(RateLimitError):
+        tracked_completion(create, attempt=1, model=MODEL)
+
+    [call] = current_metrics().llm_calls
+    assert call["status"] == 429 and call["attempt"] == 1
+    assert call["prompt_tokens"] is None
+
+
+def test_tracked_completion_ignores_usage_it_cannot_count():
+    # Mocked clients hand back MagicMock usage — it must not end up in the JSON
+    tracked_completion(MagicMock(), model=MODEL)
+    [call] = current_metrics().llm_calls
+    assert call["prompt_tokens"] is None and call["completion_tokens"] is None
+    json.dumps(current_metrics().section(0.1, "ok"))
+
+
+async def test_tracked_completion_async_records_call():
+    async def create(**request):
+        return SimpleNamespace(usage=SimpleNamespace(prompt_tokens=10, completion_tokens=5))
+
+    await tracked_completion_async(create, model="openai/gpt-4o")
+    [call] = current_metrics().llm_calls
+    assert call["model"] == "openai/gpt-4o" and call["prompt_tokens"] == 10
+
+
+def test_llm_summary_counts_sdk_retries_seen_by_the_hook():
+    metrics = current_metrics()
+    # The SDK retried two 429s internally before the call site saw a 200
+    for status in (429, 429, 200):
+        observe_llm_response(httpx.Response(status, request=_chat_request()))
+    metrics.record_llm_call(MODEL, 200, 0.4, usage=SimpleNamespace(prompt_tokens=100, completion_tokens=20))
+    metrics.record_llm_call(MODEL, 200, 0.3, usage=SimpleNamespace(prompt_tokens=50, completion_tokens=10))
+
+    summary = metrics.llm_summary()[MODEL]
+    assert summary["calls"] == 2
+    assert summary["prompt_tokens"] == 150 and summary["completion_tokens"] == 30
+    assert summary["rate_limited"] == 2
+    assert summary["http_statuses"] == {"200": 1, "429": 2}
+
+
+def test_rank_batch_records_each_attempt(monkeypatch):
+    from pipeline.ratelimit import limiter_for
+    from pipeline.rank import rank_batch
+
+    story = Story.from_url(
+        url="https://openai.com/gpt-5",
+        title="GPT-5 launches",
+        source_name="OpenAI",
+        published_at=datetime(2026, 2, 24, tzinfo=timezone.utc),
+        raw_content="OpenAI launched GPT-5.",
+    )
+    scores = {"enterprise_software_delivery": 85, "enterprise_solutions": 70,
+              "finance_utilities": 30, "general_significance": 90}
+    content = json.dumps({"stories": [{"index": 0, "scores": scores, "include": True}]})
+
+    monkeypatch.setattr(limiter_for(MODEL), "_sleep", lambda seconds: None)
+    client = MagicMock()
+    client.chat.completions.create.side_effect = [
+        _rate_limited(),
+        MagicMock(choices=[MagicMock(message=MagicMock(content=content))]),
+    ]
+    assert len(rank_batch([story], client)) == 1
+
+    calls = current_metrics().llm_calls
+    assert [(c["status"], c["attempt"]) for c in calls] == [(429, 0), (200, 1)]
+    assert current_metrics().llm_summary()[MODEL]["rate_limited"] == 1
+
+
+def test_write_run_metrics_merges_stages(tmp_path):
+    path = tmp_path / "run_metrics.json"
+    write_run_metrics("fetch", {"wall_seconds": 1.0}, path)
+    write_run_metrics("rank", {"wall_seconds": 2.0}, path)
+    write_run_metrics("fetch", {"wall_seconds": 3.0}, path)
+
+    assert json.loads(path.read_text()) == {"stages": {"fetch": {"wall_seconds": 3.0}, "rank": {"wall_seconds": 2.0}}}
+
+
+def test_write_run_metrics_replaces_unreadable_file(tmp_path):
+    path = tmp_path / "run_metrics.json"
+    path.write_text("{not json")
+    write_run_metrics("deliver", {"wall_seconds": 1.0}, path)
+    assert json.loads(path.read_text())["stages"] == {"deliver": {"wall_seconds": 1.0}}
+
+
+def test_stage_metrics_writes_section_with_what_the_stage_recorded(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+
+    @stage_metrics("fetch")
+    def main():
+        current_metrics().record_fetch("openai", "https://openai.com/news/rss.xml", 200, 120, 5000, "3 entries", 4)
+        return "done"
+
+    assert main() == "done"
+    section = json.loads((tmp_path / "run_metrics.json").read_text())["stages"]["fetch"]
+    assert section["status"] == "ok"
+    assert section["wall_seconds"] >= 0
+    assert section["http"] == [{
+        "source": "openai", "url": "https://openai.com/news/rss.xml", "status": 200,
+        "latency_ms": 120, "parse_ms": 4, "bytes": 5000, "detail": "3 entries",
+    }]
+    assert "llm" not in section
+
+
+def test_stage_metrics_records_failed_stage(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+
+    @stage_metrics("fetch")
+    def exits():
+        sys.exit(1)
+
+    @stage_metrics("rank")
+    def raises():
+        raise ValueError("GITHUB_TOKEN environment variable is required")
+
+    with pytest.raises(SystemExit):
+        exits()
+    with pytest.raises(ValueError):
+        raises()
+
+    stages = json.loads((tmp_path / "run_metrics.json").read_text())["stages"]
+    assert stages["fetch"]["status"] == "exit 1"
+    assert stages["rank"]["status"] == "error"
@@ -58,3 +58,95 @@ def test_source_count_boosts_are_preserved():
 
     result = deduplicate_by_url([s1, s2, s3])
     assert result[0].source_count == 3
+
+
+def _synthetic_titles(n, seed):
+    import random
+    rng = random.Random(seed)
+    vocab = [f"word{i}" for i in range(60)] + ["openai", "model", "agent", "launches", "gpt"]
+    titles = []
+    for _ in range(n):
+        if titles and rng.random() < 0.4:
+            # Near-duplicate of an earlier title: drop or add a word
+            words = rng.choice(titles).split()
+            if len(words) > 3 and rng.random() < 0.5:
+                words.pop(rng.randrange(len(words)))
+            else:
+                words.insert(rng.randrange(len(words) + 1), rng.choice(vocab))
+            titles.append(" ".join(words))
+        else:
+            titles.append(" ".join(rng.choice(vocab) for _ in range(rng.randint(1, 9))))
+    return titles
+
+
+def test_deduplicate_by_title_similarity_matches_pairwise_reference():
+    from pipeline.normalize import _deduplicate_pairwise
+
+    for seed, threshold in [(1, 0.6), (2, 0.6), (3, 0.5), (4, 0.7), (5, 0.9)]:
+        titles = _synthetic_titles(300, seed)
+        stories = [make_story(f"https://example.com/{i}", t, source=f"S{i % 7}") for i, t in enumerate(titles)]
+        expected = _deduplicate_pairwise([s.model_copy(deep=True) for s in stories], threshold)
+        actual = deduplicate_by_title_similarity([s.model_copy(deep=True) for s in stories], threshold)
+
+        assert [s.id for s in actual] == [s.id for s in expected]
+        assert [[src.name for src in s.sources] for s in actual] == [
+            [src.name for src in s.sources] for s in expected
+        ]
+
+
+def test_deduplicate_by_title_similarity_never_merges_empty_titles():
+    s1 = make_story("https://a.com/1", "The", "A")
+    s2 = make_story("https://a.com/2", "of", "B")
+    assert len(deduplicate_by_title_similarity([s1, s2], threshold=0.6)) == 2
+
+
+def test_deduplicate_by_url_merges_tracking_and_scheme_variants():
+    s1 = make_story("https://openai.com/gpt-5", "GPT-5 launches", "OpenAI")
+    s2 = make_story("http://openai.com/gpt-5/?utm_source=tldrai", "GPT-5 launches", "TLDR AI")
+    s3 = make_story("https://amp.openai.com/gpt-5/", "GPT-5 launches", "Google News")
+
+    result = deduplicate_by_url([s1, s2, s3])
+    assert len(result) == 1
+    assert result[0].canonical_url == "https://openai.com/gpt-5"
+    assert result[0].source_count == 3
+
+
+def test_deduplicate_by_url_keeps_https_link_when_http_copy_comes_first():
+    s1 = make_story("http://openai.com/gpt-5/", "GPT-5 launches", "TLDR AI")
+    s2 = make_story("https://openai.com/gpt-5", "GPT-5 launches", "OpenAI")
+    s3 = make_story("http://example.com/plain", "Plain http site", "Blog")
+
+    result = deduplicate_by_url([s1, s2, s3])
+    assert [s.canonical_url for s in result] == ["https://openai.com/gpt-5", "http://example.com/plain"]
+    assert result[0].source_count == 2
+
+
+def test_dedup_of_records_matches_dedup_of_stories():
+    from schemas.record import StoryRecord
+
+    titles = _synthetic_titles(200, 7)
+    stories = [
+        make_story(f"https://example.com/{i % 150}/?utm_source=x{i}", t, source=f"S{i % 5}")
+        for i, t in enumerate(titles)
+    ]
+    records = [StoryRecord.from_dict(s.model_dump(mode="json")) for s in stories]
+
+    expected = deduplicate_by_title_similarity(deduplicate_by_url([s.model_copy(deep=True) for s in stories]))
+    actual = deduplicate_by_title_similarity(deduplicate_by_url(records))
+    assert [r.to_story() for r in actual] == expected
+
+
+def test_normalize_validates_deduplicated_records(tmp_path):
+    import json
+    from pipeline.normalize import normalize
+
+    now = datetime.now(tz=timezone.utc)
+    a = Story.from_url("https://openai.com/gpt-5", "GPT-5 launches today", "OpenAI", now, "c")
+    b = Story.from_url("https://openai.com/gpt-5?utm_source=hn", "GPT-5 launches today", "HN", now, "c")
+    (tmp_path / "one.json").write_text(json.dumps([a.model_dump(mode="json"), b.model_dump(mode="json")]))
+    (tmp_path / "broken.json").write_text(json.dumps([a.model_dump(mode="json"), {"title": "no url"}]))
+
+    result = normalize(str(tmp_path))
+    assert len(result) == 1
+    assert isinstance(result[0], Story)
+    assert [s.name for s in result[0].sources] == ["OpenAI", "HN"]
@@ -1,7 +1,7 @@
 import json
 from unittest.mock import MagicMock
 from datetime import datetime, timezone, timedelta
-from pipeline.rank import rank_story, rank_batch, select_top_stories, heuristic_prescore, presort_and_limit, recency_multiplier, classify_sdlc_tags, filter_enterprise_items
+from pipeline.rank import rank_story, rank_batch, select_top_stories, heuristic_prescore, prescore_stories, presort_and_limit, recency_multiplier, classify_sdlc_tags, filter_enterprise_items
 from schemas.story import Story
 
 MOCK_STORY = Story.from_url(
@@ -129,6 +129,20 @@ def test_heuristic_prescore_keyword_bonus():
     assert heuristic_prescore(story_with_kw, {}) > heuristic_prescore(story_no_kw, {})
 
 
+def test_heuristic_prescore_keywords_ignore_punctuation():
+    def story(title):
+        return Story.from_url(
+            url="https://example.com/" + title,
+            title=title,
+            source_name="test",
+            published_at=datetime.now(tz=timezone.utc),
+            raw_content="test",
+        )
+    plain = heuristic_prescore(story("Enterprise agent deployment"), {})
+    assert heuristic_prescore(story("Enterprise: agent, deployment!"), {}) == plain
+    assert heuristic_prescore(story("Enterprising agentless deployments"), {}) == 0
+
+
 def test_presort_and_limit_keeps_top_n():
     stories = []
     for i in range(10):
@@ -144,6 +158,26 @@ def test_presort_and_limit_keeps_top_n():
     assert len(result) == 5
 
 
+def test_presort_and_limit_matches_a_full_stable_sort():
+    now = datetime.now(tz=timezone.utc)
+    titles = ["Weather report", "Enterprise agent platform", "Agent api launch", "Enterprise agent platform"]
+    stories = [
+        Story.from_url(
+            url=f"https://example.com/{i}",
+            title=titles[i % len(titles)],
+            source_name="HN" if i % 3 else "OpenAI",
+            published_at=now - timedelta(days=i % 12),
+            raw_content="test",
+        )
+        for i in range(60)
+    ]
+    weights = {"OpenAI": 20, "HN": 10}
+    expected = sorted(stories, key=lambda s: heuristic_prescore(s, weights), reverse=True)[:7]
+
+    assert presort_and_limit(stories, weights, limit=7) == expected
+    assert prescore_stories(stories, weights) == [heuristic_prescore(s, weights) for s in stories]
+
+
 def test_select_top_stories_caps_per_category():
     stories = []
     for i in range(10):
@@ -391,3 +425,289 @@ def test_filter_enterprise_items_mixed_list():
     result = filter_enterprise_items([enterprise_story, personal_only])
     assert len(result) == 1
     assert result[0].id == "e1"
+
+
+# ── Score cache tests ────────────────────────────────────────────────────────
+
+def test_apply_cached_scores_splits_kept_excluded_and_unscored():
+    from pipeline.rank import apply_cached_scores, _remember_score
+
+    kept = MOCK_STORY.model_copy(deep=True)
+    kept.priority_category, kept.priority_score = "enterprise_solutions", 75
+    excluded = MOCK_STORY.model_copy(deep=True)
+    excluded.id = "excluded"
+    new = MOCK_STORY.model_copy(deep=True)
+    new.id = "new"
+
+    cache = {}
+    _remember_score(cache, "fp", kept, included=True)
+    _remember_score(cache, "fp", excluded, included=False)
+
+    fresh = [s.model_copy(deep=True) for s in (kept, excluded, new)]
+    for s in fresh:
+        s.priority_category = s.priority_score = None
+    hits, unscored = apply_cached_scores(fresh, cache, "fp")
+
+    assert [s.id for s in hits] == [kept.id]
+    assert hits[0].priority_category == "enterprise_solutions"
+    assert hits[0].priority_score == 75
+    assert [s.id for s in unscored] == ["new"]
+
+
+def test_apply_cached_scores_ignores_other_fingerprints():
+    from pipeline.rank import apply_cached_scores, _remember_score
+
+    story = MOCK_STORY.model_copy(deep=True)
+    story.priority_category, story.priority_score = "enterprise_solutions", 75
+    cache = {}
+    _remember_score(cache, "old-prompt", story, included=True)
+
+    hits, unscored = apply_cached_scores([story.model_copy(deep=True)], cache, "new-prompt")
+    assert hits == []
+    assert len(unscored) == 1
+
+
+def test_prompt_fingerprint_changes_with_prompt(monkeypatch):
+    from pipeline import rank as mod
+
+    before = mod.prompt_fingerprint()
+    monkeypatch.setattr(mod, "RANK_BATCH_PROMPT", mod.RANK_BATCH_PROMPT + " Be brief.")
+    assert mod.prompt_fingerprint() != before
+
+
+def test_load_score_cache_evicts_old_entries(tmp_path):
+    from pipeline.rank import load_score_cache, save_score_cache
+
+    path = tmp_path / "score_cache.json"
+    save_score_cache({
+        "fp:old": {"included": False, "cached_at": (datetime.now(tz=timezone.utc) - timedelta(days=40)).isoformat()},
+        "fp:new": {"included": False, "cached_at": datetime.now(tz=timezone.utc).isoformat()},
+    }, path)
+    assert list(load_score_cache(path)) == ["fp:new"]
+
+
+def test_main_only_sends_never_seen_stories_to_llm(monkeypatch, tmp_path):
+    from pipeline import rank as mod
+
+    def story_dict(i):
+        return {
+            "id": f"id{i}",
+            "title": f"Enterprise agent story {i}",
+            "canonical_url": f"https://example.com/{i}",
+            "sources": [{"name": "Test", "url": f"https://example.com/{i}"}],
+            "published_at": (datetime.now(tz=timezone.utc) - timedelta(days=1)).isoformat(),
+            "raw_content": "Some content.",
+        }
+
+    def respond(model, messages, **kwargs):
+        if messages[0]["content"] == mod.SDLC_CLASSIFY_SYSTEM_PROMPT:
+            content = json.dumps({"stories": [{"index": 0, "sdlc_tags": ["tooling"]}]})
+        else:
+            content = MOCK_BATCH_RESPONSE
+        return MagicMock(choices=[MagicMock(message=MagicMock(content=content))])
+
+    client = MagicMock()
+    client.chat.completions.create.side_effect = respond
+
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    (data_dir / "normalized.json").write_text(json.dumps([story_dict(0), story_dict(1)]))
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(mod, "get_client", lambda: client)
+    monkeypatch.setattr(mod, "_load_source_weights", lambda: {})
+
+    mod.main()
+    first_calls = client.chat.completions.create.call_count
+    first = json.loads((data_dir / "ranked.json").read_text())
+
+    mod.main()
+    second = json.loads((data_dir / "ranked.json").read_text())
+
+    assert first_calls == 2                       # one rank batch + one SDLC batch
+    assert client.chat.completions.create.call_count == first_calls   # nothing new to score
+    assert second == first
+    assert second["personal_items"][0]["sdlc_tags"] == ["tooling"]
+
+
+def test_main_does_not_cache_failed_batches(monkeypatch, tmp_path):
+    from pipeline import rank as mod
+
+    story = {
+        "id": "id0",
+        "title": "Enterprise agent story",
+        "canonical_url": "https://example.com/0",
+        "sources": [{"name": "Test", "url": "https://example.com/0"}],
+        "published_at": (datetime.now(tz=timezone.utc) - timedelta(days=1)).isoformat(),
+        "raw_content": "Some content.",
+    }
+    client = MagicMock()
+    client.chat.completions.create.side_effect = Exception("timeout")
+
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    (data_dir / "normalized.json").write_text(json.dumps([story]))
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(mod, "get_client", lambda: client)
+    monkeypatch.setattr(mod, "_load_source_weights", lambda: {})
+
+    mod.main()
+
+    assert json.loads((data_dir / "score_cache.json").read_text()) == {}
+
+
+# ── Batch planner tests ──────────────────────────────────────────────────────
+
+def _story_with_content(i: int, content: str) -> Story:
+    story = MOCK_STORY.model_copy(deep=True)
+    story.id = f"id{i}"
+    story.raw_content = content
+    return story
+
+
+def test_plan_batches_packs_to_token_budget():
+    from pipeline.rank import plan_batches, estimate_tokens, _rank_story_text
+
+    stories = [_story_with_content(i, "x" * 400) for i in range(12)]
+    budget = 500
+    batches = plan_batches(stories, _rank_story_text, prompt_overhead=100, token_budget=budget)
+
+    assert [s.id for b in batches for s in b] == [s.id for s in stories]   # order kept
+    assert len(batches) > 1
+    for batch in batches:
+        used = 100 + sum(estimate_tokens(_rank_story_text(i, s)) for i, s in enumerate(batch))
+        assert used <= budget
+
+
+def test_plan_batches_short_stories_share_a_call():
+    from pipeline.rank import plan_batches, _rank_story_text
+
+    stories = [_story_with_content(i, "short") for i in range(12)]
+    batches = plan_batches(stories, _rank_story_text, prompt_overhead=100, token_budget=6000)
+    assert len(batches) == 1
+
+
+def test_plan_batches_caps_stories_per_batch():
+    from pipeline.rank import plan_batches, _rank_story_text
+
+    stories = [_story_with_content(i, "short") for i in range(25)]
+    batches = plan_batches(stories, _rank_story_text, prompt_overhead=0, token_budget=100_000, max_stories=10)
+    assert [len(b) for b in batches] == [10, 10, 5]
+
+
+def test_plan_batches_oversized_story_gets_own_batch():
+    from pipeline.rank import plan_batches, _rank_story_text
+
+    stories = [_story_with_content(0, "short"), _story_with_content(1, "short")]
+    stories[0].title = "x" * 10_000
+    batches = plan_batches(stories, _rank_story_text, prompt_overhead=0, token_budget=200)
+    assert [[s.id for s in b] for b in batches] == [["id0"], ["id1"]]
+
+
+# ── Combined rank + SDLC prompt tests ────────────────────────────────────────
+
+MOCK_COMBINED_RESPONSE = json.dumps({
+    "stories": [
+        {
+            "index": 0,
+            "scores": {"enterprise_software_delivery": 85, "enterprise_solutions": 40, "finance_utilities": 5, "general_significance": 60},
+            "include": True,
+            "sdlc_tags": ["tooling", "marketing"],
+        },
+        {
+            "index": 1,
+            "scores": {"enterprise_software_delivery": 70, "enterprise_solutions": 10, "finance_utilities": 5, "general_significance": 30},
+            "include": True,
+        },
+    ]
+})
+
+
+def test_rank_batch_combined_assigns_tags():
+    mock_client = MagicMock()
+    mock_client.chat.completions.create.return_value = MagicMock(
+        choices=[MagicMock(message=MagicMock(content=MOCK_COMBINED_RESPONSE))]
+    )
+    story_a = MOCK_STORY.model_copy(deep=True)
+    story_b = MOCK_STORY.model_copy(deep=True)
+    story_b.id = "other"
+    results = rank_batch([story_a, story_b], mock_client, combined=True)
+
+    assert [s.priority_score for s in results] == [85, 70]
+    assert results[0].sdlc_tags == ["tooling"]     # unknown tags dropped
+    assert results[1].sdlc_tags == []              # left for the classification pass
+    prompt = mock_client.chat.completions.create.call_args.kwargs["messages"][1]["content"]
+    assert "SDLC tags" in prompt
+
+
+def test_main_combined_mode_ranks_and_tags_in_one_call(monkeypatch, tmp_path):
+    from pipeline import rank as mod
+
+    stories = [
+        {
+            "id": f"id{i}",
+            "title": f"Enterprise agent story {i}",
+            "canonical_url": f"https://example.com/{i}",
+            "sources": [{"name": "Test", "url": f"https://example.com/{i}"}],
+            "published_at": (datetime.now(tz=timezone.utc) - timedelta(days=1)).isoformat(),
+            "raw_content": "Some content.",
+        }
+        for i in range(8)
+    ]
+    response = json.dumps({"stories": [
+        {
+            "index": i,
+            "scores": {"enterprise_software_delivery": 80, "enterprise_solutions": 10, "finance_utilities": 5, "general_significance": 30},
+            "include": True,
+            "sdlc_tags": ["ai-agents"],
+        }
+        for i in range(8)
+    ]})
+    client = MagicMock()
+    client.chat.completions.create.return_value = MagicMock(
+        choices=[MagicMock(message=MagicMock(content=response))]
+    )
+
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    (data_dir / "normalized.json").write_text(json.dumps(stories))
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("RANK_COMBINED", "1")
+    monkeypatch.setattr(mod, "get_client", lambda: client)
+    monkeypatch.setattr(mod, "_load_source_weights", lambda: {})
+
+    mod.main()
+
+    assert client.chat.completions.create.call_count == 1
+    output = json.loads((data_dir / "ranked.json").read_text())
+    assert output["personal_items"]
+    assert all(item["sdlc_tags"] == ["ai-agents"] for item in output["personal_items"])
+    cache = json.loads((data_dir / "score_cache.json").read_text())
+    assert all(entry["sdlc_tags"] == ["ai-agents"] for entry in cache.values())
+
+
+# ── Rate limiting tests ──────────────────────────────────────────────────────
+
+def test_rank_batch_retries_after_server_retry_after(monkeypatch):
+    import httpx
+    from openai import RateLimitError
+    from pipeline.ratelimit import limiter_for
+
+    waits = []
+    limiter = limiter_for("openai/gpt-4o-mini")
+    monkeypatch.setattr(limiter, "_sleep", waits.append)
+
+    request = httpx.Request("POST", "https://models.github.ai/inference/chat/completions")
+    rate_limited = RateLimitError(
+        "Too many requests",
+        response=httpx.Response(429, headers={"Retry-After": "3"}, request=request),
+        body=None,
+    )
+    mock_client = MagicMock()
+    mock_client.chat.completions.create.side_effect = [
+        rate_limited,
+        MagicMock(choices=[MagicMock(message=MagicMock(content=MOCK_BATCH_RESPONSE))]),
+    ]
+    results = rank_batch([MOCK_STORY.model_copy(deep=True)], mock_client)
+
+    assert len(results) == 1
+    assert len(waits) == 1 and 2 < waits[0] <= 3
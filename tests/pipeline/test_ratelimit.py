@@ -0,0 +1,135 @@
+import json
+import httpx
+import pytest
+from pipeline.ratelimit import (
+    RateLimiter,
+    RateLimitExhausted,
+    _parse_duration,
+    limiter_for,
+    observe_response,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def make_limiter(per_minute=15, per_day=150, max_wait=120):
+    clock = FakeClock()
+    return RateLimiter(per_minute, per_day, max_wait=max_wait, clock=clock, sleep=clock.sleep), clock
+
+
+def test_burst_up_to_per_minute_capacity_without_waiting():
+    limiter, clock = make_limiter(per_minute=15)
+    for _ in range(15):
+        assert limiter.acquire() == 0
+    assert clock.sleeps == []
+
+
+def test_waits_for_refill_once_minute_bucket_is_empty():
+    limiter, clock = make_limiter(per_minute=15)
+    for _ in range(15):
+        limiter.acquire()
+    limiter.acquire()
+    assert clock.sleeps == [pytest.approx(4.0)]   # 60s / 15 requests
+
+
+def test_daily_budget_exhaustion_raises_instead_of_sleeping():
+    limiter, clock = make_limiter(per_minute=100, per_day=3)
+    for _ in range(3):
+        limiter.acquire()
+    with pytest.raises(RateLimitExhausted):
+        limiter.acquire()
+    assert clock.sleeps == []
+
+
+def test_retry_after_header_pauses_requests():
+    limiter, clock = make_limiter()
+    assert limiter.retry_after({"Retry-After": "7"})
+    limiter.acquire()
+    assert clock.sleeps == [pytest.approx(7.0)]
+
+
+def test_retry_after_without_hint_returns_false():
+    limiter, _ = make_limiter()
+    assert not limiter.retry_after({})
+    assert limiter.wait_time() == 0
+
+
+def test_remaining_requests_header_clamps_bucket():
+    limiter, clock = make_limiter(per_minute=15)
+    limiter.observe({"x-ratelimit-remaining-requests": "1"})
+    limiter.acquire()
+    limiter.acquire()
+    assert len(clock.sleeps) == 1
+
+
+def test_zero_remaining_waits_for_reset():
+    limiter, clock = make_limiter()
+    limiter.observe({"x-ratelimit-remaining-requests": "0", "x-ratelimit-reset-requests": "30s"})
+    limiter.acquire()
+    assert clock.sleeps == [pytest.approx(30.0)]
+
+
+def test_zero_remaining_with_long_reset_raises():
+    limiter, _ = make_limiter()
+    limiter.observe({"x-ratelimit-remaining-requests": "0", "x-ratelimit-reset-requests": "5h0m0s"})
+    with pytest.raises(RateLimitExhausted):
+        limiter.acquire()
+
+
+@pytest.mark.parametrize("value,expected", [
+    ("12", 12.0),
+    ("1.5", 1.5),
+    ("6m0s", 360.0),
+    ("20ms", 0.02),
+    ("1h2m3s", 3723.0),
+    ("soon", None),
+    (None, None),
+])
+def test_parse_duration(value, expected):
+    assert _parse_duration(value) == (pytest.approx(expected) if expected is not None else None)
+
+
+def test_limiter_for_shares_one_limiter_per_model():
+    assert limiter_for("openai/gpt-4o-mini") is limiter_for("openai/gpt-4o-mini")
+    assert limiter_for("openai/gpt-4o-mini") is not limiter_for("openai/gpt-4o")
+
+
+def test_observe_response_routes_headers_by_request_model():
+    request = httpx.Request(
+        "POST",
+        "https://models.github.ai/inference/chat/completions",
+        content=json.dumps({"model": "openai/gpt-4o"}).encode(),
+    )
+    response = httpx.Response(429, headers={"Retry-After": "30"}, request=request)
+    observe_response(response)
+
+    assert limiter_for("openai/gpt-4o").wait_time() == pytest.approx(30, abs=1)
+    assert limiter_for("openai/gpt-4o-mini").wait_time() == 0
+
+
+async def test_acquire_async_queues_concurrent_callers(monkeypatch):
+    import asyncio
+    from pipeline import ratelimit
+
+    waits = []
+
+    async def fake_sleep(seconds):
+        waits.append(seconds)
+
+    monkeypatch.setattr(ratelimit.asyncio, "sleep", fake_sleep)
+    limiter, _ = make_limiter(per_minute=2)
+    await asyncio.gather(*(limiter.acquire_async() for _ in range(4)))
+
+    # Two free slots, then each caller reserves a later slot than the one before
+    assert waits == [pytest.approx(30.0), pytest.approx(60.0)]
@@ -0,0 +1,98 @@
+import argparse
+import json
+from datetime import datetime, timezone, timedelta
+from unittest.mock import MagicMock
+
+import pytest
+
+import pipeline.__main__ as runner
+from pipeline.fetch import save_stories
+from pipeline.rank import SDLC_CLASSIFY_SYSTEM_PROMPT
+from schemas.story import Story
+
+RANK_RESPONSE = json.dumps({
+    "stories": [
+        {
+            "index": 0,
+            "scores": {
+                "enterprise_software_delivery": 85,
+                "enterprise_solutions": 70,
+                "finance_utilities": 30,
+                "general_significance": 90,
+            },
+            "include": True,
+        },
+    ]
+})
+
+
+def _story(i: int, source: str) -> Story:
+    return Story.from_url(
+        url=f"https://example.com/{i}",
+        title=f"Enterprise agent platform launch number {i}",
+        source_name=source,
+        published_at=datetime.now(tz=timezone.utc) - timedelta(days=1),
+        raw_content="Some content.",
+    )
+
+
+@pytest.fixture
+def workdir(monkeypatch, tmp_path):
+    """data/raw/ with the same story from two sources, and a canned rank client."""
+    save_stories([_story(0, "One")], str(tmp_path / "data" / "raw" / "one.json"))
+    save_stories([_story(0, "Two")], str(tmp_path / "data" / "raw" / "two.json"))
+
+    def respond(model, messages, **kwargs):
+        if messages[0]["content"] == SDLC_CLASSIFY_SYSTEM_PROMPT:
+            content = json.dumps({"stories": [{"index": 0, "sdlc_tags": ["tooling"]}]})
+        else:
+            content = RANK_RESPONSE
+        return MagicMock(choices=[MagicMock(message=MagicMock(content=content))])
+
+    client = MagicMock()
+    client.chat.completions.create.side_effect = respond
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(runner, "get_client", lambda: client)
+    monkeypatch.setattr(runner, "_load_source_weights", lambda: {})
+    return tmp_path
+
+
+def test_selected_stages_runs_from_through_until():
+    assert runner.selected_stages("normalize", "summarize") == ["normalize", "rank", "summarize"]
+    assert runner.selected_stages("fetch", "publish", ["deliver"]) == [
+        "fetch", "normalize", "rank", "summarize", "publish",
+    ]
+
+
+def test_selected_stages_rejects_reversed_range():
+    with pytest.raises(ValueError):
+        runner.selected_stages("rank", "normalize")
+
+
+def test_run_hands_stories_between_stages_in_memory(workdir):
+    runner.main(["run", "--from", "normalize", "--skip", "summarize", "--skip", "deliver"])
+
+    assert not (workdir / "data" / "normalized.json").exists()
+    assert not (workdir / "data" / "ranked.json").exists()
+    rdradar = json.loads((workdir / "data" / "rdradar.json").read_text())
+    assert [item["url"] for item in rdradar["items"]] == ["https://example.com/0"]
+
+    stages = json.loads((workdir / "run_metrics.json").read_text())["stages"]
+    assert set(stages) == {"normalize", "rank", "publish"}
+    assert stages["rank"]["status"] == "ok"
+
+
+def test_run_dump_writes_stage_artifacts(workdir):
+    state = runner.run(["normalize", "rank"], argparse.Namespace(dump=True))
+
+    normalized = json.loads((workdir / "data" / "normalized.json").read_text())
+    assert len(normalized) == 1 and len(normalized[0]["sources"]) == 2   # merged in memory
+    ranked = json.loads((workdir / "data" / "ranked.json").read_text())
+    assert [s["title"] for s in ranked["personal_items"]] == [s.title for s in state["ranked"]["personal_items"]]
+
+
+def test_run_from_later_stage_reads_previous_artifact(workdir):
+    runner.main(["run", "--until", "normalize", "--from", "normalize", "--dump"])
+    state = runner.run(["rank"], argparse.Namespace(dump=False))
+
+    assert state["ranked"]["personal_items"][0].sdlc_tags == ["tooling"]
@@ -0,0 +1,103 @@
+from datetime import datetime, timezone, timedelta
+from pipeline.store import StoryStore, open_store
+from schemas.story import Story
+
+
+def make_story(url, title="Story", days_ago=1):
+    return Story.from_url(
+        url=url,
+        title=title,
+        source_name="Test",
+        published_at=datetime.now(tz=timezone.utc) - timedelta(days=days_ago),
+        raw_content="content",
+    )
+
+
+def test_write_and_read_stage_preserves_order(tmp_path):
+    stories = [make_story(f"https://example.com/{i}", f"Story {i}") for i in range(5)]
+    with StoryStore(tmp_path / "stories.db") as store:
+        store.write_stage("normalized", {"stories": list(reversed(stories))})
+        loaded = store.read_stage("normalized", "stories")
+
+    assert [s.title for s in loaded] == ["Story 4", "Story 3", "Story 2", "Story 1", "Story 0"]
+    assert loaded[0].published_at.tzinfo is not None
+
+
+def test_read_stage_filters_by_published_at(tmp_path):
+    fresh = make_story("https://example.com/fresh", days_ago=2)
+    old = make_story("https://example.com/old", days_ago=20)
+    with StoryStore(tmp_path / "stories.db") as store:
+        store.write_stage("normalized", {"stories": [fresh, old]})
+        cutoff = datetime.now(tz=timezone.utc) - timedelta(days=14)
+        loaded = store.read_stage("normalized", "stories", published_since=cutoff)
+
+    assert [s.canonical_url for s in loaded] == ["https://example.com/fresh"]
+
+
+def test_write_stage_replaces_previous_lists(tmp_path):
+    a = make_story("https://example.com/a")
+    b = make_story("https://example.com/b")
+    with StoryStore(tmp_path / "stories.db") as store:
+        store.write_stage("ranked", {"personal_items": [a, b], "enterprise_items": [a]})
+        store.write_stage("ranked", {"personal_items": [b]})
+        assert [s.id for s in store.read_stage("ranked", "personal_items")] == [b.id]
+        assert store.read_stage("ranked", "enterprise_items") == []
+        # Rows survive across stage rewrites — the store keeps history
+        assert len(store.get([a.id, b.id])) == 2
+
+
+def test_upsert_updates_changed_story(tmp_path):
+    story = make_story("https://example.com/a")
+    with StoryStore(tmp_path / "stories.db") as store:
+        store.upsert([story])
+        story.priority_category = "enterprise_solutions"
+        story.priority_score = 70
+        store.upsert([story])
+        (loaded,) = store.get([story.id])
+
+    assert loaded.priority_score == 70
+
+
+def test_published_since_spans_runs(tmp_path):
+    path = tmp_path / "stories.db"
+    with StoryStore(path) as store:
+        store.write_stage("normalized", {"stories": [make_story("https://example.com/week1", days_ago=8)]})
+    with StoryStore(path) as store:
+        store.write_stage("normalized", {"stories": [make_story("https://example.com/week2", days_ago=1)]})
+        history = store.published_since(datetime.now(tz=timezone.utc) - timedelta(days=30))
+
+    assert [s.canonical_url for s in history] == ["https://example.com/week2", "https://example.com/week1"]
+
+
+def test_open_store_disabled_without_env(monkeypatch):
+    monkeypatch.delenv("STORY_STORE", raising=False)
+    assert open_store() is None
+
+
+def test_rank_main_reads_from_store(monkeypatch, tmp_path):
+    from pipeline import rank as mod
+
+    db = tmp_path / "data" / "stories.db"
+    with StoryStore(db) as store:
+        store.write_stage("normalized", {"stories": [
+            make_story("https://example.com/fresh", days_ago=2),
+            make_story("https://example.com/old", days_ago=20),
+        ]})
+
+    seen = []
+
+    def fake_presort(stories, weights, limit=40):
+        seen.extend(stories)
+        return []
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("STORY_STORE", str(db))
+    monkeypatch.setattr(mod, "presort_and_limit", fake_presort)
+    monkeypatch.setattr(mod, "get_client", lambda: None)
+    monkeypatch.setattr(mod, "_load_source_weights", lambda: {})
+
+    mod.main()
+
+    assert [s.canonical_url for s in seen] == ["https://example.com/fresh"]
+    with StoryStore(db) as store:
+        assert store.stage_lists("ranked") == []   # nothing ranked, nothing recorded
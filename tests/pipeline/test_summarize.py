@@ -1,7 +1,9 @@
 import json
-from unittest.mock import MagicMock
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
 from datetime import datetime, timedelta, timezone
-from pipeline.summarize import summarize_story, pick_top3, load_cache, save_cache
+import pytest
+from pipeline.summarize import summarize_story, pick_top3
 from pipeline import summarize as mod
 from schemas.story import Story
 
@@ -47,6 +49,38 @@ def test_summarize_story_handles_llm_failure():
     assert result.summary is None
 
 
+async def test_summarize_story_async_retries_429_through_the_rate_limiter():
+    import httpx
+    from openai import RateLimitError
+    from pipeline.metrics import current_metrics, reset_metrics
+
+    reset_metrics()
+    request = httpx.Request("POST", "https://models.github.ai/inference/chat/completions")
+    rate_limited = RateLimitError(
+        "Too many requests",
+        response=httpx.Response(429, headers={"Retry-After": "0.01"}, request=request),
+        body=None,
+    )
+    mock_client = MagicMock()
+    mock_client.chat.completions.create = AsyncMock(side_effect=[
+        rate_limited,
+        MagicMock(choices=[MagicMock(message=MagicMock(content=MOCK_SUMMARY))]),
+    ])
+    result = await mod.summarize_story_async(MOCK_STORY.model_copy(deep=True), mock_client)
+
+    assert result.summary is not None
+    assert mock_client.chat.completions.create.await_count == 2
+    assert [c["attempt"] for c in current_metrics().llm_calls] == [0, 1]
+
+
+def test_clients_leave_retries_to_the_rate_limiter(monkeypatch):
+    from pipeline.common import get_async_client, get_client
+
+    monkeypatch.setenv("GITHUB_TOKEN", "test-token")
+    assert get_client().max_retries == 0
+    assert get_async_client().max_retries == 0
+
+
 def test_pick_top3_selects_highest_scoring_across_categories():
     stories_by_category = {}
     for cat in ["enterprise_software_delivery", "enterprise_solutions", "finance_utilities"]:
@@ -79,13 +113,13 @@ def test_main_summarises_only_top3(monkeypatch, tmp_path):
 
     call_count = {"n": 0}
 
-    def fake_summarize(story, client, cache=None):
+    async def fake_summarize(story, client, cache=None):
         call_count["n"] += 1
         return story
 
     monkeypatch.chdir(tmp_path)
-    monkeypatch.setattr(mod, "summarize_story", fake_summarize)
-    monkeypatch.setattr(mod, "get_client", lambda: None)
+    monkeypatch.setattr(mod, "summarize_story_async", fake_summarize)
+    monkeypatch.setattr(mod, "get_async_client", lambda: None)
 
     mod.main()
 
@@ -93,6 +127,26 @@ def test_main_summarises_only_top3(monkeypatch, tmp_path):
     assert call_count["n"] == 1
 
 
+def test_main_closes_summary_cache_when_summarizing_fails(monkeypatch, tmp_path):
+    from pipeline.summary_cache import SummaryCache
+
+    (tmp_path / "data").mkdir()
+    (tmp_path / "data" / "ranked.json").write_text(json.dumps({"personal_items": [], "enterprise_items": []}))
+    closed = []
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("models API down")
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(mod, "get_async_client", lambda: None)
+    monkeypatch.setattr(mod, "summarize_ranked", fail)
+    monkeypatch.setattr(SummaryCache, "close", lambda self: closed.append(self))
+
+    with pytest.raises(RuntimeError):
+        mod.main()
+    assert len(closed) == 1
+
+
 def test_pick_top3_prefers_fresh_over_stale():
     """A fresh story with equal score must beat a stale one for top 3."""
     fresh = MOCK_STORY.model_copy(deep=True)
@@ -112,43 +166,6 @@ def test_pick_top3_prefers_fresh_over_stale():
     assert top3[1].id == "stale"
 
 
-def test_load_cache_returns_empty_dict_when_file_missing(tmp_path):
-    cache = load_cache(tmp_path / "no_such_file.json")
-    assert cache == {}
-
-
-def test_load_cache_evicts_entries_older_than_14_days(tmp_path):
-    old_entry = {
-        "summary": {"what_happened": "old", "enterprise_impact": "x",
-                     "software_delivery_impact": "x", "developer_impact": "x",
-                     "human_impact": "x", "how_to_use": "x"},
-        "cached_at": (datetime.now(tz=timezone.utc) - timedelta(days=20)).isoformat(),
-    }
-    fresh_entry = {
-        "summary": {"what_happened": "fresh", "enterprise_impact": "x",
-                    "software_delivery_impact": "x", "developer_impact": "x",
-                    "human_impact": "x", "how_to_use": "x"},
-        "cached_at": (datetime.now(tz=timezone.utc) - timedelta(days=2)).isoformat(),
-    }
-    cache_file = tmp_path / "summary_cache.json"
-    cache_file.write_text(json.dumps({
-        "https://old.com": old_entry,
-        "https://fresh.com": fresh_entry,
-    }))
-
-    cache = load_cache(cache_file)
-    assert "https://old.com" not in cache
-    assert "https://fresh.com" in cache
-
-
-def test_save_cache_writes_json(tmp_path):
-    cache = {"https://example.com": {"summary": {}, "cached_at": "2026-02-28T00:00:00+00:00"}}
-    path = tmp_path / "data" / "summary_cache.json"
-    save_cache(cache, path)
-    assert path.exists()
-    assert json.loads(path.read_text()) == cache
-
-
 def test_summarize_story_uses_cache_hit():
     cache = {
         "https://openai.com/gpt-5": {
@@ -187,3 +204,182 @@ def test_summarize_story_populates_cache_on_miss():
     assert "https://openai.com/gpt-5" in cache
     assert "cached_at" in cache["https://openai.com/gpt-5"]
     assert cache["https://openai.com/gpt-5"]["summary"]["what_happened"] != ""
+
+
+# ── Concurrent summarization tests ───────────────────────────────────────────
+
+def _story(i: int, category: str = "enterprise_software_delivery", score: int = 80) -> Story:
+    s = Story.from_url(
+        url=f"https://example.com/{i}",
+        title=f"Story {i}",
+        source_name="Test",
+        published_at=datetime.now(tz=timezone.utc) - timedelta(days=1),
+        raw_content="Some content.",
+    )
+    s.priority_category = category
+    s.priority_score = score
+    return s
+
+
+async def test_summarize_story_async_populates_summary_and_cache():
+    client = MagicMock()
+    client.chat.completions.create = AsyncMock(
+        return_value=MagicMock(choices=[MagicMock(message=MagicMock(content=MOCK_SUMMARY))])
+    )
+    cache = {}
+    story = await mod.summarize_story_async(MOCK_STORY.model_copy(deep=True), client, cache)
+
+    assert "GPT-5" in story.summary.what_happened
+    assert "https://openai.com/gpt-5" in cache
+
+
+async def test_summarize_story_async_handles_llm_failure():
+    client = MagicMock()
+    client.chat.completions.create = AsyncMock(side_effect=Exception("API timeout"))
+    story = await mod.summarize_story_async(MOCK_STORY.model_copy(deep=True), client)
+    assert story.summary is None
+
+
+async def test_summarize_stories_bounds_concurrency_and_keeps_order():
+    in_flight = {"now": 0, "max": 0}
+
+    async def create(**kwargs):
+        in_flight["now"] += 1
+        in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        await asyncio.sleep(0.01)
+        in_flight["now"] -= 1
+        return MagicMock(choices=[MagicMock(message=MagicMock(content=MOCK_SUMMARY))])
+
+    client = MagicMock()
+    client.chat.completions.create = create
+    stories = [_story(i) for i in range(6)]
+
+    results = await mod.summarize_stories(stories, client, cache={}, max_concurrency=2)
+
+    assert [s.id for s in results] == [s.id for s in stories]
+    assert all(s.summary is not None for s in results)
+    assert in_flight["max"] == 2
+
+
+async def test_summarize_stories_skips_llm_for_cached_urls():
+    story = MOCK_STORY.model_copy(deep=True)
+    cache = {story.canonical_url: {"summary": json.loads(MOCK_SUMMARY), "cached_at": datetime.now(tz=timezone.utc).isoformat()}}
+    client = MagicMock()
+    client.chat.completions.create = AsyncMock()
+
+    await mod.summarize_stories([story], client, cache)
+
+    client.chat.completions.create.assert_not_called()
+    assert story.summary is not None
+
+
+def test_pick_category_leads_skips_top3_and_duplicates():
+    a, b, c = _story(1, "enterprise_solutions"), _story(2, "enterprise_solutions"), _story(3, "finance_utilities")
+    leads = mod.pick_category_leads(
+        {"enterprise_solutions": [a, b], "finance_utilities": [c]},
+        per_category=1,
+        exclude=[a],
+    )
+    assert [s.id for s in leads] == [c.id]
+
+
+def test_main_summarizes_category_leads_when_enabled(monkeypatch, tmp_path):
+    stories = [_story(i, cat, 90 - i) for i, cat in enumerate([
+        "enterprise_software_delivery", "enterprise_software_delivery", "enterprise_software_delivery",
+        "enterprise_software_delivery", "finance_utilities",
+    ])]
+    ranked = {"personal_items": [s.model_dump(mode="json") for s in stories], "enterprise_items": []}
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    (data_dir / "ranked.json").write_text(json.dumps(ranked))
+
+    summarized_ids = []
+
+    async def fake_summarize(story, client, cache=None):
+        summarized_ids.append(story.id)
+        story.summary = mod.StorySummary(**json.loads(MOCK_SUMMARY))
+        return story
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("SUMMARIZE_CATEGORY_LEADS", "1")
+    monkeypatch.setattr(mod, "summarize_story_async", fake_summarize)
+    monkeypatch.setattr(mod, "get_async_client", lambda: None)
+
+    mod.main()
+
+    # Top 3 come from the delivery category; the finance lead is summarized too
+    assert len(summarized_ids) == 4
+    assert stories[4].id in summarized_ids
+    output = json.loads((data_dir / "summarized.json").read_text())
+    assert len(output["top3"]) == 3
+    assert output["categories"]["finance_utilities"][0]["summary"] is not None
+
+
+# ── Content-fingerprint cache tests ──────────────────────────────────────────
+
+ARTICLE = " ".join(f"token{i % 97} detail{i}" for i in range(150))
+
+
+def _fingerprinted_cache(story: Story) -> dict:
+    return {
+        story.canonical_url: {
+            "summary": json.loads(MOCK_SUMMARY),
+            "fingerprint": mod._content_fingerprint(story),
+            "cached_at": datetime.now(tz=timezone.utc).isoformat(),
+        }
+    }
+
+
+def _article_story(url: str, content: str = ARTICLE) -> Story:
+    return Story.from_url(
+        url=url,
+        title="GPT-5 launches with enterprise API",
+        source_name="OpenAI",
+        published_at=datetime(2026, 2, 24, tzinfo=timezone.utc),
+        raw_content=content,
+    )
+
+
+def test_summarize_story_reuses_summary_for_syndicated_copy():
+    cache = _fingerprinted_cache(_article_story("https://openai.com/gpt-5"))
+    mock_client = MagicMock()
+    copy = _article_story("https://news.example.com/openai-gpt-5", ARTICLE + " Subscribe for more.")
+
+    result = summarize_story(copy, mock_client, cache=cache)
+
+    mock_client.chat.completions.create.assert_not_called()
+    assert result.summary is not None
+    assert "https://news.example.com/openai-gpt-5" in cache
+
+
+def test_summarize_story_resummarizes_materially_changed_article():
+    cache = _fingerprinted_cache(_article_story("https://openai.com/gpt-5"))
+    mock_client = MagicMock()
+    mock_client.chat.completions.create.return_value = MagicMock(
+        choices=[MagicMock(message=MagicMock(content=MOCK_SUMMARY))]
+    )
+    rewritten = _article_story(
+        "https://openai.com/gpt-5",
+        " ".join(f"rewrite{i} paragraph{i % 13}" for i in range(150)),
+    )
+
+    summarize_story(rewritten, mock_client, cache=cache)
+
+    mock_client.chat.completions.create.assert_called_once()
+    assert cache["https://openai.com/gpt-5"]["fingerprint"] == mod._content_fingerprint(rewritten)
+
+
+def test_summarize_story_keeps_summary_after_minor_edit():
+    cache = _fingerprinted_cache(_article_story("https://openai.com/gpt-5"))
+    mock_client = MagicMock()
+    edited = _article_story("https://openai.com/gpt-5", ARTICLE.replace("detail5 ", "detail5 (updated) ", 1))
+
+    summarize_story(edited, mock_client, cache=cache)
+
+    mock_client.chat.completions.create.assert_not_called()
+
+
+def test_find_cached_summary_ignores_unrelated_stories():
+    cache = _fingerprinted_cache(_article_story("https://openai.com/gpt-5"))
+    other = _article_story("https://example.com/other", " ".join(f"unrelated{i}" for i in range(200)))
+    assert mod.find_cached_summary(other, cache) is None
@@ -0,0 +1,112 @@
+import json
+from datetime import datetime, timedelta, timezone
+from pipeline.summary_cache import SummaryCache
+
+
+def _entry(days_old: float = 0, text: str = "Summary.") -> dict:
+    return {
+        "summary": {"what_happened": text},
+        "cached_at": (datetime.now(tz=timezone.utc) - timedelta(days=days_old)).isoformat(),
+    }
+
+
+def _lines(path):
+    return path.read_text().splitlines()
+
+
+def test_entries_survive_reopen(tmp_path):
+    path = tmp_path / "cache.jsonl"
+    with SummaryCache(path, legacy_path=None) as cache:
+        cache["https://a"] = _entry(text="A")
+        cache["https://b"] = _entry(text="B")
+
+    reopened = SummaryCache(path, legacy_path=None)
+    assert reopened["https://a"]["summary"]["what_happened"] == "A"
+    assert set(reopened) == {"https://a", "https://b"}
+
+
+def test_writes_append_instead_of_rewriting(tmp_path):
+    path = tmp_path / "cache.jsonl"
+    cache = SummaryCache(path, legacy_path=None)
+    cache["https://a"] = _entry()
+    first_line = _lines(path)[0]
+    cache["https://b"] = _entry()
+
+    assert len(_lines(path)) == 2
+    assert _lines(path)[0] == first_line
+
+
+def test_expired_entries_dropped_on_load(tmp_path):
+    path = tmp_path / "cache.jsonl"
+    with SummaryCache(path, legacy_path=None) as cache:
+        cache["https://old"] = _entry(days_old=15)
+        cache["https://new"] = _entry(days_old=1)
+
+    assert list(SummaryCache(path, legacy_path=None)) == ["https://new"]
+
+
+def test_least_recently_written_entry_evicted_over_size_limit(tmp_path):
+    path = tmp_path / "cache.jsonl"
+    with SummaryCache(path, max_entries=2, legacy_path=None) as cache:
+        cache["https://a"] = _entry()
+        cache["https://b"] = _entry()
+        cache["https://a"] = cache["https://a"]   # a cache hit re-writes the entry
+        cache["https://c"] = _entry()
+        assert set(cache) == {"https://a", "https://c"}
+
+    assert set(SummaryCache(path, max_entries=2, legacy_path=None)) == {"https://a", "https://c"}
+
+
+def test_delete_is_journaled(tmp_path):
+    path = tmp_path / "cache.jsonl"
+    with SummaryCache(path, legacy_path=None) as cache:
+        cache["https://a"] = _entry()
+        del cache["https://a"]
+
+    assert len(SummaryCache(path, legacy_path=None)) == 0
+
+
+def test_torn_last_line_is_ignored(tmp_path):
+    path = tmp_path / "cache.jsonl"
+    with SummaryCache(path, legacy_path=None) as cache:
+        cache["https://a"] = _entry()
+    with path.open("a") as f:
+        f.write('{"key": "https://b", "entr')
+
+    with SummaryCache(path, legacy_path=None) as cache:
+        assert list(cache) == ["https://a"]
+        cache["https://c"] = _entry()
+
+    assert list(SummaryCache(path, legacy_path=None)) == ["https://a", "https://c"]
+
+
+def test_close_compacts_superseded_lines(tmp_path):
+    path = tmp_path / "cache.jsonl"
+    cache = SummaryCache(path, legacy_path=None)
+    for i in range(100):
+        cache["https://a"] = _entry(text=f"v{i}")
+    cache.close()
+
+    assert len(_lines(path)) == 1
+    assert SummaryCache(path, legacy_path=None)["https://a"]["summary"]["what_happened"] == "v99"
+
+
+def test_small_journal_is_not_compacted(tmp_path):
+    path = tmp_path / "cache.jsonl"
+    cache = SummaryCache(path, legacy_path=None)
+    cache["https://a"] = _entry()
+    cache["https://a"] = _entry()
+    cache.close()
+
+    assert len(_lines(path)) == 2
+
+
+def test_seeds_from_legacy_json_cache(tmp_path):
+    legacy = tmp_path / "summary_cache.json"
+    legacy.write_text(json.dumps({"https://a": _entry(), "https://old": _entry(days_old=30)}))
+    path = tmp_path / "cache.jsonl"
+
+    cache = SummaryCache(path, legacy_path=legacy)
+
+    assert list(cache) == ["https://a"]
+    assert len(_lines(path)) == 1
@@ -1,6 +1,11 @@
+import asyncio
+import threading
+import httpx
+import pytest
+import respx
 import yaml
 from unittest.mock import patch, MagicMock
-from pipeline.validate_feeds import validate_sources, load_sources
+from pipeline.validate_feeds import _get_with_deadline, validate_sources, load_sources
 
 
 def test_load_sources_reads_yaml(tmp_path):
@@ -19,7 +24,8 @@ def test_validate_sources_marks_working_feed_as_active():
 
     sources = [{"name": "test", "type": "rss", "url": "https://test.com/rss", "weight": "high"}]
 
-    with patch("pipeline.validate_feeds.feedparser.parse", return_value=mock_feed):
+    with respx.mock, patch("pipeline.validate_feeds.feedparser.parse", return_value=mock_feed):
+        respx.get("https://test.com/rss").mock(return_value=httpx.Response(200, text="<rss/>"))
         results = validate_sources(sources)
 
     assert results[0]["status"] == "active"
@@ -33,16 +39,15 @@ def test_validate_sources_marks_dead_feed_as_skipped():
 
     sources = [{"name": "dead", "type": "rss", "url": "https://dead.com/rss", "weight": "high"}]
 
-    with patch("pipeline.validate_feeds.feedparser.parse", return_value=mock_feed):
+    with respx.mock, patch("pipeline.validate_feeds.feedparser.parse", return_value=mock_feed):
+        respx.get("https://dead.com/rss").mock(return_value=httpx.Response(200, text="garbage"))
         results = validate_sources(sources)
 
     assert results[0]["status"] == "skipped"
+    assert results[0]["detail"] == "parse error"
 
 
 def test_validate_sources_marks_scrape_sources_as_active():
-    import respx
-    import httpx
-
     sources = [{"name": "cursor", "type": "scrape", "url": "https://cursor.com/blog", "weight": "high"}]
 
     with respx.mock:
@@ -50,3 +55,91 @@ def test_validate_sources_marks_scrape_sources_as_active():
         results = validate_sources(sources)
 
     assert results[0]["status"] == "active"
+
+
+def _hang_until(release: threading.Event):
+    """A response that doesn't arrive until release is set — no timing race to lose."""
+    async def respond(request):
+        while not release.is_set():
+            await asyncio.sleep(0.005)
+        return httpx.Response(200, text="<html></html>")
+    return respond
+
+
+def test_validate_sources_enforces_per_source_deadline():
+    sources = [
+        {"name": "slow", "type": "scrape", "url": "https://slow.com/blog", "weight": "low"},
+        {"name": "fast", "type": "scrape", "url": "https://fast.com/blog", "weight": "low"},
+    ]
+    release = threading.Event()
+    with respx.mock:
+        respx.get("https://slow.com/blog").mock(side_effect=_hang_until(release))
+        respx.get("https://fast.com/blog").mock(return_value=httpx.Response(200))
+        try:
+            results = validate_sources(sources, source_deadline=1)
+        finally:
+            release.set()
+
+    assert [r["name"] for r in results] == ["slow", "fast"]
+    assert results[0]["status"] == "skipped"
+    assert "deadline" in results[0]["detail"]
+    assert results[1]["status"] == "active"
+
+
+def test_get_with_deadline_covers_a_slow_drip_body():
+    release = threading.Event()
+
+    async def drip(request):
+        async def body():
+            while not release.is_set():
+                yield b"x"   # a byte at a time: no single read ever times out
+                await asyncio.sleep(0.005)
+        return httpx.Response(200, content=body())
+
+    with respx.mock:
+        respx.get("https://drip.com/feed").mock(side_effect=drip)
+        try:
+            with pytest.raises(TimeoutError, match="deadline"):
+                _get_with_deadline("https://drip.com/feed", 0.05)
+        finally:
+            release.set()
+
+
+def test_validate_sources_runs_checks_concurrently():
+    sources = [
+        {"name": f"s{i}", "type": "scrape", "url": f"https://s{i}.com/blog", "weight": "low"}
+        for i in range(8)
+    ]
+    # Every response waits until all 8 requests are in flight, so the checks
+    # can only finish if they run at the same time
+    all_started = threading.Barrier(8)
+
+    async def respond(request):
+        await asyncio.to_thread(all_started.wait, 5)
+        return httpx.Response(200)
+
+    with respx.mock:
+        for i in range(8):
+            respx.get(f"https://s{i}.com/blog").mock(side_effect=respond)
+        results = validate_sources(sources, max_workers=8)
+
+    assert all(r["status"] == "active" for r in results)
+
+
+def test_validate_sources_marks_unfinished_sources_when_budget_runs_out():
+    sources = [
+        {"name": "hung", "type": "scrape", "url": "https://hung.com/blog", "weight": "low"},
+        {"name": "ok", "type": "scrape", "url": "https://ok.com/blog", "weight": "low"},
+    ]
+    release = threading.Event()
+    with respx.mock:
+        respx.get("https://hung.com/blog").mock(side_effect=_hang_until(release))
+        respx.get("https://ok.com/blog").mock(return_value=httpx.Response(200))
+        try:
+            results = validate_sources(sources, overall_budget=2)
+        finally:
+            release.set()
+
+    assert results[0]["status"] == "skipped"
+    assert "budget" in results[0]["detail"]
+    assert results[1]["status"] == "active"
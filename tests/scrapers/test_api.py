@@ -74,3 +74,29 @@ def test_fetch_reddit_returns_stories():
         )
     assert len(stories) == 1
     assert "Claude" in stories[0].title
+
+
+def test_parse_reddit_points_link_posts_at_the_article():
+    from unittest.mock import MagicMock
+    from scrapers.api import parse_reddit
+
+    feed = MagicMock(bozo=False)
+    feed.entries = [
+        MagicMock(
+            title="OpenAI ships GPT-5",
+            link="https://www.reddit.com/r/OpenAI/comments/abc/openai_ships_gpt5/",
+            summary='submitted by /u/someone <br/> <span><a href="https://openai.com/gpt-5?utm_source=reddit">[link]</a></span>'
+                    ' <span><a href="https://www.reddit.com/r/OpenAI/comments/abc/">[comments]</a></span>',
+            published_parsed=_recent_tuple(1),
+        ),
+        MagicMock(
+            title="Self post about Claude",
+            link="https://www.reddit.com/r/ClaudeAI/comments/def/self_post/",
+            summary='<a href="https://www.reddit.com/r/ClaudeAI/comments/def/self_post/">[link]</a>',
+            published_parsed=_recent_tuple(1),
+        ),
+    ]
+    stories = parse_reddit(feed, "r/OpenAI")
+
+    assert stories[0].canonical_url == "https://openai.com/gpt-5?utm_source=reddit"
+    assert stories[1].canonical_url == "https://www.reddit.com/r/ClaudeAI/comments/def/self_post/"
@@ -0,0 +1,148 @@
+import hashlib
+from datetime import datetime, timezone, timedelta
+import httpx
+import pytest
+import respx
+from scrapers.canonical import (
+    canonicalize_story,
+    canonicalize_url,
+    extract_canonical_link,
+    load_redirect_cache,
+    needs_resolution,
+    resolve_redirects,
+    save_redirect_cache,
+    url_key,
+)
+from schemas.story import Story
+
+
+@pytest.mark.parametrize("url,expected", [
+    ("https://openai.com/gpt-5", "https://openai.com/gpt-5"),
+    ("http://openai.com/gpt-5/", "http://openai.com/gpt-5"),
+    ("HTTP://Example.com/a", "http://example.com/a"),
+    ("https://OpenAI.com:443/gpt-5#section", "https://openai.com/gpt-5"),
+    ("https://openai.com/gpt-5?utm_source=tldr&utm_medium=email", "https://openai.com/gpt-5"),
+    ("https://example.com/post?fbclid=abc&id=7&b=2", "https://example.com/post?b=2&id=7"),
+    ("https://techcrunch.com/2026/10/01/story/amp/", "https://techcrunch.com/2026/10/01/story"),
+    ("https://example.com/news/story/amp?amp=1", "https://example.com/news/story"),
+    # /amp is a page of its own on other hosts, and amp.dev is not an AMP subdomain
+    ("https://www.example.com/products/amp", "https://www.example.com/products/amp"),
+    ("https://amp.dev/blog/post", "https://amp.dev/blog/post"),
+    ("https://example.com/news/story?amp=1", "https://example.com/news/story"),
+    ("https://example.com/news/story?outputType=amp", "https://example.com/news/story"),
+    ("https://example.com/glossary?amp=voltage", "https://example.com/glossary?amp=voltage"),
+    ("https://amp.example.com/news/story", "https://example.com/news/story"),
+    ("https://www.google.com/amp/s/example.com/news/story", "https://example.com/news/story"),
+    ("https://www.google.com/url?q=https://example.com/a%3Fid%3D1&sa=D", "https://example.com/a?id=1"),
+    (
+        "https://tracking.tldrnewsletter.com/CL0/https:%2F%2Fopenai.com%2Fgpt-5%3Futm_source=tldrai/1/0100/abc=",
+        "https://openai.com/gpt-5",
+    ),
+    ("https://old.reddit.com/r/ClaudeAI/comments/abc/", "https://www.reddit.com/r/ClaudeAI/comments/abc"),
+    ("https://news.ycombinator.com/item?id=123", "https://news.ycombinator.com/item?id=123"),
+    # Generic names are tracking only on the hosts that use them that way
+    ("https://youtu.be/abc?si=XyZ&t=42", "https://youtu.be/abc?t=42"),
+    ("https://www.youtube.com/watch?v=abc&feature=share&si=XyZ", "https://www.youtube.com/watch?v=abc"),
+    ("https://x.com/openai/status/1?s=20&t=AbC", "https://x.com/openai/status/1"),
+    ("https://github.com/org/repo/blob/main/a.py?ref=v1.2", "https://github.com/org/repo/blob/main/a.py?ref=v1.2"),
+    ("https://example.com/docs?si=unit&share=public", "https://example.com/docs?share=public&si=unit"),
+    ("https://example.com/", "https://example.com/"),
+    ("https://example.com:8443/x", "https://example.com:8443/x"),
+])
+def test_canonicalize_url(url, expected):
+    assert canonicalize_url(url) == expected
+
+
+def test_canonicalize_url_passes_non_http_through():
+    assert canonicalize_url("mailto:someone@example.com") == "mailto:someone@example.com"
+
+
+def test_url_key_ignores_scheme_only():
+    assert url_key("http://openai.com/gpt-5") == url_key("https://openai.com/gpt-5")
+    assert url_key("https://openai.com/gpt-5") != url_key("https://openai.com/gpt-4")
+    assert url_key("mailto:someone@example.com") == "mailto:someone@example.com"
+
+
+def test_needs_resolution_only_for_shorteners():
+    assert needs_resolution("https://t.co/abc")
+    assert needs_resolution("https://feedproxy.google.com/~r/blog/~3/xyz")
+    assert not needs_resolution("https://openai.com/gpt-5")
+
+
+def test_extract_canonical_link_makes_href_absolute():
+    html = '<html><head><link rel="stylesheet" href="/s.css"><link href="/gpt-5" rel="canonical"></head></html>'
+    assert extract_canonical_link(html, "https://openai.com/index/gpt-5?ref=x") == "https://openai.com/gpt-5"
+    assert extract_canonical_link("<html></html>", "https://openai.com") is None
+
+
+async def test_resolve_redirects_follows_shortener_and_prefers_rel_canonical():
+    with respx.mock:
+        respx.get("https://t.co/abc").mock(return_value=httpx.Response(
+            301, headers={"Location": "https://openai.com/index/gpt-5?utm_source=twitter"}
+        ))
+        respx.get("https://openai.com/index/gpt-5?utm_source=twitter").mock(return_value=httpx.Response(
+            200,
+            headers={"Content-Type": "text/html"},
+            text='<head><link rel="canonical" href="https://openai.com/gpt-5/"></head>',
+        ))
+        cache = {}
+        resolved = await resolve_redirects(["https://t.co/abc", "https://openai.com/other"], cache)
+
+    assert resolved == {"https://t.co/abc": "https://openai.com/gpt-5"}
+    assert cache["https://t.co/abc"]["resolved"] == "https://openai.com/gpt-5"
+
+
+async def test_resolve_redirects_uses_cache_without_network():
+    cache = {"https://t.co/abc": {"resolved": "https://openai.com/gpt-5", "resolved_at": datetime.now(tz=timezone.utc).isoformat()}}
+    with respx.mock(assert_all_called=False) as mock:
+        route = mock.get("https://t.co/abc")
+        resolved = await resolve_redirects(["https://t.co/abc"], cache)
+    assert resolved == {"https://t.co/abc": "https://openai.com/gpt-5"}
+    assert not route.called
+
+
+async def test_resolve_redirects_leaves_failures_unresolved_and_uncached():
+    with respx.mock:
+        respx.get("https://bit.ly/dead").mock(side_effect=httpx.ConnectError("down"))
+        respx.get("https://bit.ly/gone").mock(return_value=httpx.Response(404))
+        cache = {}
+        resolved = await resolve_redirects(["https://bit.ly/dead", "https://bit.ly/gone"], cache)
+    assert resolved == {}
+    assert cache == {}
+
+
+def test_redirect_cache_round_trip_and_eviction(tmp_path):
+    path = tmp_path / "redirect_cache.json"
+    now = datetime.now(tz=timezone.utc)
+    save_redirect_cache({
+        "https://t.co/new": {"resolved": "https://a", "resolved_at": now.isoformat()},
+        "https://t.co/old": {"resolved": "https://b", "resolved_at": (now - timedelta(days=40)).isoformat()},
+    }, path)
+    assert list(load_redirect_cache(path)) == ["https://t.co/new"]
+
+
+def test_canonicalize_story_rewrites_url_id_and_matching_sources():
+    story = Story.from_url(
+        url="https://t.co/abc",
+        title="GPT-5",
+        source_name="X",
+        published_at=datetime(2026, 2, 24, tzinfo=timezone.utc),
+        raw_content="",
+    )
+    result = canonicalize_story(story, {"https://t.co/abc": "https://openai.com/gpt-5"})
+
+    assert result.canonical_url == "https://openai.com/gpt-5"
+    assert result.id == hashlib.sha256(b"https://openai.com/gpt-5").hexdigest()
+    assert result.sources[0].url == "https://openai.com/gpt-5"
+    assert story.canonical_url == "https://t.co/abc"   # original untouched
+
+
+def test_canonicalize_story_returns_same_story_when_already_canonical():
+    story = Story.from_url(
+        url="https://openai.com/gpt-5",
+        title="GPT-5",
+        source_name="OpenAI",
+        published_at=datetime(2026, 2, 24, tzinfo=timezone.utc),
+        raw_content="",
+    )
+    assert canonicalize_story(story) is story
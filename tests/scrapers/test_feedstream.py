@@ -0,0 +1,132 @@
+import json
+from datetime import datetime, timezone, timedelta
+from email.utils import format_datetime
+import feedparser
+import pytest
+from scrapers.feedstream import FeedStreamError, iter_feed_stories
+from scrapers.rss import parse_feed, parse_rss
+
+NOW = datetime.now(tz=timezone.utc).replace(microsecond=0)
+
+
+def _rss(ages_days: list[float], extra: str = "") -> bytes:
+    items = "".join(
+        f"""<item><title>Story {i} about agents</title><link>https://example.com/{i}</link>
+<description>&lt;p&gt;Body {i}&lt;/p&gt;</description>
+<content:encoded><![CDATA[<p>Full content {i}</p>]]></content:encoded>
+<pubDate>{format_datetime(NOW - timedelta(days=age))}</pubDate></item>"""
+        for i, age in enumerate(ages_days)
+    )
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/">
+<channel><title>Example</title>{extra}{items}</channel></rss>""".encode()
+
+
+def _atom(ages_days: list[float]) -> bytes:
+    entries = "".join(
+        f"""<entry><title>Entry {i}</title>
+<link rel="alternate" href="https://example.com/a/{i}"/><link rel="edit" href="https://example.com/edit/{i}"/>
+<published>{(NOW - timedelta(days=age)).isoformat()}</published>
+<summary>Summary {i}</summary></entry>"""
+        for i, age in enumerate(ages_days)
+    )
+    return f"""<?xml version="1.0"?><feed xmlns="http://www.w3.org/2005/Atom"><title>T</title>{entries}</feed>""".encode()
+
+
+def test_rss_matches_feedparser_path():
+    data = _rss([0.5, 1, 2, 3, 10])
+    streamed = parse_feed(data, "Example")
+    reference = parse_rss(feedparser.parse(data), "Example")
+
+    assert [s.canonical_url for s in streamed] == [s.canonical_url for s in reference]
+    assert [s.title for s in streamed] == [s.title for s in reference]
+    assert [s.published_at for s in streamed] == [s.published_at for s in reference]
+    assert streamed[0].raw_content == "<p>Body 0</p>"
+
+
+def test_atom_entries_use_alternate_link_and_summary():
+    stories = list(iter_feed_stories(_atom([1, 2]), "Blog"))
+    assert [s.canonical_url for s in stories] == ["https://example.com/a/0", "https://example.com/a/1"]
+    assert stories[0].raw_content == "Summary 0"
+
+
+def test_rdf_feed():
+    data = f"""<?xml version="1.0"?>
+<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#" xmlns="http://purl.org/rss/1.0/"
+ xmlns:dc="http://purl.org/dc/elements/1.1/">
+<channel rdf:about="https://example.com"><title>T</title></channel>
+<item rdf:about="https://example.com/1"><title>RDF story</title><link>https://example.com/1</link>
+<description>Body</description><dc:date>{(NOW - timedelta(days=1)).isoformat()}</dc:date></item>
+</rdf:RDF>""".encode()
+    stories = list(iter_feed_stories(data, "RDF"))
+    assert [s.title for s in stories] == ["RDF story"]
+
+
+def test_json_feed():
+    data = json.dumps({
+        "version": "https://jsonfeed.org/version/1.1",
+        "title": "T",
+        "items": [
+            {"id": "1", "url": "https://example.com/j/1", "title": "Fresh", "content_text": "Body",
+             "date_published": (NOW - timedelta(days=1)).isoformat()},
+            {"id": "2", "url": "https://example.com/j/2", "title": "Old", "content_text": "Body",
+             "date_published": (NOW - timedelta(days=30)).isoformat()},
+        ],
+    }).encode()
+    assert [s.title for s in parse_feed(data, "JSON")] == ["Fresh"]
+
+
+def test_stops_early_on_newest_first_feed():
+    stats = {}
+    stories = list(iter_feed_stories(_rss([1, 2] + [10 + i for i in range(200)]), "Example", stats=stats))
+
+    assert len(stories) == 2
+    assert stats["stopped_early"]
+    assert stats["entries"] == 5   # 2 fresh + STOP_AFTER_OLD old ones
+
+
+def test_pinned_old_entries_do_not_stop_the_feed():
+    # Old posts pinned above the new ones look newest-first until a new one appears
+    stats = {}
+    stories = list(iter_feed_stories(_rss([100, 200, 300, 1, 2] + [10 + i for i in range(50)]), "Example", stats=stats))
+
+    assert [s.canonical_url for s in stories] == ["https://example.com/3", "https://example.com/4"]
+    assert not stats["stopped_early"]
+    assert stats["entries"] == 55
+
+
+def test_unsorted_feed_is_read_to_the_end():
+    stats = {}
+    stories = list(iter_feed_stories(_rss([20, 1, 30, 31, 32, 33, 2]), "Example", stats=stats))
+
+    assert [s.canonical_url for s in stories] == ["https://example.com/1", "https://example.com/6"]
+    assert not stats["stopped_early"]
+
+
+def test_accepts_an_iterable_of_chunks():
+    data = _rss([1, 2, 3])
+    chunks = [data[i:i + 7] for i in range(0, len(data), 7)]
+    assert len(list(iter_feed_stories(chunks, "Example"))) == 3
+
+
+def test_filter_keywords():
+    stories = list(iter_feed_stories(_rss([1, 2]), "Example", filter_keywords=["BODY 1"]))
+    assert [s.canonical_url for s in stories] == ["https://example.com/1"]
+
+
+def test_html_entities_fall_back_to_feedparser():
+    data = _rss([1]).replace(b"<title>Story 0", b"<title>Story&nbsp;0")
+    with pytest.raises(FeedStreamError):
+        list(iter_feed_stories(data, "Example"))
+
+    stats = {}
+    stories = parse_feed(data, "Example", stats=stats)
+    assert len(stories) == 1
+    assert stats["fallback"] and not stats["parse_error"]
+
+
+def test_html_page_is_a_parse_error():
+    stats = {}
+    assert parse_feed(b"<html><body>Not a feed</body></html>", "Example", stats=stats) == []
+    assert stats["fallback"]
+    assert stats["entries"] == 0
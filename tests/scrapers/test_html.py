@@ -1,6 +1,9 @@
+import importlib.util
+import pytest
 import respx
 import httpx
-from scrapers.html import fetch_html
+import scrapers.html as html_scraper
+from scrapers.html import fetch_html, parse_html
 
 SAMPLE_HTML = """
 <html><body>
@@ -54,3 +57,82 @@ def test_fetch_html_handles_connection_error():
         base_url="https://cognition.ai",
     )
     assert stories == []
+
+
+CARD_PAGE = """
+<html><head><title>Blog</title></head><body>
+  <nav><a href="/about">About this company</a></nav>
+  <main class="blog_cms_list">
+    <article class="card Blog-Post"><a class="clickable_link" href="/p/1"><h3>Agents in the enterprise</h3></a>
+      <time>2026-10-10</time><p>Long form post about agents.</p></article>
+    <article class="card featured"><a href="https://other.example/p/2"><h3>Cursor background agents</h3></a>
+      <time>2026-10-09</time></article>
+    <div class="cardLink_x"><a class="cardLink_abc" href="/p/3">Evaluating coding models</a></div>
+  </main>
+  <footer><article class="card"><div class="entry"><a href="/p/4">Footer card link here</a></div></article></footer>
+</body></html>
+"""
+
+HEADINGS_PAGE = """
+<html><body>
+  <h2><a href="/news/one">First headline of the week</a></h2>
+  <section><h3><a href="/news/two">Second headline here</a> <span>extra</span></h3></section>
+</body></html>
+"""
+
+
+def _summary(stories):
+    return [(s.canonical_url, s.title, s.raw_content) for s in stories]
+
+
+def _unscoped(monkeypatch):
+    monkeypatch.setattr(html_scraper, "_list_scope", lambda selector: None)
+    monkeypatch.setattr(html_scraper, "_FALLBACK_SCOPE", None)
+
+
+BACKENDS = ["html.parser"] + (["lxml"] if importlib.util.find_spec("lxml") else [])
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("page,selectors", [
+    (CARD_PAGE, {"list": "article", "title": "h3", "date": "time"}),
+    (CARD_PAGE, {"list": "article.card, a[class*='cardLink']", "link": "a.clickable_link, a"}),
+    (CARD_PAGE, {"list": ".blog_cms_list article", "title": "h3"}),
+    (CARD_PAGE, {"list": "[class~=featured], div[class^='cardLink'], #missing"}),
+    (CARD_PAGE, {"list": "ARTICLE.Blog-Post"}),
+    (CARD_PAGE, None),
+    (SAMPLE_HTML, None),
+    (HEADINGS_PAGE, None),
+])
+def test_scoped_parse_matches_full_parse(monkeypatch, backend, page, selectors):
+    scoped = parse_html("Blog", page.encode(), "https://blog.example", selectors=selectors, backend=backend)
+    _unscoped(monkeypatch)
+    full = parse_html("Blog", page, "https://blog.example", selectors=selectors, backend="html.parser")
+    assert scoped
+    assert _summary(scoped) == _summary(full)
+
+
+def test_is_scopable():
+    assert html_scraper._is_scopable("article")
+    assert html_scraper._is_scopable("a[class*='cardLink'], div.post-item")
+    assert html_scraper._is_scopable("[fs-list-field='date value']")
+    assert not html_scraper._is_scopable(".blog_cms_list article")
+    assert not html_scraper._is_scopable("ul > li")
+    assert not html_scraper._is_scopable("li:first-child")
+    assert not html_scraper._is_scopable("a.cls\\:hover")
+
+
+def test_parse_html_uses_declared_encoding():
+    page = "<html><body><article class='post'><a href='/café'>Café agents launch today</a></article></body></html>"
+    stories = parse_html("Blog", page.encode("latin-1"), "https://blog.example", encoding="iso-8859-1")
+    assert stories[0].title == "Café agents launch today"
+
+
+@respx.mock
+def test_fetch_html_decodes_with_header_charset():
+    page = "<article class='post'><a href='/p'>Résumé of agent news</a></article>"
+    respx.get("https://blog.example/").mock(return_value=httpx.Response(
+        200, content=page.encode("latin-1"), headers={"Content-Type": "text/html; charset=iso-8859-1"},
+    ))
+    stories = fetch_html("Blog", "https://blog.example/", "https://blog.example")
+    assert stories[0].title == "Résumé of agent news"
@@ -0,0 +1,112 @@
+import json
+from datetime import datetime, timezone, timedelta
+import httpx
+import respx
+from scrapers.http_cache import (
+    cached_stories,
+    conditional_headers,
+    load_http_cache,
+    remember,
+    save_http_cache,
+)
+from scrapers.rss import fetch_rss
+from scrapers.html import fetch_html
+from schemas.story import Story
+
+FEED_URL = "https://openai.com/news/rss.xml"
+
+
+def _rss(days_ago: int = 1) -> str:
+    from email.utils import format_datetime
+    date = format_datetime(datetime.now(tz=timezone.utc) - timedelta(days=days_ago))
+    return f"""<?xml version="1.0"?>
+<rss version="2.0"><channel><title>OpenAI</title>
+<item><title>GPT-5 launches</title><link>https://openai.com/gpt-5</link>
+<description>OpenAI launched GPT-5.</description><pubDate>{date}</pubDate></item>
+</channel></rss>"""
+
+
+def _story(days_ago: int) -> Story:
+    return Story.from_url(
+        url=f"https://example.com/{days_ago}",
+        title=f"Story {days_ago}",
+        source_name="Test",
+        published_at=datetime.now(tz=timezone.utc) - timedelta(days=days_ago),
+        raw_content="content",
+    )
+
+
+def test_remember_stores_validators_and_stories():
+    cache = {}
+    response = httpx.Response(200, headers={"ETag": '"v1"', "Last-Modified": "Mon, 02 Mar 2026 10:00:00 GMT"})
+    remember(cache, FEED_URL, response, [_story(1)])
+
+    assert conditional_headers(cache, FEED_URL) == {
+        "If-None-Match": '"v1"',
+        "If-Modified-Since": "Mon, 02 Mar 2026 10:00:00 GMT",
+    }
+    assert len(cache[FEED_URL]["stories"]) == 1
+
+
+def test_remember_drops_entry_without_validators():
+    cache = {FEED_URL: {"etag": '"old"', "stories": [], "fetched_at": "2026-03-01T00:00:00+00:00"}}
+    remember(cache, FEED_URL, httpx.Response(200), [])
+    assert FEED_URL not in cache
+
+
+def test_cached_stories_reapplies_age_cutoff():
+    cache = {}
+    remember(cache, FEED_URL, httpx.Response(200, headers={"ETag": '"v1"'}), [_story(1), _story(10)])
+    stories = cached_stories(cache, FEED_URL, max_age_days=7)
+    assert [s.title for s in stories] == ["Story 1"]
+
+
+def test_load_http_cache_evicts_stale_entries(tmp_path):
+    path = tmp_path / "http_cache.json"
+    save_http_cache({
+        "https://old.com/rss": {"etag": "a", "stories": [],
+                                "fetched_at": (datetime.now(tz=timezone.utc) - timedelta(days=30)).isoformat()},
+        "https://new.com/rss": {"etag": "b", "stories": [],
+                                "fetched_at": datetime.now(tz=timezone.utc).isoformat()},
+    }, path)
+    cache = load_http_cache(path)
+    assert list(cache) == ["https://new.com/rss"]
+
+
+def test_load_http_cache_returns_empty_dict_when_file_missing(tmp_path):
+    assert load_http_cache(tmp_path / "missing.json") == {}
+
+
+@respx.mock
+def test_fetch_rss_reuses_stories_on_304():
+    cache = {}
+    route = respx.get(FEED_URL)
+    route.mock(return_value=httpx.Response(200, text=_rss(), headers={"ETag": '"v1"'}))
+    first = fetch_rss(source_name="OpenAI", url=FEED_URL, cache=cache)
+
+    route.mock(return_value=httpx.Response(304))
+    second = fetch_rss(source_name="OpenAI", url=FEED_URL, cache=cache)
+
+    assert route.calls.last.request.headers["If-None-Match"] == '"v1"'
+    assert [s.title for s in second] == [s.title for s in first] == ["GPT-5 launches"]
+
+
+@respx.mock
+def test_fetch_html_reuses_stories_on_304():
+    cache = {}
+    html = '<html><body><article><h2><a href="/blog/1">AI agents take over enterprise</a></h2></article></body></html>'
+    route = respx.get("https://cognition.ai/blog")
+    route.mock(return_value=httpx.Response(200, text=html, headers={"Last-Modified": "Mon, 02 Mar 2026 10:00:00 GMT"}))
+    fetch_html(source_name="Cognition", url="https://cognition.ai/blog", base_url="https://cognition.ai", cache=cache)
+
+    route.mock(return_value=httpx.Response(304))
+    stories = fetch_html(source_name="Cognition", url="https://cognition.ai/blog", base_url="https://cognition.ai", cache=cache)
+
+    assert route.calls.last.request.headers["If-Modified-Since"] == "Mon, 02 Mar 2026 10:00:00 GMT"
+    assert stories[0].title == "AI agents take over enterprise"
+
+
+def test_save_http_cache_writes_json(tmp_path):
+    path = tmp_path / "data" / "http_cache.json"
+    save_http_cache({"https://a.com": {"etag": "x"}}, path)
+    assert json.loads(path.read_text()) == {"https://a.com": {"etag": "x"}}
@@ -0,0 +1,68 @@
+from pathlib import Path
+import pytest
+import yaml
+from scrapers.keywords import KeywordMatcher, keyword_matcher
+
+SOURCES_YAML = Path(__file__).parent.parent.parent / "sources" / "sources.yaml"
+
+
+def test_matches_at_word_start_case_insensitively():
+    matcher = KeywordMatcher(["agent", "AI"])
+    assert matcher.search("New Agentic workflows")
+    assert matcher.search("AI-powered code review")
+    assert not matcher.search("He said the maintainers would reply")
+
+
+def test_whole_words_requires_word_end():
+    matcher = KeywordMatcher(["agent"], whole_words=True)
+    assert matcher.search("An agent, finally.")
+    assert not matcher.search("Agents everywhere")
+
+
+def test_multi_word_and_punctuated_keywords():
+    matcher = KeywordMatcher(["fine-tuning", "gpt-4o", "body 1"])
+    assert matcher.hits("Fine-tuning GPT-4o on BODY 1 data") == {"fine-tuning", "gpt-4o", "body 1"}
+
+
+def test_hits_counts_distinct_keywords():
+    matcher = KeywordMatcher(["agent", "agentforce", "api", "API"])
+    assert matcher.hits("Agentforce rapid API") == {"agentforce", "agent", "api"}
+    assert matcher.count("api api API") == 1
+    assert KeywordMatcher(["agent"], whole_words=True).hits("Agentforce agents") == set()
+
+
+def test_whole_words_mixes_word_and_punctuated_keywords():
+    matcher = KeywordMatcher(["agent", "fine-tuning", "o1", "api"], whole_words=True)
+    assert matcher.hits("Fine-tuning o1: agent_api, an agent API") == {"fine-tuning", "o1", "agent", "api"}
+    assert matcher.hits("Refine-tuning agents o1x rapid") == set()
+
+
+def test_later_occurrence_on_word_boundary_still_matches():
+    assert KeywordMatcher(["ai"]).search("said maintain, then AI")
+
+
+def test_empty_keyword_list_matches_nothing():
+    matcher = keyword_matcher(None)
+    assert not matcher
+    assert not matcher.search("anything")
+    assert matcher.hits("anything") == set()
+    assert not KeywordMatcher(["", "  "])
+
+
+def test_keyword_matcher_is_compiled_once_per_list():
+    assert keyword_matcher(["copilot", "ai"]) is keyword_matcher(["copilot", "ai"])
+    assert keyword_matcher(["copilot"]) is not keyword_matcher(["copilot"], whole_words=True)
+
+
+@pytest.mark.parametrize("source,title", [
+    ("github_blog", "GitHub for Beginners: How to get started with GenAI prompts"),
+    ("github_copilot_changelog", "OpenAI GPT-4.1 is now generally available"),
+    ("vscode", "Bring your own OpenAI-compatible endpoint"),
+    ("openai", "Introducing ChatGPT Enterprise"),
+    ("pragmatic_engineer", "How ChatGPT changed the way engineers search"),
+    ("azure_ai", "GenAI gateway capabilities in Azure API Management"),
+])
+def test_source_filters_keep_titles_naming_openai_chatgpt_genai(source, title):
+    # Word-start matching: "ai" and "gpt" alone don't match inside these names
+    sources = {s["name"]: s for s in yaml.safe_load(SOURCES_YAML.read_text())["sources"]}
+    assert keyword_matcher(sources[source]["filter_keywords"]).search(title)
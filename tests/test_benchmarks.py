@@ -0,0 +1,226 @@
+"""
+The benchmark suite and the offline stand-in servers are standalone
+scripts; these checks keep them importable and their logic honest. Timings
+themselves are not asserted.
+"""
+import asyncio
+import importlib
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+import pytest
+import pipeline.ratelimit as ratelimit
+from pipeline.metrics import current_metrics, reset_metrics
+from schemas.story import Story
+
+BENCHMARKS_DIR = Path(__file__).parent.parent / "benchmarks"
+
+
+def _benchmark(name: str):
+    if str(BENCHMARKS_DIR) not in sys.path:
+        sys.path.insert(0, str(BENCHMARKS_DIR))
+    return importlib.import_module(name)
+
+
+def _suite():
+    return _benchmark("suite")
+
+
+def test_compare_flags_only_slowdowns_past_threshold_and_delta():
+    suite = _suite()
+    baselines = {"a/1": 0.010, "b/1": 0.010, "c/1": 0.0001, "d/1": 0.010}
+    results = {"a/1": 0.031, "b/1": 0.015, "c/1": 0.0009, "d/1": 0.009, "new/1": 5.0}
+    assert suite.compare(results, baselines, threshold=2.0, min_delta=0.002) == ["a/1"]
+
+
+def test_scaling_reports_exponent_between_sizes():
+    suite = _suite()
+    table = suite.scaling({"x/100": 0.01, "x/1000": 0.1, "y/10": 0.001, "y/100": 0.1})
+    assert table["x"][0][2] is None
+    assert round(table["x"][1][2], 2) == 1.0
+    assert round(table["y"][1][2], 2) == 2.0
+
+
+def test_quick_run_covers_every_case():
+    suite = _suite()
+    results = suite.run_suite(repeat=1, quick=True)
+    assert {key.split("/")[0] for key in results} == set(suite.CASES)
+    assert all(seconds > 0 for seconds in results.values())
+
+
+def test_save_merges_into_existing_baselines(tmp_path):
+    suite = _suite()
+    path = tmp_path / "baselines.json"
+    suite.save_baselines({"a/1": 0.5, "b/1": 0.25}, path)
+    suite.save_baselines({"a/1": 0.125}, path)
+    assert suite.load_baselines(path) == {"a/1": 0.125, "b/1": 0.25}
+
+
+# ── Offline models endpoint ──────────────────────────────────────────────────
+
+@pytest.fixture
+def fake_models(monkeypatch):
+    """Start a FakeModelsServer(**options) with get_client() pointed at it and the limiter opened up."""
+    servers = []
+
+    def start(**options):
+        server = _benchmark("fake_models").FakeModelsServer(**options).start()
+        servers.append(server)
+        monkeypatch.setenv("MODELS_BASE_URL", server.url)
+        monkeypatch.setenv("GITHUB_TOKEN", "offline")
+        return server
+
+    for model in ("openai/gpt-4o-mini", "openai/gpt-4o"):
+        monkeypatch.setitem(ratelimit.MODEL_LIMITS, model, (10_000, 100_000))
+    ratelimit.reset_limiters()
+    reset_metrics()
+    yield start
+    for server in servers:
+        server.stop()
+    ratelimit.reset_limiters()
+    reset_metrics()
+
+
+def _stories(n: int) -> list[Story]:
+    return [
+        Story.from_url(
+            url=f"https://example.com/{i}",
+            title=f"Agent platform release number {i}",
+            source_name="OpenAI",
+            published_at=datetime(2026, 10, 12, tzinfo=timezone.utc),
+            raw_content="A coding agent release for enterprise teams.",
+        )
+        for i in range(n)
+    ]
+
+
+def test_fake_models_ranks_deterministically_from_the_prompt(fake_models):
+    from pipeline.rank import get_client, rank_batch
+
+    fake = _benchmark("fake_models")
+    server = fake_models()
+    first = {s.id: (s.priority_category, s.priority_score) for s in rank_batch(_stories(10), get_client())}
+    second = {s.id: (s.priority_category, s.priority_score) for s in rank_batch(_stories(10), get_client())}
+
+    assert first == second
+    expected = [s for s in _stories(10) if fake.story_included(s.title) and max(fake.story_scores(s.title).values()) >= 20]
+    assert set(first) == {s.id for s in expected}
+    assert server.stats["requests"] == 2
+    assert all(c["prompt_tokens"] and c["completion_tokens"] for c in current_metrics().llm_calls)
+
+
+def test_fake_models_classifies_and_summarizes(fake_models):
+    from pipeline.rank import classify_sdlc_tags, get_async_client, get_client
+    from pipeline.summarize import summarize_stories
+
+    fake_models()
+    stories = classify_sdlc_tags(_stories(4), get_client())
+    assert all(s.sdlc_tags for s in stories)
+    assert any(s.sdlc_tags != ["general"] for s in stories)
+
+    summarized = asyncio.run(summarize_stories(stories[:2], get_async_client(), max_concurrency=2))
+    assert all(s.summary and s.title in s.summary.what_happened for s in summarized)
+
+
+def test_fake_models_injected_429s_exhaust_retries(fake_models):
+    from pipeline.rank import get_client, rank_batch
+
+    server = fake_models(rate_429=1.0, retry_after=0.01)
+    assert rank_batch(_stories(3), get_client(), retries=1) == []
+
+    # Two rank_batch attempts and no retries inside the OpenAI SDK
+    assert server.stats["429"] == server.stats["requests"] == 2
+    summary = current_metrics().llm_summary()["openai/gpt-4o-mini"]
+    assert summary["rate_limited"] == 2 and summary["calls"] == 2
+
+
+def test_fake_models_malformed_json_fails_the_batch(fake_models):
+    from pipeline.rank import get_client, rank_batch
+
+    fake_models(rate_malformed=1.0)
+    assert rank_batch(_stories(3), get_client()) == []
+    assert [c["status"] for c in current_metrics().llm_calls] == [200]
+
+
+# ── Offline feed server ──────────────────────────────────────────────────────
+
+@pytest.fixture
+def fake_feeds():
+    servers = []
+
+    def start(**options):
+        server = _benchmark("fake_feeds").FakeFeedServer(**options).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.stop()
+
+
+def test_fake_feeds_serve_every_source_type(fake_feeds):
+    from pipeline.fetch import fetch_all_with_health
+
+    server = fake_feeds(items=5)
+    sources = _benchmark("bench_fetch").generate_sources(server.url, 6)
+    assert {s["type"] for s in sources} == {"rss", "scrape", "api", "reddit"}
+
+    stories, health = asyncio.run(fetch_all_with_health(sources))
+
+    assert [h["status"] for h in health] == ["active"] * 6, [h["detail"] for h in health]
+    assert all(len(found) == 5 for found in stories.values())
+    # Reddit link posts point at the article, not the comments page
+    [reddit] = [s for s in sources if s["type"] == "reddit"]
+    assert all(story.canonical_url.startswith("https://example.com/") for story in stories[reddit["name"]])
+
+
+def test_fake_feeds_per_url_faults(fake_feeds):
+    from pipeline.fetch import fetch_all_with_health
+
+    server = fake_feeds(items=3)
+    sources = [
+        {"name": "broken", "display_name": "Broken", "type": "rss", "url": f"{server.url}/rss/broken?error=1"},
+        {"name": "stalled", "display_name": "Stalled", "type": "rss", "url": f"{server.url}/rss/stalled?timeout=1"},
+        {"name": "drip", "display_name": "Drip", "type": "rss", "url": f"{server.url}/rss/drip?drip=0.2"},
+    ]
+    _, health = asyncio.run(fetch_all_with_health(sources, timeout=0.5))
+
+    assert health[0]["detail"] == "HTTP 503"
+    assert health[1]["status"] == "skipped" and health[1]["http_status"] is None
+    assert health[2]["status"] == "active" and health[2]["latency_ms"] >= 150
+    assert server.stats["error"] == 1 and server.stats["timeout"] == 1
+
+
+def test_fetch_deadline_stops_a_drip_that_keeps_resetting_the_read_timeout(fake_feeds):
+    from pipeline.fetch import fetch_all_with_health
+
+    server = fake_feeds(items=3)
+    sources = [
+        {"name": "drip", "display_name": "Drip", "type": "rss", "url": f"{server.url}/rss/drip?drip=30"},
+        {"name": "fine", "display_name": "Fine", "type": "rss", "url": f"{server.url}/rss/fine"},
+    ]
+    # Each chunk arrives well inside the 5s read timeout; only the deadline ends it
+    start = time.monotonic()
+    stories, health = asyncio.run(fetch_all_with_health(sources, timeout=5, source_deadline=2))
+
+    assert time.monotonic() - start < 10
+    assert health[0]["status"] == "skipped" and health[0]["detail"] == "deadline 2s exceeded"
+    assert health[1]["status"] == "active" and len(stories["fine"]) == 3
+
+
+def test_fetch_budget_marks_unfinished_sources_skipped(fake_feeds):
+    from pipeline.fetch import fetch_all_with_health
+
+    reset_metrics()
+    server = fake_feeds(items=3)
+    sources = [
+        {"name": "drip", "display_name": "Drip", "type": "rss", "url": f"{server.url}/rss/drip?drip=30"},
+        {"name": "fine", "display_name": "Fine", "type": "rss", "url": f"{server.url}/rss/fine"},
+    ]
+    stories, health = asyncio.run(fetch_all_with_health(sources, timeout=5, source_deadline=60, overall_budget=2))
+
+    assert health[0]["status"] == "skipped" and health[0]["detail"] == "fetch budget (2s) exceeded"
+    assert stories["drip"] == []
+    assert health[1]["status"] == "active"
+    assert [h["source"] for h in current_metrics().http if h["status"] is None] == ["drip"]
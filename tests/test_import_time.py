@@ -0,0 +1,49 @@
+"""
+Import-time budget for the stage entry points, measured the way
+`python -X importtime` reports it, in a fresh interpreter per module.
+
+The heavy clients (openai, telegram, httpx, yaml) are imported only on the
+code path that uses them, so each check names the modules an entry point
+must not load at import. The time budget is a loose ceiling on top of that
+for an unexpectedly expensive new import.
+"""
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+
+REPO_ROOT = Path(__file__).parent.parent
+IMPORT_BUDGET_MS = 1500
+
+# Entry point → modules it must not import until they're needed
+DEFERRED = {
+    "pipeline.normalize": ["openai", "telegram", "httpx", "yaml", "bs4", "feedparser"],
+    "pipeline.rank": ["openai", "telegram", "httpx", "yaml"],
+    "pipeline.summarize": ["openai", "telegram", "httpx", "yaml", "pipeline.rank"],
+    "pipeline.deliver": ["openai", "telegram", "httpx"],
+    "pipeline.publish": ["openai", "telegram", "httpx", "yaml"],
+}
+
+
+def importtime(module: str) -> dict[str, int]:
+    """Module → cumulative import time in microseconds, from `python -X importtime`."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+@pytest.mark.parametrize("module", sorted(DEFERRED))
+def test_entry_point_defers_heavy_imports(module):
+    times = importtime(module)
+
+    assert module in times
+    assert [m for m in DEFERRED[module] if m in times] == []
+    assert times[module] / 1000 < IMPORT_BUDGET_MS
@@ -52,3 +52,49 @@ def test_story_serializes_to_dict():
     d = story.model_dump(mode="json")
     assert d["title"] == "GPT-5 launches"
     assert isinstance(d["sources"], list)
+
+
+def test_story_record_round_trips_serialized_story():
+    from schemas.record import StoryRecord
+    from schemas.story import StorySummary
+
+    story = Story.from_url(
+        url="https://openai.com/gpt-5",
+        title="GPT-5 launches",
+        source_name="OpenAI",
+        published_at=datetime(2026, 2, 24, tzinfo=timezone.utc),
+        raw_content="Content",
+    )
+    story.sources.append(StorySource(name="Hacker News", url="https://news.ycombinator.com/1"))
+    story.priority_score = 8
+    story.sdlc_tags = ["coding"]
+    story.summary = StorySummary(
+        what_happened="a", enterprise_impact="b", software_delivery_impact="c",
+        developer_impact="d", human_impact="e", how_to_use="f",
+    )
+
+    record = StoryRecord.from_dict(story.model_dump(mode="json"))
+    assert record.source_count == 2
+    assert record.sources[1].name == "Hacker News"
+    assert record.to_story() == story
+    assert StoryRecord.from_story(story).to_story() == story
+    assert not hasattr(record, "__dict__")
+
+
+def test_story_record_with_url_rekeys_matching_sources():
+    from schemas.record import SourceRef, StoryRecord
+
+    record = StoryRecord.from_story(Story.from_url(
+        url="http://openai.com/gpt-5/",
+        title="GPT-5 launches",
+        source_name="OpenAI",
+        published_at=datetime(2026, 2, 24, tzinfo=timezone.utc),
+        raw_content="Content",
+    ))
+    record.sources.append(SourceRef("HN", "https://news.ycombinator.com/1"))
+    moved = record.with_url("https://openai.com/gpt-5")
+    assert moved.id == Story.from_url(
+        url="https://openai.com/gpt-5", title="", source_name="", published_at=record.published_at, raw_content="",
+    ).id
+    assert [s.url for s in moved.sources] == ["https://openai.com/gpt-5", "https://news.ycombinator.com/1"]
+    assert record.canonical_url == "http://openai.com/gpt-5/"